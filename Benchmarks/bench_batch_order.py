@@ -0,0 +1,38 @@
+"""
+Compares Store.order with Store.order_batch on bulk orders.
+
+Run from the repository root:
+    python -m Benchmarks.bench_batch_order
+"""
+import time
+
+from Classes import Store
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+def time_order(method_name, catalog_size, lines):
+    """
+    Times one order on a fresh store.
+
+    Returns:
+        tuple: The elapsed seconds and the order total.
+    """
+    products = make_catalog(catalog_size)
+    store = Store(products)
+    shopping_list = make_shopping_list(products, lines)
+    start = time.perf_counter()
+    total = getattr(store, method_name)(shopping_list)
+    return time.perf_counter() - start, total
+
+
+def main():
+    print(f"{'lines':>8} {'order [ms]':>12} {'order_batch [ms]':>18} {'speedup':>8}")
+    for lines in (1000, 10000, 100000):
+        line_time, line_total = time_order("order", 1000, lines)
+        batch_time, batch_total = time_order("order_batch", 1000, lines)
+        assert abs(line_total - batch_total) <= 1e-6 * max(1.0, abs(line_total))
+        print(f"{lines:>8} {line_time * 1000:>12.2f} {batch_time * 1000:>18.2f} {line_time / batch_time:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
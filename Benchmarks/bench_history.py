@@ -0,0 +1,76 @@
+"""
+Measures what an order history costs per order and compares its rollup reports
+against the same reports computed by scanning every recorded line.
+
+Run from the repository root:
+    python -m Benchmarks.bench_history
+"""
+import time
+
+from Classes import Store
+from Classes.history import OrderHistory
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+def scan_product_sales(history, product):
+    """
+    Sums the units and revenue of a product over all recorded lines.
+    """
+    product_id = history.products.index(product)
+    units = revenue = 0
+    for index, line_product in enumerate(history.product_ids):
+        if line_product == product_id:
+            units += history.quantities[index]
+            revenue += history.prices[index]
+    return units, revenue
+
+
+def scan_sales_by_bucket(history):
+    """
+    Groups the units and revenue of all recorded lines by time bucket.
+    """
+    buckets = {}
+    for timestamp, quantity, price in zip(history.timestamps, history.quantities, history.prices):
+        totals = buckets.setdefault(int(timestamp // history.bucket_seconds), [0, 0])
+        totals[0] += quantity
+        totals[1] += price
+    return sorted(buckets.items())
+
+
+def timed(function, *arguments):
+    start = time.perf_counter()
+    function(*arguments)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    orders = 300000
+    clock = iter(range(10**9)).__next__
+
+    for with_history in (False, True):
+        products = make_catalog(10000)
+        store = Store(products)
+        lists = [make_shopping_list(products, 3, seed=seed) for seed in range(1000)]
+        history = OrderHistory(bucket_seconds=3600, clock=clock)
+        if with_history:
+            store.set_history(history)
+        start = time.perf_counter()
+        for index in range(orders):
+            store.order(lists[index % len(lists)])
+        seconds = time.perf_counter() - start
+        label = "with history" if with_history else "without"
+        print(f"{label:>12}: {orders / seconds:9.0f} orders/s")
+
+    start = time.perf_counter()
+    product = history.get_top_products(1)[0][0]
+    print(f"{len(history)} lines over {len(history.get_sales_by_bucket())} hourly buckets, "
+          f"first report took {(time.perf_counter() - start) * 1000:.3f} ms")
+    print(f"product sales:   rollup {timed(history.get_product_sales, product):8.3f} ms, "
+          f"scan {timed(scan_product_sales, history, product):8.1f} ms")
+    print(f"sales by hour:   rollup {timed(history.get_sales_by_bucket):8.3f} ms, "
+          f"scan {timed(scan_sales_by_bucket, history):8.1f} ms")
+    print(f"top 10 products: rollup {timed(history.get_top_products, 10):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
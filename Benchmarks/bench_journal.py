@@ -0,0 +1,48 @@
+"""
+Measures orders per second with an order journal at different group sizes.
+
+Run from the repository root:
+    python -m Benchmarks.bench_journal
+"""
+import os
+import tempfile
+import time
+
+from Classes import Store
+from Classes.journal import OrderJournal
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+def run(batch_size, orders, directory):
+    """
+    Places orders in a store, journaled unless batch_size is None.
+
+    Returns:
+        float: Orders per second, including the final flush.
+    """
+    products = make_catalog(1000)
+    store = Store(products)
+    shopping_lists = [make_shopping_list(products, 3, seed=seed) for seed in range(orders)]
+    journal = None
+    if batch_size is not None:
+        journal = OrderJournal(os.path.join(directory, f"orders-{batch_size}.journal"),
+                               batch_size=batch_size, flush_interval=0.05)
+        store.set_journal(journal)
+    start = time.perf_counter()
+    for shopping_list in shopping_lists:
+        store.place_order(shopping_list)
+    if journal is not None:
+        journal.close()
+    return orders / (time.perf_counter() - start)
+
+
+def main():
+    orders = 5000
+    with tempfile.TemporaryDirectory() as directory:
+        for batch_size in (None, 1, 10, 100, 1000):
+            label = "no journal" if batch_size is None else f"batch {batch_size}"
+            print(f"{label:>14}: {run(batch_size, orders, directory):10.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures the throughput of the catalog loader for CSV and JSON Lines files.
+
+Run from the repository root:
+    python -m Benchmarks.bench_loader
+"""
+import csv
+import json
+import os
+import tempfile
+
+from Classes import Store
+from Classes.loader import load_catalog
+
+
+FIELDS = ["type", "name", "price", "quantity", "maximum", "promotion", "promotion_name", "percent"]
+
+
+def make_rows(size):
+    """
+    Yields synthetic catalog rows with a mix of product types and promotions.
+    """
+    for number in range(size):
+        row = dict.fromkeys(FIELDS, "")
+        row.update(type="product", name=f"SKU-{number}", price=f"{number % 2000 + 0.99}", quantity="100")
+        if number % 10 == 0:
+            row.update(type="non_stocked", quantity="")
+        elif number % 10 == 1:
+            row.update(type="limited", maximum="5")
+        if number % 4 == 1:
+            row.update(promotion="percent_discount", promotion_name="30% off!", percent="30")
+        elif number % 4 == 2:
+            row.update(promotion="third_one_free", promotion_name="Third One Free!")
+        yield row
+
+
+def main():
+    size = 200000
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "catalog.csv")
+        with open(csv_path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(make_rows(size))
+        jsonl_path = os.path.join(directory, "catalog.jsonl")
+        with open(jsonl_path, "w") as file:
+            for row in make_rows(size):
+                file.write(json.dumps({key: value for key, value in row.items() if value}) + "\n")
+        for path in (csv_path, jsonl_path):
+            report = load_catalog(path, Store())
+            print(f"{os.path.basename(path):>14}: {report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares the memory needed for a catalog with the original __dict__ based product
+class, the slotted product classes and a ProductTable.
+
+Run from the repository root:
+    python -m Benchmarks.bench_memory
+"""
+import tracemalloc
+
+from Classes import Product, ProductTable
+
+
+class OriginalProduct:
+    """
+    Reproduces the attributes of the original product class: a __dict__ with name,
+    price, active flag, promotion and quantity, nothing else.
+    """
+
+    def __init__(self, name, price, quantity):
+        self.name = str(name)
+        self.price = float(price)
+        self.active = True
+        self.promotion = None
+        self.quantity = int(quantity)
+
+
+def measure(build, size):
+    """
+    Returns the bytes allocated while building a catalog of the given size.
+    """
+    tracemalloc.start()
+    catalog = build(size)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del catalog
+    return current
+
+
+def build_dict_products(size):
+    return [OriginalProduct(f"SKU-{number}", 9.99, 100) for number in range(size)]
+
+
+def build_slotted_products(size):
+    return [Product(f"SKU-{number}", 9.99, 100) for number in range(size)]
+
+
+def build_table(size):
+    table = ProductTable()
+    for number in range(size):
+        table.add(0, f"SKU-{number}", 9.99, 100)
+    return table
+
+
+def main():
+    size = 100000
+    for label, build in (("original products", build_dict_products),
+                         ("__slots__ products", build_slotted_products),
+                         ("ProductTable", build_table)):
+        used = measure(build, size)
+        print(f"{label:>20}: {used / 2**20:8.1f} MiB, {used / size:6.0f} bytes per product")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Compares the float and the integer cents pricing paths: every promotion on its own
+and whole orders through Store.place_order.
+
+Run from the repository root:
+    python -m Benchmarks.bench_money
+"""
+import timeit
+
+from Classes import Store, Product, PercentDiscount, SecondHalfPrice, ThirdOneFree
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+def bench_promotions(number=200000):
+    product = Product("Pen", 0.99, 10)
+    for promotion in (PercentDiscount("30% off!", percent=30),
+                      SecondHalfPrice("Second Half price!"),
+                      ThirdOneFree("Third One Free!")):
+        float_time = timeit.timeit(lambda: promotion.apply_promotion(product, 7), number=number)
+        cents_time = timeit.timeit(lambda: promotion.apply_promotion_cents(99, 7), number=number)
+        print(f"{type(promotion).__name__:>16}: float {float_time / number * 1e9:6.0f} ns, "
+              f"cents {cents_time / number * 1e9:6.0f} ns")
+
+
+def bench_orders(orders=20000):
+    for use_cents in (False, True):
+        products = make_catalog(1000)
+        store = Store(products, use_cents=use_cents)
+        shopping_lists = [make_shopping_list(products, 5, seed=seed) for seed in range(orders)]
+        seconds = timeit.timeit(lambda: [store.place_order(lines) for lines in shopping_lists], number=1)
+        print(f"{'cents' if use_cents else 'float':>16}: {orders / seconds:8.0f} orders/s")
+
+
+def main():
+    bench_promotions()
+    bench_orders()
+
+
+if __name__ == "__main__":
+    main()
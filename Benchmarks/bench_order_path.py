@@ -0,0 +1,102 @@
+"""
+Compares the single-threaded order path with the original Store.order and Product.buy:
+a small order on a plain store, one Product.buy, and the same order on a store with
+thread_safe set, which takes the general place_order() path.
+
+Run from the repository root:
+    python -m Benchmarks.bench_order_path
+"""
+import timeit
+
+from Classes import Store, Product
+
+
+class OriginalProduct:
+    """
+    Reproduces buy() of the product class before stores kept running totals: check the
+    stock, set the new quantity, deactivate at 0 and price the purchase.
+    """
+
+    def __init__(self, name, price, quantity):
+        self.name = name
+        self.price = float(price)
+        self.active = True
+        self.promotion = None
+        self.quantity = quantity
+
+
+    def set_quantity(self, quantity):
+        try:
+            self.quantity = int(quantity)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid quantity provided")
+        if self.quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if self.quantity == 0:
+            self.active = False
+
+
+    def buy(self, quantity):
+        if quantity > self.quantity:
+            raise ValueError("Quantity is too high")
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        self.set_quantity(self.quantity - quantity)
+        if self.promotion:
+            return self.promotion.apply_promotion(self, quantity)
+        return self.price * quantity
+
+
+class OriginalStore:
+    """
+    Reproduces order() of the store class before orders became all-or-nothing.
+    """
+
+    def __init__(self, products):
+        self.list_of_products = list(products)
+
+
+    def order(self, shopping_list):
+        order_price = 0.0
+        if not isinstance(shopping_list, list):
+            raise TypeError("shopping_list has to be a list")
+        for item_order in shopping_list:
+            if not isinstance(item_order, tuple) or len(item_order) != 2:
+                raise ValueError("Order has to be a Tuple with 2 elements.")
+            if not isinstance(item_order[0], OriginalProduct) or not isinstance(item_order[1], int):
+                raise TypeError("First element has to be a product and second a integer.")
+            order_price += item_order[0].buy(item_order[1])
+        return order_price
+
+
+def best_microseconds(function, number, repeat=7):
+    """
+    Returns the best time of a call in microseconds over several runs.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1e6
+
+
+def main():
+    lines = 5
+    original_products = [OriginalProduct(f"SKU-{number}", 9.99, 10**9) for number in range(lines)]
+    original_store = OriginalStore(original_products)
+    original_list = [(product, 1) for product in original_products]
+    products = [Product(f"SKU-{number}", 9.99, 10**9) for number in range(lines)]
+    store = Store(products)
+    shopping_list = [(product, 1) for product in products]
+    locked_products = [Product(f"SKU-{number}", 9.99, 10**9) for number in range(lines)]
+    locked_store = Store(locked_products, thread_safe=True)
+    locked_list = [(product, 1) for product in locked_products]
+
+    rows = [("original Store.order", best_microseconds(lambda: original_store.order(original_list), 20000)),
+            ("Store.order", best_microseconds(lambda: store.order(shopping_list), 20000)),
+            ("thread-safe Store.order", best_microseconds(lambda: locked_store.order(locked_list), 20000)),
+            ("original Product.buy", best_microseconds(lambda: original_products[0].buy(1), 100000)),
+            ("Product.buy", best_microseconds(lambda: products[0].buy(1), 100000))]
+    print(f"{lines}-line orders")
+    for label, microseconds in rows:
+        print(f"{label:>24}: {microseconds:6.2f} us")
+
+
+if __name__ == "__main__":
+    main()
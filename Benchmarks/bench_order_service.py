@@ -0,0 +1,55 @@
+"""
+Runs a synthetic load against OrderService and prints its counters.
+
+Run from the repository root:
+    python -m Benchmarks.bench_order_service
+"""
+import asyncio
+import random
+
+from Classes import Store, OrderService
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+async def generate_load(service, products, orders, clients, seed=0):
+    """
+    Lets a number of clients submit random orders concurrently.
+
+    Args:
+        service (OrderService): The started service.
+        products (list): The catalog the orders pick from.
+        orders (int): The number of orders per client.
+        clients (int): The number of concurrent clients.
+        seed (int): Seed for the random generator.
+    """
+    async def client(number):
+        rng = random.Random(seed + number)
+        for _ in range(orders):
+            lines = rng.randint(1, 5)
+            await service.submit(make_shopping_list(products, lines, seed=rng.random()))
+
+    await asyncio.gather(*(client(number) for number in range(clients)))
+
+
+async def run(workers, queue_size, use_threads):
+    products = make_catalog(1000)
+    service = OrderService(Store(products, thread_safe=use_threads), workers=workers,
+                           queue_size=queue_size, use_threads=use_threads)
+    await service.start()
+    await generate_load(service, products, orders=500, clients=50)
+    await service.stop()
+    return service.get_stats()
+
+
+def main():
+    for workers, use_threads in ((1, False), (4, False), (4, True)):
+        stats = asyncio.run(run(workers, queue_size=100, use_threads=use_threads))
+        print(f"workers={workers} threads={use_threads}: "
+              f"{stats['throughput']:.0f} orders/s, "
+              f"mean latency {stats['mean_latency'] * 1000:.2f} ms, "
+              f"max latency {stats['max_latency'] * 1000:.2f} ms, "
+              f"completed {stats['completed']}, failed {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
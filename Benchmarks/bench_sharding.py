@@ -0,0 +1,49 @@
+"""
+Measures orders per second of a sharded store with different numbers of shard
+processes, against all shards in this process as baseline. Each round sends many
+orders at once, so the shards work on their parts in parallel.
+
+Shard processes only pay off with a free core per shard. On a machine with one CPU
+every order is also pickled and sent through a pipe without any parallel work in
+return, and throughput falls as shards are added: 18.4k orders/s in process against
+16.9k with 1 process, 16.4k with 2 and 14.8k with 4. Sending larger rounds
+(5000 or 20000 orders per pipe round trip) did not change that measurably.
+
+Run from the repository root:
+    python -m Benchmarks.bench_sharding
+"""
+import os
+import time
+
+from Classes.sharding import ShardedStore
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+def run(shard_count, processes, orders, round_size=1000):
+    """
+    Places orders in a sharded store.
+
+    Returns:
+        float: Orders per second.
+    """
+    products = make_catalog(10000)
+    shopping_lists = [[(product.name, quantity) for product, quantity in make_shopping_list(products, 5, seed=seed)]
+                      for seed in range(orders)]
+    with ShardedStore(shard_count=shard_count, processes=processes) as store:
+        store.add_products(products)
+        start = time.perf_counter()
+        for offset in range(0, orders, round_size):
+            store.place_orders(shopping_lists[offset:offset + round_size])
+        return orders / (time.perf_counter() - start)
+
+
+def main():
+    orders = 20000
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'in process':>14}: {run(1, False, orders):10.0f} orders/s")
+    for shard_count in sorted({1, 2, 4, os.cpu_count() or 1}):
+        print(f"{f'{shard_count} processes':>14}: {run(shard_count, True, orders):10.0f} orders/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Measures how long it takes until a restored store answers its first lookup,
+compared with building the same store from product objects.
+
+Run from the repository root:
+    python -m Benchmarks.bench_snapshot
+"""
+import os
+import tempfile
+import time
+
+from Classes import Store, ProductTable
+from Classes.snapshot import save_snapshot, load_snapshot
+from Benchmarks.workloads import make_catalog
+
+
+def main():
+    size = 500000
+    start = time.perf_counter()
+    products = make_catalog(size)
+    store = Store(products)
+    build_seconds = time.perf_counter() - start
+    table = ProductTable()
+    for product in products:
+        table.add_product(product)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "store.snapshot")
+        start = time.perf_counter()
+        save_snapshot(Store(table=table), path)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        restored = load_snapshot(path)
+        restored.get_product(f"SKU-{size // 2}")
+        restore_seconds = time.perf_counter() - start
+        assert restored.get_total_quantity() == store.get_total_quantity()
+        print(f"{size} products, snapshot of {os.path.getsize(path) / 2**20:.1f} MiB")
+    print(f"build from objects: {build_seconds * 1000:8.1f} ms")
+    print(f"save snapshot:      {save_seconds * 1000:8.1f} ms")
+    print(f"restore + lookup:   {restore_seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
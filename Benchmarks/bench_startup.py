@@ -0,0 +1,70 @@
+"""
+Measures the startup time of short-lived processes: from interpreter start until
+the first page of products is ready, with the catalog built from product objects
+(eager), kept in a table (lazy, main.py with a catalog file) or mapped from a
+snapshot. Every variant runs in a fresh interpreter.
+
+Run from the repository root:
+    python -m Benchmarks.bench_startup
+"""
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from Benchmarks.bench_loader import FIELDS, make_rows
+
+
+SNIPPETS = {
+    "import only": "import Classes",
+    "eager catalog": ("from Classes import Store\n"
+                      "from Classes.loader import load_catalog\n"
+                      "store = Store()\n"
+                      "load_catalog({path!r}, store)\n"
+                      "store.search(limit=20)"),
+    "lazy catalog": ("from main import open_catalog\n"
+                     "open_catalog({path!r}).search(limit=20)"),
+    "lazy snapshot": ("from main import open_catalog\n"
+                      "open_catalog({snapshot!r}).search(limit=20)"),
+}
+
+
+def measure(code, repeat=3):
+    """
+    Runs code in fresh interpreters.
+
+    Returns:
+        float: The fastest wall time in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    size = 200000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.csv")
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(make_rows(size))
+        snapshot = os.path.join(directory, "catalog.snapshot")
+        subprocess.run([sys.executable, "-c",
+                        "from main import open_catalog\n"
+                        "from Classes.snapshot import save_snapshot\n"
+                        f"save_snapshot(open_catalog({path!r}), {snapshot!r})"], check=True)
+        print(f"{size} products")
+        print(f"{'interpreter':>14}: {measure('pass') * 1000:8.1f} ms")
+        for label, code in SNIPPETS.items():
+            seconds = measure(code.format(path=path, snapshot=snapshot))
+            print(f"{label:>14}: {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Throughput suite for the core operations: Store.order, Product.buy for every product
+type, Promotion.apply_promotion of every promotion, Store.get_all_products and
+Store.get_total_quantity, over catalogs from 10 to 10^6 products. The catalogs mix
+Product, NonStockedProduct and LimitedProduct (see workloads.make_catalog).
+
+Results are printed and can be written as JSON for regression tracking. Given an
+earlier result file, every benchmark is compared to it and the run fails if one
+got slower than the tolerance allows.
+
+Run from the repository root:
+    python -m Benchmarks.bench_suite
+    python -m Benchmarks.bench_suite --max-size 10000 --output results.json
+    python -m Benchmarks.bench_suite --baseline results.json --tolerance 0.2
+"""
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import sys
+import timeit
+
+from Classes import Store, Product, NonStockedProduct, LimitedProduct, PercentDiscount, SecondHalfPrice, ThirdOneFree
+from Benchmarks.workloads import make_catalog, make_shopping_list
+
+
+SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+
+def measure(function, repeat=3):
+    """
+    Times a function without arguments.
+
+    Args:
+        function (callable): The operation to time.
+        repeat (int): Number of timing rounds; the fastest one counts.
+
+    Returns:
+        float: Nanoseconds per call.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def bench_promotions():
+    """
+    Yields (benchmark name, nanoseconds per call) for every promotion.
+    """
+    product = Product("Pen", 0.99, 10)
+    for promotion in (PercentDiscount("30% off!", percent=30),
+                      SecondHalfPrice("Second Half price!"),
+                      ThirdOneFree("Third One Free!")):
+        yield f"{type(promotion).__name__}.apply_promotion", measure(lambda: promotion.apply_promotion(product, 7))
+
+
+def bench_catalog(size):
+    """
+    Yields (benchmark name, nanoseconds per call) for the operations on a catalog of the given size.
+    """
+    products = make_catalog(size)
+    store = Store(products)
+    shopping_lists = [make_shopping_list(products, 5, seed=seed) for seed in range(100)]
+    lists = itertools.cycle(shopping_lists)
+    yield "Store.order", measure(lambda: store.order(next(lists)))
+    for product_class in (Product, NonStockedProduct, LimitedProduct):
+        product = next(product for product in products if type(product) is product_class)
+        yield f"{product_class.__name__}.buy", measure(lambda: product.buy(1))
+    yield "Store.get_all_products", measure(store.get_all_products)
+    yield "Store.get_total_quantity", measure(store.get_total_quantity)
+
+
+def run(sizes):
+    """
+    Runs the whole suite.
+
+    Args:
+        sizes (list): The catalog sizes.
+
+    Returns:
+        dict: Machine-readable results: environment and one entry per benchmark and size.
+    """
+    results = [{"benchmark": name, "size": None, "ns_per_op": nanoseconds}
+               for name, nanoseconds in bench_promotions()]
+    for size in sizes:
+        results.extend({"benchmark": name, "size": size, "ns_per_op": nanoseconds}
+                       for name, nanoseconds in bench_catalog(size))
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "results": results}
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compares results with an earlier run.
+
+    Args:
+        results (dict): The results of run().
+        baseline (dict): The results of an earlier run().
+        tolerance (float): Allowed slowdown, e.g. 0.2 for 20 %.
+
+    Returns:
+        list: (benchmark, size, ratio) for every benchmark that got slower than allowed.
+    """
+    earlier = {(entry["benchmark"], entry["size"]): entry["ns_per_op"] for entry in baseline["results"]}
+    regressions = []
+    for entry in results["results"]:
+        key = (entry["benchmark"], entry["size"])
+        if key in earlier:
+            ratio = entry["ns_per_op"] / earlier[key]
+            if ratio > 1 + tolerance:
+                regressions.append((entry["benchmark"], entry["size"], ratio))
+    return regressions
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="largest catalog size to run")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown against the baseline")
+    options = parser.parse_args(arguments)
+
+    results = run([size for size in SIZES if size <= options.max_size])
+    for entry in results["results"]:
+        size = "-" if entry["size"] is None else entry["size"]
+        print(f"{entry['benchmark']:>32} {size:>8}: {entry['ns_per_op']:12.0f} ns/op")
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), options.tolerance)
+        for name, size, ratio in regressions:
+            print(f"Regression: {name} (size {size}) is {ratio:.2f}x slower")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Compares a nightly feed of stock and price updates applied with Store.apply_updates()
+against the per-call path (set_quantity(), set_price(), activate()).
+
+apply_updates() is not the faster path for a plain store: it validates every field,
+merges repeated updates of a product and checks the merged stock after each one,
+which the per-call loop below skips. On a one-CPU machine it runs at about 200k
+updates/s (115k when every product is updated once) against 280k-400k for the raw
+calls. In a thread safe store, where every call has to lock its product, the batch
+is on par or faster (100k-160k against 90k). What the batch buys is validation, one
+change and one round of observer notifications per product, and a report of the
+rejected updates.
+
+Run from the repository root:
+    python -m Benchmarks.bench_updates
+"""
+import random
+import time
+
+from Classes import Store, NonStockedProduct
+from Benchmarks.workloads import make_catalog
+
+
+def make_feed(products, size, seed=0, unique=False):
+    """
+    Builds update dicts: restocks, write-offs, absolute stock counts and price changes.
+    With unique, every product is updated at most once, as in a feed of final stock counts.
+    """
+    rng = random.Random(seed)
+    stocked = [product.name for product in products if not isinstance(product, NonStockedProduct)]
+    names = rng.sample(stocked, min(size, len(stocked))) if unique else None
+    feed = []
+    for number in range(size if names is None else len(names)):
+        name = rng.choice(stocked) if names is None else names[number]
+        kind = rng.random()
+        if kind < 0.4:
+            feed.append({"name": name, "delta": rng.randint(1, 100)})
+        elif kind < 0.6:
+            feed.append({"name": name, "delta": -rng.randint(1, 5)})
+        elif kind < 0.8:
+            feed.append({"name": name, "quantity": rng.randint(0, 1000)})
+        else:
+            feed.append({"name": name, "price": rng.randint(100, 100000) / 100})
+    return feed
+
+
+def apply_per_call(store, feed):
+    """
+    Applies the feed one call at a time, as callers had to before apply_updates(),
+    with no validation and, in a thread safe store, each product locked while it changes.
+    """
+    for update in feed:
+        product = store.get_product(update["name"])
+        if store.thread_safe:
+            with store.lock_products((product,)):
+                apply_to_product(product, update)
+        else:
+            apply_to_product(product, update)
+
+
+def apply_to_product(product, update):
+    """
+    Applies one update dict to its product.
+    """
+    if "price" in update:
+        product.set_price(update["price"])
+    if "quantity" in update or "delta" in update:
+        quantity = update.get("quantity", product.get_quantity()) + update.get("delta", 0)
+        if quantity < 0:
+            return
+        restocked = product.get_quantity() == 0 and quantity > 0
+        product.set_quantity(quantity)
+        if restocked:
+            product.activate()
+
+
+def main():
+    size = 200000
+    for unique in (False, True):
+        print("one update per product" if unique else "repeated products")
+        for thread_safe in (False, True):
+            products = make_catalog(100000, quantity=1000)
+            feed = make_feed(products, size, unique=unique)
+            store = Store(products, thread_safe=thread_safe)
+            start = time.perf_counter()
+            apply_per_call(store, feed)
+            per_call_seconds = time.perf_counter() - start
+
+            store = Store(make_catalog(100000, quantity=1000), thread_safe=thread_safe)
+            summary = store.apply_updates(feed)
+            label = "thread safe" if thread_safe else "plain"
+            print(f"{label:>12}: per call {len(feed) / per_call_seconds:9.0f} updates/s, "
+                  f"apply_updates {summary.get_updates_per_second():9.0f} updates/s")
+            print(f"{'':>12}  {summary}")
+
+
+if __name__ == "__main__":
+    main()
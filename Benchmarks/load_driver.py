@@ -0,0 +1,240 @@
+"""
+Headless load driver: replays an order stream through Store.order and reports
+latency percentiles, throughput and the rate of rejected orders.
+
+The order stream is a JSON Lines file with one order per line, either a list of
+[product name, quantity] pairs or a journal line ([sequence, pairs], see
+Classes/journal.py), so recorded journals can be replayed directly. A synthetic
+stream can be generated and written with --generate.
+
+Open loop sends orders at a fixed rate, whether the store keeps up or not, and
+measures latency from the time an order was due, so queueing shows up in the
+percentiles. Closed loop runs a fixed number of clients that send the next order
+as soon as the previous one is answered.
+
+Run from the repository root:
+    python -m Benchmarks.load_driver --size 10000 --generate 20000 --write orders.jsonl
+    python -m Benchmarks.load_driver --size 10000 --orders orders.jsonl --mode open --rate 2000
+    python -m Benchmarks.load_driver --catalog catalog.csv --orders orders.jsonl --mode closed --clients 8
+"""
+import argparse
+import concurrent.futures
+import json
+import random
+import sys
+import threading
+import time
+
+from Classes import Store
+from Classes.loader import load_catalog
+from Benchmarks.workloads import make_catalog
+
+
+def generate_orders(products, count, lines=3, max_quantity=5, seed=0):
+    """
+    Builds a synthetic order stream over a catalog.
+
+    Args:
+        products (list): The catalog.
+        count (int): The number of orders.
+        lines (int): The highest number of lines of an order.
+        max_quantity (int): The highest quantity of a line.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        list: Orders as lists of (product name, quantity) pairs.
+    """
+    rng = random.Random(seed)
+    names = [product.name for product in products]
+    return [[(rng.choice(names), rng.randint(1, max_quantity)) for _ in range(rng.randint(1, lines))]
+            for _ in range(count)]
+
+
+def read_orders(path):
+    """
+    Reads an order stream. Journal lines ([sequence, pairs]) and plain lists of pairs are accepted.
+
+    Args:
+        path (str): The JSON Lines file.
+
+    Returns:
+        list: Orders as lists of (product name, quantity) pairs.
+    """
+    orders = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            order = json.loads(line)
+            if len(order) == 2 and isinstance(order[0], int):
+                order = order[1]
+            orders.append([(name, quantity) for name, quantity in order])
+    return orders
+
+
+def write_orders(orders, path):
+    """
+    Writes an order stream that read_orders() can replay.
+    """
+    with open(path, "w", encoding="utf-8") as file:
+        for order in orders:
+            file.write(json.dumps(order) + "\n")
+
+
+def place(store, order):
+    """
+    Places one order by product names.
+
+    Returns:
+        bool: True if the order was accepted, False if it was rejected.
+    """
+    shopping_list = []
+    for name, quantity in order:
+        product = store.get_product(name)
+        if product is None:
+            return False
+        shopping_list.append((product, quantity))
+    try:
+        store.order(shopping_list)
+    except ValueError:
+        return False
+    return True
+
+
+def run_open_loop(store, orders, rate, workers):
+    """
+    Sends orders at a fixed rate to a pool of workers.
+
+    Returns:
+        list: (latency in seconds since the order was due, accepted) per order.
+    """
+    def timed(order, due):
+        accepted = place(store, order)
+        return time.perf_counter() - due, accepted
+
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        futures = []
+        start = time.perf_counter()
+        for index, order in enumerate(orders):
+            due = start + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            futures.append(executor.submit(timed, order, due))
+        return [future.result() for future in futures]
+
+
+def run_closed_loop(store, orders, clients):
+    """
+    Runs clients that each send the next order as soon as their previous one is answered.
+
+    Returns:
+        list: (latency in seconds, accepted) per order.
+    """
+    pending = iter(orders)
+    lock = threading.Lock()
+    results = []
+
+    def client():
+        own_results = []
+        while True:
+            with lock:
+                order = next(pending, None)
+            if order is None:
+                break
+            start = time.perf_counter()
+            accepted = place(store, order)
+            own_results.append((time.perf_counter() - start, accepted))
+        with lock:
+            results.extend(own_results)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns the nearest-rank percentile of sorted values, e.g. fraction 0.95 for p95.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(fraction * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(results, seconds):
+    """
+    Builds the report of a run.
+
+    Args:
+        results (list): (latency, accepted) per order.
+        seconds (float): The wall time of the run.
+
+    Returns:
+        dict: Orders, throughput, rejected rate and latency percentiles in milliseconds.
+    """
+    latencies = sorted(latency for latency, accepted in results)
+    rejected = sum(1 for latency, accepted in results if not accepted)
+    return {"orders": len(results),
+            "seconds": seconds,
+            "throughput": len(results) / seconds if seconds else 0.0,
+            "rejected": rejected,
+            "rejected_rate": rejected / len(results) if results else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000}
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    catalog = parser.add_mutually_exclusive_group()
+    catalog.add_argument("--catalog", help="catalog file (CSV or JSON Lines) to load")
+    catalog.add_argument("--size", type=int, default=10000, help="size of a synthetic catalog")
+    parser.add_argument("--quantity", type=int, default=10**6, help="stock of every synthetic product")
+    parser.add_argument("--orders", help="JSON Lines order stream to replay")
+    parser.add_argument("--generate", type=int, default=10000, help="number of synthetic orders")
+    parser.add_argument("--write", help="write the order stream to this file and stop")
+    parser.add_argument("--mode", choices=("open", "closed"), default="closed")
+    parser.add_argument("--rate", type=float, default=1000, help="orders per second in open loop")
+    parser.add_argument("--clients", type=int, default=4, help="clients in closed loop, workers in open loop")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    options = parser.parse_args(arguments)
+
+    store = Store(thread_safe=options.clients > 1)
+    if options.catalog:
+        print(load_catalog(options.catalog, store), file=sys.stderr)
+    else:
+        for product in make_catalog(options.size, quantity=options.quantity):
+            store.add_product(product)
+    if options.orders:
+        orders = read_orders(options.orders)
+    else:
+        orders = generate_orders(store.list_of_products, options.generate)
+    if options.write:
+        write_orders(orders, options.write)
+        return 0
+
+    start = time.perf_counter()
+    if options.mode == "open":
+        results = run_open_loop(store, orders, options.rate, options.clients)
+    else:
+        results = run_closed_loop(store, orders, options.clients)
+    report = summarize(results, time.perf_counter() - start)
+    report["mode"] = options.mode
+    if options.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['mode']} loop: {report['orders']} orders in {report['seconds']:.2f} s, "
+              f"{report['throughput']:.0f} orders/s, {report['rejected_rate']:.1%} rejected")
+        print(f"latency p50 {report['p50_ms']:.3f} ms, p95 {report['p95_ms']:.3f} ms, "
+              f"p99 {report['p99_ms']:.3f} ms, max {report['max_ms']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
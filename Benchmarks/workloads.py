@@ -0,0 +1,58 @@
+"""
+Synthetic catalogs and shopping lists shared by the benchmark scripts.
+"""
+import random
+
+from Classes import Product, NonStockedProduct, LimitedProduct, PercentDiscount, SecondHalfPrice, ThirdOneFree
+
+
+def make_catalog(size, seed=0, quantity=10**9):
+    """
+    Builds a mixed catalog of products with promotions. Limited products allow 1000
+    units per order, more than the synthetic shopping lists ask for.
+
+    Args:
+        size (int): The number of products.
+        seed (int): Seed for the random generator, so runs are reproducible.
+        quantity (int): The stock of every stocked product.
+
+    Returns:
+        list: A list of Product, NonStockedProduct and LimitedProduct instances.
+    """
+    rng = random.Random(seed)
+    promotions = [None,
+                  PercentDiscount("30% off!", percent=30),
+                  SecondHalfPrice("Second Half price!"),
+                  ThirdOneFree("Third One Free!")]
+    products = []
+    for number in range(size):
+        price = rng.randint(1, 200000) / 100
+        kind = rng.random()
+        if kind < 0.1:
+            product = NonStockedProduct(f"SKU-{number}", price)
+        elif kind < 0.2:
+            product = LimitedProduct(f"SKU-{number}", price, quantity, maximum=1000)
+        else:
+            product = Product(f"SKU-{number}", price, quantity)
+        promotion = promotions[number % len(promotions)]
+        if promotion:
+            product.set_promotion(promotion)
+        products.append(product)
+    return products
+
+
+def make_shopping_list(products, lines, seed=0, max_quantity=10):
+    """
+    Builds a shopping list that picks random products from a catalog.
+
+    Args:
+        products (list): The catalog to pick from.
+        lines (int): The number of order lines.
+        seed (int): Seed for the random generator.
+        max_quantity (int): The highest quantity of a single line.
+
+    Returns:
+        list: A list of (Product, int) tuples.
+    """
+    rng = random.Random(seed)
+    return [(rng.choice(products), rng.randint(1, max_quantity)) for _ in range(lines)]
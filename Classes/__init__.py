@@ -1,3 +1,32 @@
-from .store import Store
-from .products import Product, NonStockedProduct, LimitedProduct
-from .promotions import PercentDiscount, SecondHalfPrice, ThirdOneFree
\ No newline at end of file
+"""
+The store classes. Submodules are imported on first use of one of their names,
+so importing the package stays cheap for short-lived processes.
+"""
+import importlib
+
+
+_EXPORTS = {"Store": ".store",
+            "Product": ".products",
+            "NonStockedProduct": ".products",
+            "LimitedProduct": ".products",
+            "PercentDiscount": ".promotions",
+            "SecondHalfPrice": ".promotions",
+            "ThirdOneFree": ".promotions",
+            "OrderResult": ".orders",
+            "ProductTable": ".table",
+            "OrderService": ".service"}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,268 @@
+import bisect
+import threading
+
+
+STOCK_CHANGED = "stock_changed"
+THRESHOLD_CROSSED = "threshold_crossed"
+SOLD_OUT = "sold_out"
+ACTIVATED = "activated"
+DEACTIVATED = "deactivated"
+PRODUCT_ADDED = "product_added"
+PRODUCT_REMOVED = "product_removed"
+
+
+class Event:
+    """
+    A change of a watched product.
+
+    Attributes:
+        kind (str): One of the event kinds, e.g. STOCK_CHANGED or THRESHOLD_CROSSED.
+        product: The product that changed.
+        old_value: The value before the change, e.g. the old quantity. None for catalog events.
+        new_value: The value after the change. None for catalog events.
+        threshold (int): The crossed threshold for THRESHOLD_CROSSED, otherwise None.
+    """
+
+    __slots__ = ("kind", "product", "old_value", "new_value", "threshold")
+
+    def __init__(self, kind, product, old_value=None, new_value=None, threshold=None):
+        """
+        Initializes an Event.
+        """
+        self.kind = kind
+        self.product = product
+        self.old_value = old_value
+        self.new_value = new_value
+        self.threshold = threshold
+
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, {self.product.name!r}, {self.old_value!r}, {self.new_value!r})"
+
+
+class EventBus:
+    """
+    Turns product and store changes into events and delivers them to subscribers in
+    batches. Changes only append to a buffer; a background thread hands the buffer
+    to the subscribers every flush_interval seconds or once batch_size events are
+    waiting, so subscribers never run inside buy() or an order.
+
+    Low-stock thresholds are kept per product in a sorted list, so finding the
+    thresholds crossed by a quantity change is a binary search.
+
+    Attributes:
+        batch_size (int): The number of waiting events that triggers a delivery.
+        flush_interval (float): The maximum seconds an event waits before it is delivered.
+        delivery_errors (int): The number of subscriber calls that raised an exception.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=0.05):
+        """
+        Initializes an EventBus and starts the delivery thread.
+
+        Args:
+            batch_size (int): The number of waiting events that triggers a delivery. Must be positive.
+            flush_interval (float): The maximum seconds an event waits. 0 disables the
+                                    delivery thread; events are then delivered by flush().
+
+        Raises:
+            ValueError: If batch_size is not positive or flush_interval is negative.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than 0")
+        if flush_interval < 0:
+            raise ValueError("Flush interval must not be negative")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.delivery_errors = 0
+        self._subscribers = ()
+        self._thresholds = {}
+        self._pending = []
+        self._lock = threading.Lock()
+        self._delivery_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._deliverer = None
+        if flush_interval:
+            self._deliverer = threading.Thread(target=self._deliver_periodically, daemon=True)
+            self._deliverer.start()
+
+
+    def subscribe(self, callback, kinds=None):
+        """
+        Registers a subscriber.
+
+        Args:
+            callback (callable): Called with a list of Event objects per delivery.
+            kinds (iterable): The event kinds to receive. Defaults to all kinds.
+        """
+        self._subscribers = self._subscribers + ((callback, frozenset(kinds) if kinds else None),)
+
+
+    def unsubscribe(self, callback):
+        """
+        Unregisters a subscriber added with subscribe().
+
+        Args:
+            callback (callable): The callback to remove.
+
+        Raises:
+            ValueError: If the callback was never subscribed.
+        """
+        subscribers = [entry for entry in self._subscribers if entry[0] is not callback]
+        if len(subscribers) == len(self._subscribers):
+            raise ValueError("Callback is not subscribed")
+        self._subscribers = tuple(subscribers)
+
+
+    def set_threshold(self, product, threshold):
+        """
+        Adds a low-stock threshold to a product. A THRESHOLD_CROSSED event is emitted
+        whenever the quantity falls from above the threshold to the threshold or below,
+        or rises above it again.
+
+        Args:
+            product: The product.
+            threshold (int): The threshold. Must not be negative.
+
+        Raises:
+            ValueError: If the threshold is negative.
+        """
+        if threshold < 0:
+            raise ValueError("Threshold must not be negative")
+        with self._lock:
+            thresholds = list(self._thresholds.get(product, ()))
+            if threshold not in thresholds:
+                bisect.insort(thresholds, threshold)
+            self._thresholds[product] = thresholds
+
+
+    def remove_threshold(self, product, threshold):
+        """
+        Removes a threshold added with set_threshold().
+
+        Raises:
+            ValueError: If the product has no such threshold.
+        """
+        with self._lock:
+            thresholds = list(self._thresholds.get(product, ()))
+            thresholds.remove(threshold)
+            if thresholds:
+                self._thresholds[product] = thresholds
+            else:
+                del self._thresholds[product]
+
+
+    def get_thresholds(self, product):
+        """
+        Returns the thresholds of a product in ascending order.
+        """
+        return list(self._thresholds.get(product, ()))
+
+
+    def attach(self, store):
+        """
+        Emits events for every product of a store and for products being added or removed.
+
+        Args:
+            store (Store): The store to watch.
+        """
+        store.add_observer(self.on_change)
+
+
+    def detach(self, store):
+        """
+        Stops watching a store added with attach().
+        """
+        store.remove_observer(self.on_change)
+
+
+    def watch(self, product):
+        """
+        Emits events for a single product that is not watched through a store.
+        """
+        product.add_observer(self.on_change)
+
+
+    def unwatch(self, product):
+        """
+        Stops watching a product added with watch().
+        """
+        product.remove_observer(self.on_change)
+
+
+    def on_change(self, product, field, old_value, new_value):
+        """
+        Observer callback of watched products and stores. Only turns the change into
+        events and queues them.
+        """
+        if field == "quantity":
+            events = [Event(STOCK_CHANGED, product, old_value, new_value)]
+            thresholds = self._thresholds.get(product)
+            if thresholds:
+                low, high = sorted((old_value, new_value))
+                for index in range(bisect.bisect_left(thresholds, low), bisect.bisect_left(thresholds, high)):
+                    events.append(Event(THRESHOLD_CROSSED, product, old_value, new_value, thresholds[index]))
+            if new_value == 0:
+                events.append(Event(SOLD_OUT, product, old_value, new_value))
+        elif field == "active":
+            events = [Event(ACTIVATED if new_value else DEACTIVATED, product, old_value, new_value)]
+        elif field == "added":
+            events = [Event(PRODUCT_ADDED, product)]
+        elif field == "removed":
+            events = [Event(PRODUCT_REMOVED, product)]
+        else:
+            return
+        with self._lock:
+            self._pending.extend(events)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+
+    def flush(self):
+        """
+        Delivers all waiting events in the calling thread.
+        """
+        with self._delivery_lock:
+            with self._lock:
+                events, self._pending = self._pending, []
+            if not events:
+                return
+            for callback, kinds in self._subscribers:
+                selected = events if kinds is None else [event for event in events if event.kind in kinds]
+                if not selected:
+                    continue
+                try:
+                    callback(selected)
+                except Exception:
+                    self.delivery_errors += 1
+
+
+    def _deliver_periodically(self):
+        """
+        Background thread that delivers waiting events.
+        """
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+    def close(self):
+        """
+        Delivers all waiting events and stops the delivery thread.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._deliverer is not None:
+            self._deliverer.join()
+        self.flush()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,245 @@
+import bisect
+import heapq
+import threading
+import time
+from array import array
+
+
+class OrderHistory:
+    """
+    In-process history of sold order lines. Every line is one row of parallel arrays
+    (timestamp, order sequence number, product, quantity, price, promotion), so
+    millions of lines need no Python object each. Rollups per product, per promotion,
+    per time bucket and per product and time bucket are kept next to the rows and
+    updated as every line is recorded, so reports read the rollups instead of
+    scanning the rows.
+
+    Prices are stored as the store returns them: floats, or whole cents for a cents store.
+
+    Attributes:
+        bucket_seconds (float): The length of a time bucket, e.g. 3600 for hourly reports.
+        timestamps (array): The time of the order of every row.
+        sequences (array): The order sequence number of every row.
+        product_ids (array): Index into products for every row.
+        quantities (array): The sold quantity of every row.
+        prices (array): The price of every row.
+        promotion_ids (array): Index into promotions for every row, -1 for no promotion.
+        products (list): The distinct products that were sold.
+        promotions (list): The distinct promotions that were applied.
+    """
+
+    def __init__(self, bucket_seconds=3600, clock=time.time):
+        """
+        Initializes an empty OrderHistory.
+
+        Args:
+            bucket_seconds (float): The length of a time bucket. Must be positive.
+            clock (callable): Returns the current time in seconds, e.g. for tests.
+
+        Raises:
+            ValueError: If bucket_seconds is not positive.
+        """
+        if bucket_seconds <= 0:
+            raise ValueError("Bucket seconds must be greater than 0")
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+        self.timestamps = array("d")
+        self.sequences = array("q")
+        self.product_ids = array("i")
+        self.quantities = array("q")
+        self.prices = array("d")
+        self.promotion_ids = array("i")
+        self.products = []
+        self.promotions = []
+        self._product_ids = {}
+        self._promotion_ids = {}
+        self._by_product = {}
+        self._by_promotion = {}
+        self._by_bucket = {}
+        self._by_bucket_and_product = {}
+        self._buckets = []
+        self._orders = 0
+        self._lock = threading.Lock()
+
+
+    def __len__(self):
+        """
+        Returns the number of recorded lines.
+        """
+        return len(self.quantities)
+
+
+    def _intern(self, value, ids, values):
+        """
+        Returns the id of a product or promotion, adding it on first sight.
+        """
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(values)
+            values.append(value)
+        return value_id
+
+
+    def record(self, sequence, lines, timestamp=None):
+        """
+        Records the lines of a committed order and adds them to the rollups.
+
+        Args:
+            sequence (int): The sequence number of the order.
+            lines (list): (product, quantity, price) tuples of the sold lines.
+            timestamp (float): The time of the order. Defaults to now.
+        """
+        if timestamp is None:
+            timestamp = self._clock()
+        if sequence is None:
+            sequence = -1
+        bucket = int(timestamp // self.bucket_seconds)
+        product_ids = self._product_ids
+        promotion_ids = self._promotion_ids
+        by_product = self._by_product
+        by_promotion = self._by_promotion
+        by_bucket_and_product = self._by_bucket_and_product
+        with self._lock:
+            self._orders += 1
+            if not lines:
+                return
+            bucket_totals = self._by_bucket.get(bucket)
+            if bucket_totals is None:
+                bucket_totals = self._by_bucket[bucket] = [0, 0, 0]
+                bisect.insort(self._buckets, bucket)
+            for product, quantity, price in lines:
+                product_id = product_ids.get(product)
+                if product_id is None:
+                    product_id = self._intern(product, product_ids, self.products)
+                promotion = product.promotion
+                if promotion is None:
+                    promotion_id = -1
+                else:
+                    promotion_id = promotion_ids.get(promotion)
+                    if promotion_id is None:
+                        promotion_id = self._intern(promotion, promotion_ids, self.promotions)
+                self.timestamps.append(timestamp)
+                self.sequences.append(sequence)
+                self.product_ids.append(product_id)
+                self.quantities.append(quantity)
+                self.prices.append(price)
+                self.promotion_ids.append(promotion_id)
+                bucket_totals[0] += quantity
+                bucket_totals[1] += price
+                bucket_totals[2] += 1
+                totals = by_product.get(product_id)
+                if totals is None:
+                    by_product[product_id] = [quantity, price, 1]
+                else:
+                    totals[0] += quantity
+                    totals[1] += price
+                    totals[2] += 1
+                totals = by_promotion.get(promotion_id)
+                if totals is None:
+                    by_promotion[promotion_id] = [quantity, price, 1]
+                else:
+                    totals[0] += quantity
+                    totals[1] += price
+                    totals[2] += 1
+                totals = by_bucket_and_product.get((bucket, product_id))
+                if totals is None:
+                    by_bucket_and_product[bucket, product_id] = [quantity, price, 1]
+                else:
+                    totals[0] += quantity
+                    totals[1] += price
+                    totals[2] += 1
+
+
+    @staticmethod
+    def _report(totals):
+        """
+        Turns [units, revenue, lines] into a report dict.
+        """
+        if totals is None:
+            return {"units": 0, "revenue": 0, "lines": 0}
+        return {"units": totals[0], "revenue": totals[1], "lines": totals[2]}
+
+
+    def get_order_count(self):
+        """
+        Returns the number of recorded orders.
+        """
+        return self._orders
+
+
+    def get_product_sales(self, product):
+        """
+        Returns the sales of a product.
+
+        Args:
+            product: The product.
+
+        Returns:
+            dict: "units", "revenue" and "lines" (the number of order lines).
+        """
+        with self._lock:
+            totals = self._by_product.get(self._product_ids.get(product))
+            return self._report(totals)
+
+
+    def get_promotion_sales(self, promotion):
+        """
+        Returns the sales made with a promotion.
+
+        Args:
+            promotion (Promotion or None): The promotion, or None for the sales without promotion.
+
+        Returns:
+            dict: "units", "revenue" and "lines".
+        """
+        promotion_id = -1 if promotion is None else self._promotion_ids.get(promotion)
+        with self._lock:
+            return self._report(self._by_promotion.get(promotion_id))
+
+
+    def get_sales_by_bucket(self, start=None, end=None, product=None):
+        """
+        Returns the sales per time bucket, e.g. units sold per hour.
+
+        Args:
+            start (float): Only buckets that end after this time. Defaults to the first bucket.
+            end (float): Only buckets that start before this time. Defaults to the last bucket.
+            product: Only the sales of this product. Defaults to all products.
+
+        Returns:
+            list: (bucket start time, units, revenue) tuples in time order, buckets without
+                  sales left out.
+        """
+        with self._lock:
+            buckets = self._buckets
+            first = 0 if start is None else bisect.bisect_right(buckets, start // self.bucket_seconds - 1)
+            last = len(buckets) if end is None else bisect.bisect_left(buckets, end / self.bucket_seconds)
+            if product is None:
+                rows = [(bucket, self._by_bucket[bucket]) for bucket in buckets[first:last]]
+            else:
+                product_id = self._product_ids.get(product)
+                rows = [(bucket, self._by_bucket_and_product.get((bucket, product_id)))
+                        for bucket in buckets[first:last]]
+        return [(bucket * self.bucket_seconds, totals[0], totals[1]) for bucket, totals in rows if totals is not None]
+
+
+    def get_top_products(self, count=10, by="units"):
+        """
+        Returns the best selling products.
+
+        Args:
+            count (int): The number of products.
+            by (str): "units" or "revenue".
+
+        Returns:
+            list: (product, units, revenue) tuples, best first.
+
+        Raises:
+            ValueError: If by is unknown.
+        """
+        if by not in ("units", "revenue"):
+            raise ValueError(f"Unknown ranking '{by}'")
+        index = 0 if by == "units" else 1
+        with self._lock:
+            best = heapq.nlargest(count, self._by_product.items(), key=lambda item: item[1][index])
+        return [(self.products[product_id], totals[0], totals[1]) for product_id, totals in best]
@@ -0,0 +1,211 @@
+import json
+import os
+import threading
+import time
+
+from .snapshot import load_snapshot
+
+
+class OrderJournal:
+    """
+    Append-only log of committed orders. Every order is one JSON line with its sequence
+    number and (product name, quantity) pairs. Lines are collected in memory and written
+    with one fsync per group (group commit), either when batch_size orders are waiting
+    or when the oldest waiting order is flush_interval seconds old.
+
+    Attributes:
+        path (str): The journal file.
+        batch_size (int): The number of orders written together.
+        flush_interval (float): The maximum seconds an order waits before it is written.
+        fsync (bool): If True, every group is forced to disk with os.fsync().
+    """
+
+    def __init__(self, path, batch_size=100, flush_interval=0.05, fsync=True):
+        """
+        Opens (or continues) a journal file and starts the background flusher.
+        A torn last line, left by a crash while writing, is cut off first, so new
+        orders start on a line of their own.
+
+        Args:
+            path (str): The journal file.
+            batch_size (int): The number of orders written together. Must be positive.
+            flush_interval (float): The maximum seconds an order waits. 0 disables the timer.
+            fsync (bool): Force every group to disk.
+
+        Raises:
+            ValueError: If batch_size is not positive or flush_interval is negative.
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than 0")
+        if flush_interval < 0:
+            raise ValueError("Flush interval must not be negative")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        _truncate_torn_tail(path)
+        self._file = open(path, "a", encoding="utf-8")
+        self._buffer = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flusher.start()
+
+
+    def append(self, sequence, shopping_list):
+        """
+        Adds a committed order. It is written once the group is full or old enough.
+
+        Args:
+            sequence (int): The sequence number of the order.
+            shopping_list (list): The (Product, int) tuples of the order.
+        """
+        line = json.dumps([sequence, [[product.name, quantity] for product, quantity in shopping_list]])
+        with self._lock:
+            if not self._buffer:
+                self._oldest = time.monotonic()
+            self._buffer.append(line)
+            if len(self._buffer) >= self.batch_size:
+                self._write()
+
+
+    def flush(self):
+        """
+        Writes all waiting orders to disk.
+        """
+        with self._lock:
+            self._write()
+
+
+    def _write(self):
+        """
+        Writes the buffer as one group. The caller holds the lock.
+        """
+        if not self._buffer:
+            return
+        self._file.write("\n".join(self._buffer) + "\n")
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._buffer = []
+        self._oldest = None
+
+
+    def _flush_periodically(self):
+        """
+        Background thread that writes groups whose oldest order waited flush_interval seconds.
+        """
+        while not self._closed.wait(self.flush_interval / 2):
+            with self._lock:
+                if self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval:
+                    self._write()
+
+
+    def close(self):
+        """
+        Writes all waiting orders, stops the background flusher and closes the file.
+        """
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        with self._lock:
+            self._write()
+            self._file.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _truncate_torn_tail(path, chunk_size=4096):
+    """
+    Cuts a journal file after its last complete line. Does nothing if the file does not exist.
+    """
+    try:
+        file = open(path, "rb+")
+    except FileNotFoundError:
+        return
+    with file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position < end:
+            file.truncate(position)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def read_journal(path):
+    """
+    Reads the orders of a journal file. A torn last line, left by a crash while
+    writing, is ignored.
+
+    Args:
+        path (str): The journal file.
+
+    Yields:
+        tuple: The sequence number and a list of (product name, quantity) pairs.
+
+    Raises:
+        ValueError: If a line other than the last one is damaged.
+    """
+    with open(path, encoding="utf-8") as file:
+        pending_error = None
+        for line_number, line in enumerate(file, 1):
+            if pending_error is not None:
+                raise ValueError(f"Journal line {pending_error} is damaged")
+            try:
+                sequence, lines = json.loads(line)
+            except ValueError:
+                pending_error = line_number
+                continue
+            yield sequence, [(name, quantity) for name, quantity in lines]
+
+
+def replay(snapshot_path, journal_path, thread_safe=False):
+    """
+    Rebuilds a store from a snapshot and the orders journaled after it.
+    Orders with a sequence number up to the one stored in the snapshot are skipped.
+
+    Args:
+        snapshot_path (str): The snapshot file, see save_snapshot().
+        journal_path (str): The journal file.
+        thread_safe (bool): Passed on to the Store.
+
+    Returns:
+        Store: The restored store.
+
+    Raises:
+        ValueError: If a journaled order cannot be applied to the snapshot.
+    """
+    store = load_snapshot(snapshot_path, thread_safe=thread_safe)
+    if not os.path.exists(journal_path):
+        return store
+    snapshot_sequence = store.get_order_sequence()
+    for sequence, lines in read_journal(journal_path):
+        if sequence <= snapshot_sequence:
+            continue
+        shopping_list = []
+        for name, quantity in lines:
+            product = store.get_product(name)
+            if product is None:
+                raise ValueError(f"Journaled order {sequence} refers to unknown product '{name}'")
+            shopping_list.append((product, quantity))
+        result = store.place_order(shopping_list)
+        if not result.is_successful():
+            raise ValueError(f"Journaled order {sequence} cannot be applied: {result}")
+    return store
@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _WindowCounter:
+    """
+    Units bought in the last window, kept in a fixed ring of buckets. The sum over the
+    ring is maintained while buckets are added and expire, so reading it is O(1).
+    """
+
+    __slots__ = ("counts", "total", "bucket", "last_purchase")
+
+    def __init__(self, buckets, bucket):
+        self.counts = [0] * buckets
+        self.total = 0
+        self.bucket = bucket
+        self.last_purchase = bucket
+
+
+    def advance(self, bucket):
+        """
+        Moves the ring forward to the current bucket, dropping the expired ones.
+        At most one step per bucket of the ring is needed, however long the counter was idle.
+        """
+        steps = bucket - self.bucket
+        if steps <= 0:
+            return
+        counts = self.counts
+        if steps >= len(counts):
+            counts[:] = [0] * len(counts)
+            self.total = 0
+        else:
+            for step in range(1, steps + 1):
+                index = (self.bucket + step) % len(counts)
+                self.total -= counts[index]
+                counts[index] = 0
+        self.bucket = bucket
+
+
+    def add(self, quantity):
+        """
+        Adds units to the current bucket. Negative quantities give units back.
+        """
+        index = self.bucket % len(self.counts)
+        quantity = max(quantity, -self.counts[index])
+        self.counts[index] += quantity
+        self.total += quantity
+        if quantity > 0:
+            self.last_purchase = self.bucket
+
+
+class PurchaseLimiter:
+    """
+    Limits how many units of a product one customer may buy within a rolling window,
+    e.g. at most 2 per customer per 24 hours. Every (customer, product) pair has a
+    ring of bucket counters, so a check costs the same at any order rate and a pair
+    needs a fixed amount of memory. Pairs without purchases in the last window are
+    dropped, so memory only grows with the customers that bought recently.
+
+    The window slides in steps of window / buckets seconds: a purchase counts until
+    the bucket it fell into has left the window.
+
+    Attributes:
+        window (float): The length of the window in seconds.
+        buckets (int): The number of buckets the window is split into.
+    """
+
+    def __init__(self, window=86400, buckets=24, clock=time.monotonic):
+        """
+        Initializes a PurchaseLimiter without limits.
+
+        Args:
+            window (float): The length of the window in seconds. Must be positive.
+            buckets (int): The number of buckets the window is split into. Must be positive.
+            clock (callable): Returns the current time in seconds, e.g. for tests.
+
+        Raises:
+            ValueError: If window or buckets is not positive.
+        """
+        if window <= 0:
+            raise ValueError("Window must be greater than 0")
+        if buckets <= 0:
+            raise ValueError("Buckets must be greater than 0")
+        self.window = window
+        self.buckets = buckets
+        self._bucket_seconds = window / buckets
+        self._clock = clock
+        self._limits = {}
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+
+    def set_limit(self, product, maximum):
+        """
+        Limits a product per customer and window.
+
+        Args:
+            product: The product to limit.
+            maximum (int): The units one customer may buy per window. Must not be negative.
+
+        Raises:
+            ValueError: If maximum is negative.
+        """
+        if maximum < 0:
+            raise ValueError("Maximum must not be negative")
+        self._limits[product] = maximum
+
+
+    def remove_limit(self, product):
+        """
+        Removes the limit of a product.
+
+        Raises:
+            KeyError: If the product has no limit.
+        """
+        del self._limits[product]
+
+
+    def get_limit(self, product):
+        """
+        Returns the limit of a product per customer and window, or None if it has none.
+        """
+        return self._limits.get(product)
+
+
+    def get_bought(self, customer, product):
+        """
+        Returns the units a customer bought of a product within the window.
+        """
+        with self._lock:
+            counter = self._counters.get((customer, product))
+            if counter is None:
+                return 0
+            counter.advance(self._current_bucket())
+            return counter.total
+
+
+    def acquire(self, customer, quantities):
+        """
+        Checks the units of an order against the limits and, if all fit, counts them.
+        Check and count happen together, so concurrent orders of one customer cannot
+        both slip through.
+
+        Args:
+            customer: The customer, any hashable id.
+            quantities (dict): Product mapped to the units of the order.
+
+        Returns:
+            list: (product, reason) tuples of the products over their limit. If the
+                  list is empty, the units were counted.
+        """
+        limits = self._limits
+        limited = [(product, quantity) for product, quantity in quantities.items() if product in limits]
+        if not limited:
+            return []
+        with self._lock:
+            bucket = self._current_bucket()
+            self._expire(bucket)
+            failures = []
+            for product, quantity in limited:
+                counter = self._counters.get((customer, product))
+                bought = 0
+                if counter is not None:
+                    counter.advance(bucket)
+                    bought = counter.total
+                if bought + quantity > limits[product]:
+                    failures.append((product, f"Limit of {limits[product]} per customer and window reached"))
+            if failures:
+                return failures
+            for product, quantity in limited:
+                key = (customer, product)
+                counter = self._counters.pop(key, None)
+                if counter is None:
+                    counter = _WindowCounter(self.buckets, bucket)
+                counter.add(quantity)
+                self._counters[key] = counter
+            return []
+
+
+    def release(self, customer, quantities):
+        """
+        Gives back units counted by acquire(), e.g. when the order could not be committed.
+
+        Args:
+            customer: The customer.
+            quantities (dict): Product mapped to the units to give back.
+        """
+        with self._lock:
+            bucket = self._current_bucket()
+            for product, quantity in quantities.items():
+                counter = self._counters.get((customer, product))
+                if counter is not None:
+                    counter.advance(bucket)
+                    counter.add(-quantity)
+
+
+    def _current_bucket(self):
+        """
+        Returns the number of the bucket the current time falls into.
+        """
+        return int(self._clock() // self._bucket_seconds)
+
+
+    def _expire(self, bucket):
+        """
+        Drops the counters that were last used a whole window ago. Counters are kept
+        in the order of their last purchase, so only the expired ones are looked at.
+        """
+        counters = self._counters
+        while counters:
+            key, counter = next(iter(counters.items()))
+            if bucket - counter.last_purchase < self.buckets:
+                return
+            del counters[key]
+
+
+    def __len__(self):
+        """
+        Returns the number of (customer, product) pairs that are tracked.
+        """
+        return len(self._counters)
@@ -0,0 +1,272 @@
+import csv
+import json
+import time
+
+from .products import Product, NonStockedProduct, LimitedProduct
+from .promotions import create_promotion
+from .table import ProductTable, PRODUCT, NON_STOCKED, LIMITED
+
+
+PRODUCT_TYPES = {"product": Product, "non_stocked": NonStockedProduct, "limited": LimitedProduct}
+TABLE_KINDS = {"product": PRODUCT, "non_stocked": NON_STOCKED, "limited": LIMITED}
+
+
+class CatalogLoadReport:
+    """
+    Summary of a catalog import.
+
+    Attributes:
+        loaded (int): The number of products added to the store.
+        errors (list): (line_number, message) tuples of the rejected rows.
+        seconds (float): The time the import took.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty CatalogLoadReport.
+        """
+        self.loaded = 0
+        self.errors = []
+        self.seconds = 0.0
+
+
+    def get_rows_per_second(self):
+        """
+        Calculates the throughput of the import.
+
+        Returns:
+            float: Processed rows (loaded and rejected) per second.
+        """
+        rows = self.loaded + len(self.errors)
+        return rows / self.seconds if self.seconds else 0.0
+
+
+    def __str__(self):
+        """
+        Returns a one line summary of the import.
+        """
+        return (f"Loaded {self.loaded} products, {len(self.errors)} errors, "
+                f"{self.get_rows_per_second():.0f} rows/sec")
+
+
+def iter_rows(path):
+    """
+    Streams the rows of a CSV or JSON Lines catalog file, one at a time.
+    The format is picked by the file suffix (.jsonl / .json for JSON Lines, CSV otherwise).
+
+    Args:
+        path (str): The catalog file.
+
+    Yields:
+        tuple: The line number and the row as dict, or the line number and an error message (str)
+               if the line is no valid JSON object.
+    """
+    with open(path, newline="", encoding="utf-8") as file:
+        if str(path).endswith((".jsonl", ".json")):
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as error:
+                    yield line_number, f"Invalid JSON: {error.msg}"
+                    continue
+                if not isinstance(row, dict):
+                    yield line_number, "Row has to be a JSON object"
+                    continue
+                yield line_number, row
+        else:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield reader.line_num, row
+
+
+def _field(row, name, default=None):
+    """
+    Returns a field of a row, treating empty CSV cells as missing.
+    """
+    value = row.get(name)
+    if value is None or value == "":
+        return default
+    return value
+
+
+def build_product(row, promotions=None):
+    """
+    Creates a product from a catalog row.
+
+    Columns: type ("product", "non_stocked" or "limited", default "product"), name, price,
+    quantity, maximum (limited only), active (optional, "false" or "0" deactivates the product),
+    promotion ("percent_discount", "second_half_price", "third_one_free"), promotion_name
+    and percent (percent_discount only).
+
+    Args:
+        row (dict): The catalog row.
+        promotions (dict): Cache of promotions already created, so rows with the same
+                           promotion share one instance.
+
+    Returns:
+        Product: The new product with its promotion set.
+
+    Raises:
+        ValueError: If the row is invalid.
+    """
+    product_type = _field(row, "type", "product")
+    if product_type not in PRODUCT_TYPES:
+        raise ValueError(f"Unknown product type '{product_type}'")
+    name = _field(row, "name", "")
+    price = _field(row, "price")
+    if product_type == "non_stocked":
+        product = NonStockedProduct(name, price)
+    elif product_type == "limited":
+        product = LimitedProduct(name, price, _field(row, "quantity"), _field(row, "maximum"))
+    else:
+        product = Product(name, price, _field(row, "quantity"))
+    if str(_field(row, "active", True)).lower() in ("false", "0"):
+        product.deactivate()
+    promotion = _row_promotion(row, promotions if promotions is not None else {})
+    if promotion:
+        product.set_promotion(promotion)
+    return product
+
+
+def _row_promotion(row, promotions):
+    """
+    Returns the promotion of a catalog row, sharing one instance per distinct promotion.
+
+    Args:
+        row (dict): The catalog row.
+        promotions (dict): Cache of promotions already created.
+
+    Returns:
+        Promotion or None: The promotion, or None if the row has none.
+    """
+    promotion_kind = _field(row, "promotion")
+    if not promotion_kind:
+        return None
+    key = (promotion_kind, _field(row, "promotion_name", promotion_kind), _field(row, "percent"))
+    if key not in promotions:
+        promotions[key] = create_promotion(*key)
+    return promotions[key]
+
+
+def product_to_row(product):
+    """
+    Turns a product into a catalog row, the reverse of build_product().
+
+    Args:
+        product: A Product, NonStockedProduct or LimitedProduct.
+
+    Returns:
+        dict: The catalog row.
+
+    Raises:
+        ValueError: If the promotion of the product has no kind and cannot be written.
+    """
+    if isinstance(product, LimitedProduct):
+        row = {"type": "limited", "quantity": product.get_quantity(), "maximum": product.get_maximum()}
+    elif isinstance(product, NonStockedProduct):
+        row = {"type": "non_stocked"}
+    else:
+        row = {"type": "product", "quantity": product.get_quantity()}
+    row["name"] = product.name
+    row["price"] = product.price
+    if not product.is_active():
+        row["active"] = False
+    promotion = product.get_promotion()
+    if promotion:
+        if promotion.kind is None:
+            raise ValueError(f"Promotion '{promotion.name}' cannot be written")
+        row["promotion"] = promotion.kind
+        row["promotion_name"] = promotion.name
+        if hasattr(promotion, "percent"):
+            row["percent"] = promotion.percent
+    return row
+
+
+def iter_catalog(path):
+    """
+    Streams the products of a catalog file. Invalid rows are reported instead of
+    aborting the import.
+
+    Args:
+        path (str): The catalog file.
+
+    Yields:
+        tuple: (line_number, product, None) for valid rows and
+               (line_number, None, message) for invalid rows.
+    """
+    promotions = {}
+    for line_number, row in iter_rows(path):
+        if isinstance(row, str):
+            yield line_number, None, row
+            continue
+        try:
+            yield line_number, build_product(row, promotions), None
+        except (ValueError, TypeError, AttributeError) as error:
+            yield line_number, None, str(error)
+
+
+def load_catalog(path, store):
+    """
+    Imports a catalog file into a store.
+
+    Args:
+        path (str): The catalog file.
+        store (Store): The store the products are added to.
+
+    Returns:
+        CatalogLoadReport: The number of loaded products, the rejected rows and the throughput.
+    """
+    report = CatalogLoadReport()
+    start = time.perf_counter()
+    for line_number, product, error in iter_catalog(path):
+        if product is not None:
+            try:
+                store.add_product(product)
+            except ValueError as add_error:
+                error = str(add_error)
+            else:
+                report.loaded += 1
+                continue
+        report.errors.append((line_number, error))
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def load_table(path):
+    """
+    Reads a catalog file into a ProductTable without creating product objects.
+    A Store over the table (Store(table=table)) only turns rows into products when
+    they are looked up, listed or ordered, which keeps startup cheap for large catalogs.
+
+    Args:
+        path (str): The catalog file, see build_product() for the columns.
+
+    Returns:
+        tuple: The ProductTable and a CatalogLoadReport with the rejected rows.
+    """
+    report = CatalogLoadReport()
+    start = time.perf_counter()
+    table = ProductTable()
+    promotions = {}
+    for line_number, row in iter_rows(path):
+        if isinstance(row, str):
+            report.errors.append((line_number, row))
+            continue
+        try:
+            product_type = _field(row, "type", "product")
+            if product_type not in TABLE_KINDS:
+                raise ValueError(f"Unknown product type '{product_type}'")
+            active = None
+            if str(_field(row, "active", True)).lower() in ("false", "0"):
+                active = False
+            table.add(TABLE_KINDS[product_type], _field(row, "name", ""), _field(row, "price"),
+                      quantity=_field(row, "quantity"), maximum=_field(row, "maximum"),
+                      promotion=_row_promotion(row, promotions), active=active)
+        except (ValueError, TypeError, AttributeError) as error:
+            report.errors.append((line_number, str(error)))
+        else:
+            report.loaded += 1
+    report.seconds = time.perf_counter() - start
+    return table, report
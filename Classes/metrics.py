@@ -0,0 +1,349 @@
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+
+from .pricing import PricingPlan
+from .products import Product
+from .promotions import Promotion
+from .store import Store
+
+
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                   1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0)
+
+
+class Histogram:
+    """
+    Latency histogram with fixed upper bounds, like a Prometheus histogram.
+
+    Attributes:
+        buckets (tuple): The upper bounds in seconds, ascending.
+        counts (list): Observations per bucket; the last entry counts the ones above every bound.
+        count (int): The number of observations.
+        total (float): The sum of all observations in seconds.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "total")
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Initializes an empty Histogram.
+
+        Args:
+            buckets (tuple): The upper bounds in seconds, ascending.
+        """
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+
+    def observe(self, seconds):
+        """
+        Records one observation.
+
+        Args:
+            seconds (float): The measured latency.
+        """
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+
+class Metrics:
+    """
+    Latency histograms and error counters of the instrumented operations. Every series
+    is identified by a metric name and an optional (label name, label value) pair,
+    e.g. ("product_buy", ("product_type", "LimitedProduct")).
+
+    Attributes:
+        buckets (tuple): The histogram bounds in seconds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Initializes an empty Metrics instance.
+
+        Args:
+            buckets (tuple): The histogram bounds in seconds, ascending.
+        """
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+
+    def observe(self, metric, label, seconds):
+        """
+        Records the latency of one call.
+
+        Args:
+            metric (str): The metric name.
+            label (tuple): (label name, label value) or None.
+            seconds (float): The measured latency.
+        """
+        key = (metric, label)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+
+    def count_error(self, metric, label):
+        """
+        Counts one call that raised an exception.
+
+        Args:
+            metric (str): The metric name.
+            label (tuple): (label name, label value) or None.
+        """
+        key = (metric, label)
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+
+    def get_histogram(self, metric, label=None):
+        """
+        Returns the histogram of one series.
+
+        Args:
+            metric (str): The metric name.
+            label (tuple): (label name, label value) or None.
+
+        Returns:
+            Histogram or None: The histogram, or None if nothing was recorded.
+        """
+        return self._histograms.get((metric, label))
+
+
+    def get_errors(self, metric, label=None):
+        """
+        Returns the number of failed calls of one series.
+        """
+        return self._errors.get((metric, label), 0)
+
+
+    def reset(self):
+        """
+        Drops all recorded values.
+        """
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+
+
+    def to_dict(self):
+        """
+        Returns all series as plain data, e.g. for json.dump().
+
+        Returns:
+            dict: "histograms" and "errors", each a list of series.
+        """
+        with self._lock:
+            histograms = [{"metric": metric, "labels": dict([label]) if label else {},
+                           "buckets": list(histogram.buckets), "counts": list(histogram.counts),
+                           "count": histogram.count, "sum": histogram.total}
+                          for (metric, label), histogram in sorted(self._histograms.items(), key=_series_key)]
+            errors = [{"metric": metric, "labels": dict([label]) if label else {}, "count": count}
+                      for (metric, label), count in sorted(self._errors.items(), key=_series_key)]
+        return {"histograms": histograms, "errors": errors}
+
+
+    def to_prometheus(self, prefix="bestbuy_"):
+        """
+        Returns all series in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Put in front of every metric name.
+
+        Returns:
+            str: The exposition text.
+        """
+        data = self.to_dict()
+        lines = []
+        typed = set()
+        for series in data["histograms"]:
+            name = f"{prefix}{series['metric']}_seconds"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip(series["buckets"] + ["+Inf"], series["counts"]):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(series['labels'], le=bound)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(series['labels'])} {series['sum']!r}")
+            lines.append(f"{name}_count{_labels(series['labels'])} {series['count']}")
+        for series in data["errors"]:
+            name = f"{prefix}{series['metric']}_errors_total"
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{name}{_labels(series['labels'])} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+
+    def export(self, path):
+        """
+        Writes all series to a file that a local scraper can read. Files ending in
+        ".json" get JSON, every other file the Prometheus text format. The file is
+        replaced in one step, so a reader never sees half of it.
+
+        Args:
+            path (str): The target file.
+        """
+        if path.endswith(".json"):
+            text = json.dumps(self.to_dict(), indent=2)
+        else:
+            text = self.to_prometheus()
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temporary_path, path)
+
+
+def _series_key(item):
+    """
+    Sorts series by metric name and label, with unlabeled series first.
+    """
+    (metric, label), value = item
+    return metric, label or ()
+
+
+def _labels(labels, le=None):
+    """
+    Formats labels as {name="value",...}, or an empty string if there are none.
+    """
+    pairs = [f'{name}="{value}"' for name, value in labels.items()]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _no_label(instance):
+    """
+    Store and pricing plan operations are recorded without label.
+    """
+    return None
+
+
+def _product_label(instance):
+    """
+    Labels a product operation with the product class.
+    """
+    return ("product_type", type(instance).__name__)
+
+
+def _promotion_label(instance):
+    """
+    Labels a promotion with its class.
+    """
+    return ("promotion_type", type(instance).__name__)
+
+
+def _targets():
+    """
+    Returns (class, method name, metric name, label function) for every instrumented method.
+    Promotions are wrapped where each child class defines its methods, so calls are
+    never counted twice.
+    """
+    targets = [(Store, "order", "store_order", _no_label),
+               (Store, "place_order", "store_place_order", _no_label),
+               (Store, "order_batch", "store_order_batch", _no_label),
+               (Store, "validate_shopping_list", "store_validate", _no_label),
+               (Product, "buy", "product_buy", _product_label),
+               (Product, "quote_cents", "product_quote_cents", _product_label),
+               (PricingPlan, "price_line", "pricing_line", _no_label),
+               (PricingPlan, "get_cart_discounts", "pricing_cart_discounts", _no_label)]
+    promotion_classes = list(Promotion.__subclasses__())
+    while promotion_classes:
+        promotion_class = promotion_classes.pop()
+        promotion_classes.extend(promotion_class.__subclasses__())
+        for method_name in ("apply_promotion", "apply_promotion_cents"):
+            if method_name in vars(promotion_class):
+                targets.append((promotion_class, method_name, "promotion_apply", _promotion_label))
+    return targets
+
+
+def _instrument(function, metrics, metric, label_of):
+    """
+    Returns a wrapper of a method that records its latency and failures.
+    """
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        except Exception:
+            metrics.count_error(metric, label_of(self))
+            raise
+        finally:
+            metrics.observe(metric, label_of(self), perf_counter() - start)
+
+    return wrapper
+
+
+_lock = threading.Lock()
+_originals = []
+_metrics = None
+
+
+def enable(metrics=None):
+    """
+    Starts recording latencies of Store.order, Store.place_order, Store.order_batch,
+    validation, Product.buy and Product.quote_cents (per product type), the lines and
+    cart discounts priced by a PromotionEngine, and every promotion (per promotion type).
+    Cents stores price lines with quote_cents instead of buy, stores with a pricing
+    engine with PricingPlan.price_line. A plan compiled before enable() keeps calling
+    the promotions it resolved then, so their promotion_apply series stay empty; the
+    pricing_line series covers them. Plain order() calls skip place_order() and validation.
+    The methods are wrapped on their classes, so this applies to all stores.
+    While instrumentation is disabled, the original methods run without any overhead.
+
+    Args:
+        metrics (Metrics): Where to record. Defaults to a new Metrics instance.
+
+    Returns:
+        Metrics: The instance that records the values.
+
+    Raises:
+        ValueError: If instrumentation is already enabled.
+    """
+    global _metrics
+    with _lock:
+        if _metrics is not None:
+            raise ValueError("Instrumentation is already enabled")
+        _metrics = metrics if metrics is not None else Metrics()
+        for owner, method_name, metric, label_of in _targets():
+            function = vars(owner)[method_name]
+            _originals.append((owner, method_name, function))
+            setattr(owner, method_name, _instrument(function, _metrics, metric, label_of))
+        return _metrics
+
+
+def disable():
+    """
+    Stops recording and puts the original methods back.
+
+    Returns:
+        Metrics or None: The instance that recorded the values, or None if instrumentation was off.
+    """
+    global _metrics
+    with _lock:
+        while _originals:
+            owner, method_name, function = _originals.pop()
+            setattr(owner, method_name, function)
+        metrics, _metrics = _metrics, None
+        return metrics
+
+
+def get_metrics():
+    """
+    Returns the Metrics instance that is recording, or None if instrumentation is off.
+    """
+    return _metrics
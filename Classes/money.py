@@ -0,0 +1,49 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+
+def to_cents(amount):
+    """
+    Converts an amount of money to whole cents, rounding half up.
+    The amount is read through its decimal string, so 0.29 becomes 29 and not 28.
+
+    Args:
+        amount (float, int, str or Decimal): The amount in currency units.
+
+    Returns:
+        int: The amount in cents.
+
+    Raises:
+        ValueError: If the amount is not a valid number.
+    """
+    try:
+        cents = Decimal(str(amount)) * 100
+        return int(cents.quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ValueError("Amount must be a valid number")
+
+
+def from_cents(cents):
+    """
+    Converts whole cents to currency units, e.g. for printing.
+
+    Args:
+        cents (int): The amount in cents.
+
+    Returns:
+        float: The amount in currency units.
+    """
+    return cents / 100
+
+
+def divide_half_up(numerator, denominator):
+    """
+    Divides two non-negative integers and rounds the result half up, without floats.
+
+    Args:
+        numerator (int): The dividend.
+        denominator (int): The divisor. Must be positive.
+
+    Returns:
+        int: numerator / denominator rounded to the nearest integer, halves rounded up.
+    """
+    return (2 * numerator + denominator) // (2 * denominator)
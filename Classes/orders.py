@@ -0,0 +1,85 @@
+class OrderResult:
+    """
+    Outcome of an order placed with Store.place_order().
+
+    Attributes:
+        lines (list): (product, quantity, price) tuples of the bought lines.
+        failures (list): (product, quantity, reason) tuples of the lines that could not be bought.
+        discounts (list): (name, amount) tuples of the cart discounts of a pricing engine.
+        total (float or int): The total price of the order, 0 if the order failed.
+                              In whole cents if the order was placed in a cents store.
+        sequence (int or None): The sequence number the store gave the order, None if it failed.
+    """
+
+    def __init__(self, in_cents=False):
+        """
+        Initializes an empty OrderResult.
+
+        Args:
+            in_cents (bool): If True, prices and the total are integer cents.
+        """
+        self.lines = []
+        self.failures = []
+        self.discounts = []
+        self.total = 0 if in_cents else 0.0
+        self.sequence = None
+
+
+    def add_line(self, product, quantity, price):
+        """
+        Records a bought line and adds its price to the total.
+
+        Args:
+            product: The bought product.
+            quantity (int): The bought quantity.
+            price (float or int): The price of the line.
+        """
+        self.lines.append((product, quantity, price))
+        self.total += price
+
+
+    def add_discount(self, name, amount):
+        """
+        Records a cart discount and subtracts it from the total.
+
+        Args:
+            name (str): The name of the cart rule.
+            amount (float): The discount.
+        """
+        self.discounts.append((name, amount))
+        self.total -= amount
+
+
+    def add_failure(self, product, quantity, reason):
+        """
+        Records a line that could not be bought.
+
+        Args:
+            product: The product of the line.
+            quantity (int): The requested quantity.
+            reason (str): Why the line failed.
+        """
+        self.failures.append((product, quantity, reason))
+
+
+    def is_successful(self):
+        """
+        Getter function for the state of the order.
+
+        Returns:
+            bool: True if every line was bought, False otherwise.
+        """
+        return not self.failures
+
+
+    def __str__(self):
+        """
+        Returns a short summary of the order.
+
+        Returns:
+            str: The number of lines and the total, or the failed lines.
+        """
+        if self.is_successful():
+            return f"Order with {len(self.lines)} lines, Total: {self.total}"
+        reasons = ", ".join(f"{product.name}: {reason}" for product, quantity, reason in self.failures)
+        return f"Order failed ({reasons})"
@@ -0,0 +1,375 @@
+import functools
+
+
+class _UnitPrice:
+    """
+    Stand-in product with price 1, used to get the price factor of a promotion.
+    """
+
+    price = 1.0
+
+
+_UNIT = _UnitPrice()
+
+
+def _list_price(product, quantity):
+    """
+    Prices a line without promotions.
+    """
+    return product.price * quantity
+
+
+def _stacked_price(promotions, product, quantity):
+    """
+    Prices a line with several promotions, applied one after the other as price factors.
+    """
+    if quantity == 0:
+        return 0.0
+    factor = 1.0
+    for promotion in promotions:
+        factor *= promotion.apply_promotion(_UNIT, quantity) / quantity
+    return product.price * quantity * factor
+
+
+class PromotionRule:
+    """
+    Product level rule: applies a promotion to a set of products.
+    Rules of a product are stacked, e.g. a PercentDiscount on top of ThirdOneFree,
+    unless the rule with the highest priority is exclusive.
+
+    Attributes:
+        promotion (Promotion): The promotion to apply.
+        products (set): The products the rule applies to.
+        priority (int): Rules with a higher priority are applied first.
+        exclusive (bool): If True and this is the top rule of a product, no other rule is applied.
+    """
+
+    def __init__(self, promotion, products, priority=0, exclusive=False):
+        """
+        Initializes a PromotionRule.
+
+        Args:
+            promotion (Promotion): The promotion to apply.
+            products (iterable): The products the rule applies to.
+            priority (int): Rules with a higher priority are applied first.
+            exclusive (bool): If True, the rule is never combined with other rules.
+        """
+        self.promotion = promotion
+        self.products = set(products)
+        self.priority = priority
+        self.exclusive = exclusive
+
+
+class BundleRule:
+    """
+    Cart level rule: if every product of the bundle is in the cart, the lines of
+    those products get a percentage discount.
+
+    Attributes:
+        name (str): The name of the rule.
+        products (frozenset): The products of the bundle.
+        percent (float): The discount in percent (0-100).
+        priority (int): Cart rules with a higher priority are applied first.
+        exclusive (bool): If True and the rule applies, no cart rule with a lower priority is applied.
+    """
+
+    def __init__(self, name, products, percent, priority=0, exclusive=False):
+        """
+        Initializes a BundleRule.
+
+        Args:
+            name (str): The name of the rule.
+            products (iterable): The products of the bundle. Must not be empty.
+            percent (float): The discount in percent (0-100).
+            priority (int): Cart rules with a higher priority are applied first.
+            exclusive (bool): If True, lower cart rules are skipped once this one applies.
+
+        Raises:
+            ValueError: If the bundle is empty or the percent is out of range.
+        """
+        self.name = name
+        self.products = frozenset(products)
+        if not self.products:
+            raise ValueError("Bundle must contain products")
+        if not 0 <= percent <= 100:
+            raise ValueError("Percent must be between 0 and 100")
+        self.percent = percent
+        self.priority = priority
+        self.exclusive = exclusive
+
+
+class SpendThresholdRule:
+    """
+    Cart level rule: if the cart total reaches a threshold, the whole cart gets a
+    percentage discount.
+
+    Attributes:
+        name (str): The name of the rule.
+        threshold (float): The cart total from which on the rule applies.
+        percent (float): The discount in percent (0-100).
+        priority (int): Cart rules with a higher priority are applied first.
+        exclusive (bool): If True and the rule applies, no cart rule with a lower priority is applied.
+    """
+
+    def __init__(self, name, threshold, percent, priority=0, exclusive=False):
+        """
+        Initializes a SpendThresholdRule.
+
+        Args:
+            name (str): The name of the rule.
+            threshold (float): The cart total from which on the rule applies.
+            percent (float): The discount in percent (0-100).
+            priority (int): Cart rules with a higher priority are applied first.
+            exclusive (bool): If True, lower cart rules are skipped once this one applies.
+
+        Raises:
+            ValueError: If the percent is out of range.
+        """
+        self.name = name
+        self.threshold = threshold
+        if not 0 <= percent <= 100:
+            raise ValueError("Percent must be between 0 and 100")
+        self.percent = percent
+        self.priority = priority
+        self.exclusive = exclusive
+
+
+class PricingPlan:
+    """
+    The compiled form of a rule set: the promotions of every product in the order
+    they are applied, and the cart rules sorted by priority.
+    A plan does not change its rules; the engine compiles a new one when the rules change.
+    Promotions set directly on a product (Product.set_promotion) are stacked below the
+    rules, unless an exclusive rule wins. The promotions of a product are resolved into
+    one pricer on its first line and kept; the engine drops it when the promotion of
+    the product changes (see PromotionEngine.on_change()).
+
+    Attributes:
+        product_promotions (dict): Product mapped to (exclusive, promotions) of its rules.
+        cart_rules (list): BundleRule and SpendThresholdRule instances, highest priority first.
+    """
+
+    def __init__(self, product_promotions, cart_rules):
+        """
+        Initializes a PricingPlan. Use PromotionEngine.get_plan() to build one.
+        """
+        self.product_promotions = product_promotions
+        self.cart_rules = cart_rules
+        self._has_bundles = any(isinstance(rule, BundleRule) for rule in cart_rules)
+        self._pricers = {}
+
+
+    def _resolve(self, product):
+        """
+        Returns and keeps the pricer of the lines of a product: a callable taking
+        (product, quantity) that applies the promotions of the product.
+        """
+        exclusive, promotions = self.product_promotions.get(product, (False, ()))
+        if not exclusive and product.promotion:
+            promotions = promotions + (product.promotion,)
+        if not promotions:
+            pricer = _list_price
+        elif len(promotions) == 1:
+            pricer = promotions[0].apply_promotion
+        else:
+            pricer = functools.partial(_stacked_price, promotions)
+        self._pricers[product] = pricer
+        return pricer
+
+
+    def forget(self, product):
+        """
+        Drops the pricer of a product, so its promotions are resolved again on its next line.
+        """
+        self._pricers.pop(product, None)
+
+
+    def price_line(self, product, quantity):
+        """
+        Calculates the price of one line with all stacked promotions.
+
+        Args:
+            product: The product of the line.
+            quantity (int): The quantity of the line.
+
+        Returns:
+            float: The price of the line.
+        """
+        pricer = self._pricers.get(product)
+        if pricer is None:
+            pricer = self._resolve(product)
+        return pricer(product, quantity)
+
+
+    def get_cart_discounts(self, lines, total):
+        """
+        Applies the cart rules to priced lines.
+
+        Args:
+            lines (iterable): (product, price) pairs of the priced lines.
+            total (float): The sum of the line prices.
+
+        Returns:
+            list: (rule name, amount) tuples of the discounts that apply, in the order
+                  they were applied. Each amount is subtracted from the total.
+        """
+        discounts = []
+        line_totals = None
+        if self._has_bundles:
+            line_totals = {}
+            for product, price in lines:
+                line_totals[product] = line_totals.get(product, 0.0) + price
+        for rule in self.cart_rules:
+            if isinstance(rule, BundleRule):
+                if not rule.products.issubset(line_totals):
+                    continue
+                amount = sum(line_totals[product] for product in rule.products) * rule.percent / 100
+            else:
+                if total < rule.threshold:
+                    continue
+                amount = total * rule.percent / 100
+            discounts.append((rule.name, amount))
+            total -= amount
+            if rule.exclusive:
+                break
+        return discounts
+
+
+    def price_cart(self, shopping_list):
+        """
+        Prices a whole cart in one pass over its lines, then applies the cart rules.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Returns:
+            float: The total price of the cart.
+        """
+        pricers = self._pricers
+        lines = [] if self._has_bundles else None
+        total = 0.0
+        for product, quantity in shopping_list:
+            pricer = pricers.get(product)
+            if pricer is None:
+                pricer = self._resolve(product)
+            price = pricer(product, quantity)
+            total += price
+            if lines is not None:
+                lines.append((product, price))
+        if not self.cart_rules:
+            return total
+        return total - sum(amount for name, amount in self.get_cart_discounts(lines, total))
+
+
+class PromotionEngine:
+    """
+    Holds a set of product and cart rules and compiles them into a PricingPlan.
+    The plan is reused for every cart until a rule is added or removed.
+    Store.set_pricing() prices the orders of a store with an engine and keeps its
+    plan informed about promotions set on the products.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty PromotionEngine.
+        """
+        self._product_rules = []
+        self._cart_rules = []
+        self._plan = None
+
+
+    def add_rule(self, rule):
+        """
+        Adds a PromotionRule, BundleRule or SpendThresholdRule.
+
+        Args:
+            rule: The rule to add.
+
+        Raises:
+            TypeError: If the rule is of an unknown type.
+        """
+        if isinstance(rule, PromotionRule):
+            self._product_rules.append(rule)
+        elif isinstance(rule, (BundleRule, SpendThresholdRule)):
+            self._cart_rules.append(rule)
+        else:
+            raise TypeError("Unknown rule type")
+        self._plan = None
+
+
+    def remove_rule(self, rule):
+        """
+        Removes a rule added with add_rule().
+
+        Args:
+            rule: The rule to remove.
+
+        Raises:
+            ValueError: If the rule was never added.
+        """
+        if rule in self._product_rules:
+            self._product_rules.remove(rule)
+        else:
+            self._cart_rules.remove(rule)
+        self._plan = None
+
+
+    def invalidate(self):
+        """
+        Drops the compiled plan, e.g. after a rule was changed in place.
+        """
+        self._plan = None
+
+
+    def on_change(self, product, field, old_value, new_value):
+        """
+        Store observer callback: a product got a new promotion, so the plan resolves
+        the promotions of its lines again.
+        """
+        if field in ("promotion", "removed") and self._plan is not None:
+            self._plan.forget(product)
+
+
+    def get_plan(self):
+        """
+        Returns the compiled plan, compiling it first if the rules changed.
+
+        Returns:
+            PricingPlan: The current plan.
+        """
+        if self._plan is None:
+            self._plan = self._compile()
+        return self._plan
+
+
+    def _compile(self):
+        """
+        Resolves priority and exclusivity of the product rules once per product.
+        """
+        rules_by_product = {}
+        for rule in self._product_rules:
+            for product in rule.products:
+                rules_by_product.setdefault(product, []).append(rule)
+        product_promotions = {}
+        for product, rules in rules_by_product.items():
+            rules.sort(key=lambda rule: rule.priority, reverse=True)
+            if rules[0].exclusive:
+                product_promotions[product] = (True, (rules[0].promotion,))
+            else:
+                product_promotions[product] = (False, tuple(rule.promotion for rule in rules
+                                                            if not rule.exclusive))
+        cart_rules = sorted(self._cart_rules, key=lambda rule: rule.priority, reverse=True)
+        return PricingPlan(product_promotions, cart_rules)
+
+
+    def price_cart(self, shopping_list):
+        """
+        Prices a cart with the current plan.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Returns:
+            float: The total price of the cart.
+        """
+        return self.get_plan().price_cart(shopping_list)
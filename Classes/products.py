@@ -1,3 +1,6 @@
+from .money import to_cents
+
+
 class Product:
     """
     Represents a product that is stored.
@@ -7,8 +10,11 @@ class Product:
     Attributes:
         active (bool): Indicates if the product is active (default = True).
         promotion (Promotion or None): An optional promotion applied to the product.
+        reserved (int): Units held for carts, see reserve(). They cannot be bought by others.
      """
 
+    __slots__ = ("name", "_price", "_price_cents", "quantity", "reserved", "active", "promotion", "_observers")
+
     def __init__(self, name, price, quantity):
         """
         Initializes a Product instance with name, price, and quantity.
@@ -28,15 +34,89 @@ class Product:
         self.name = str(name)
         if self.name == "":
             raise ValueError("Name must not be empty")
+        self._observers = ()
+        self._price = 0.0
+        self._price_cents = None
+        self.price = price
+        self.active = True
+        self.promotion = None
+        self.quantity = 0
+        self.reserved = 0
+        self.set_quantity(quantity)
+
+
+    @property
+    def price(self):
+        """
+        The list price of the product.
+
+        Returns:
+            float: The price of a single unit.
+        """
+        return self._price
+
+
+    @price.setter
+    def price(self, price):
+        """
+        Validates and sets the price, informing observers about the change.
+
+        Args:
+            price (float): The new price. Must not be negative.
+
+        Raises:
+            ValueError: If the price is invalid or negative.
+        """
         try:
-            self.price = float(price)
+            price = float(price)
         except (ValueError, TypeError):
             raise ValueError("Price must be a valid number")
-        if self.price < 0:
+        if price < 0:
             raise ValueError("Price must be greater than 0")
-        self.set_quantity(quantity)
-        self.active = True
-        self.promotion = None
+        old_price = self._price
+        self._price = price
+        self._price_cents = None
+        if old_price != price:
+            self._notify("price", old_price, price)
+
+
+    def get_price(self):
+        """
+        Getter function for price.
+
+        Returns:
+            float: The price of a single unit.
+        """
+        return self._price
+
+
+    def set_price(self, price):
+        """
+        Setter function for price. Same as assigning product.price.
+
+        Args:
+            price (float): The new price. Must not be negative.
+
+        Raises:
+            ValueError: If the price is invalid or negative.
+        """
+        self.price = price
+
+
+    @property
+    def price_cents(self):
+        """
+        The list price of the product in whole cents, rounded half up. It is only
+        calculated when first needed, so stores that do not price in cents never pay
+        for the conversion.
+
+        Returns:
+            int: The price of a single unit in cents.
+        """
+        price_cents = self._price_cents
+        if price_cents is None:
+            price_cents = self._price_cents = to_cents(self._price)
+        return price_cents
 
 
     def get_promotion(self):
@@ -56,7 +136,10 @@ class Product:
         Args:
             self.promotion: The promotion to assign.
         """
+        old_promotion = self.promotion
         self.promotion = promotion
+        if old_promotion is not promotion:
+            self._notify("promotion", old_promotion, promotion)
 
 
     def get_quantity(self):
@@ -81,12 +164,17 @@ class Product:
             ValueError: If the quantity is invalid or negative.
         """
         try:
-            self.quantity = int(quantity)
+            quantity = int(quantity)
         except (ValueError, TypeError):
             raise ValueError("Invalid quantity provided")
-        if self.quantity < 0:
+        if quantity < 0:
             raise ValueError("Quantity must not be negative")
-        if self.quantity == 0:
+        old_quantity = self.quantity
+        self.quantity = quantity
+        if old_quantity != quantity:
+            for observer in self._observers:
+                observer(self, "quantity", old_quantity, quantity)
+        if quantity == 0:
             self.deactivate()
 
 
@@ -104,14 +192,53 @@ class Product:
         """
         Activates the product, making it available for purchase.
         """
-        self.active = True
+        if not self.active:
+            self.active = True
+            self._notify("active", False, True)
 
 
     def deactivate(self):
         """
         Deactivates the product, making it unavailable for purchase.
         """
-        self.active = False
+        if self.active:
+            self.active = False
+            self._notify("active", True, False)
+
+
+    def add_observer(self, observer):
+        """
+        Registers a callback that is informed about state changes of the product.
+
+        Args:
+            observer (callable): Called as observer(product, field, old_value, new_value)
+                                 whenever "quantity", "reserved", "price", "active" or
+                                 "promotion" changes.
+        """
+        self._observers = self._observers + (observer,)
+
+
+    def remove_observer(self, observer):
+        """
+        Unregisters a callback added with add_observer().
+
+        Args:
+            observer (callable): The callback to remove.
+
+        Raises:
+            ValueError: If the callback was never registered.
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+
+    def _notify(self, field, old_value, new_value):
+        """
+        Informs all observers about a changed field.
+        """
+        for observer in self._observers:
+            observer(self, field, old_value, new_value)
 
 
     def show(self):
@@ -140,16 +267,159 @@ class Product:
         Raises:
             ValueError: If the quantity is negative or exceeds available stock.
         """
-        if quantity > self.quantity:
-            raise ValueError("Quantity is too high")
+        self.reduce_quantity(quantity)
+        if self.promotion:
+            return self.promotion.apply_promotion(self, quantity)
+        return self._price * quantity
+
+
+    def quote(self, quantity):
+        """
+        Calculates the price of a purchase without changing the stock.
+
+        Args:
+            quantity (int): The quantity to price. Must not be negative.
+
+        Returns:
+            float: The price buy() would return for this quantity.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
         if quantity < 0:
             raise ValueError("Quantity must not be negative")
-        self.set_quantity(self.quantity - quantity)
         if self.promotion:
             return self.promotion.apply_promotion(self, quantity)
         return self.price * quantity
 
 
+    def quote_cents(self, quantity):
+        """
+        Calculates the price of a purchase in whole cents without changing the stock.
+        Promotions round half up once per purchase.
+
+        Args:
+            quantity (int): The quantity to price. Must not be negative.
+
+        Returns:
+            int: The price of the purchase in cents.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if self.promotion:
+            return self.promotion.apply_promotion_cents(self.price_cents, quantity)
+        return self.price_cents * quantity
+
+
+    def reduce_quantity(self, quantity):
+        """
+        Takes the given quantity out of stock without calculating a price.
+
+        Args:
+            quantity (int): The quantity to remove. Must be positive and less than
+                            or equal to the available quantity.
+
+        Raises:
+            ValueError: If the quantity is negative or exceeds available stock.
+        """
+        old_quantity = self.quantity
+        if quantity > old_quantity - self.reserved:
+            raise ValueError("Quantity is too high")
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if not quantity:
+            return
+        self.quantity = new_quantity = int(old_quantity - quantity)
+        for observer in self._observers:
+            observer(self, "quantity", old_quantity, new_quantity)
+        if new_quantity == 0:
+            self.deactivate()
+
+
+    def get_available_quantity(self):
+        """
+        Returns the quantity that can be bought, i.e. the stock that is not reserved.
+
+        Returns:
+            int: The available quantity.
+        """
+        return max(self.quantity - self.reserved, 0)
+
+
+    def get_reserved(self):
+        """
+        Getter function for reserved.
+
+        Returns:
+            int: The number of units held for carts.
+        """
+        return self.reserved
+
+
+    def reserve(self, quantity):
+        """
+        Holds units for a cart, so they cannot be bought by anyone else.
+
+        Args:
+            quantity (int): The quantity to hold. Must not be negative or exceed the available quantity.
+
+        Raises:
+            ValueError: If the quantity is negative or exceeds the available quantity.
+        """
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if quantity > self.quantity - self.reserved:
+            raise ValueError("Quantity is too high")
+        self._set_reserved(self.reserved + quantity)
+
+
+    def release(self, quantity):
+        """
+        Gives held units free again.
+
+        Args:
+            quantity (int): The quantity to release. Must not be negative or exceed the reserved quantity.
+
+        Raises:
+            ValueError: If the quantity is negative or more than is reserved.
+        """
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if quantity > self.reserved:
+            raise ValueError("Quantity is higher than reserved")
+        self._set_reserved(self.reserved - quantity)
+
+
+    def _set_reserved(self, reserved):
+        """
+        Sets the reserved units and informs observers.
+        """
+        old_reserved = self.reserved
+        self.reserved = reserved
+        if old_reserved != reserved:
+            self._notify("reserved", old_reserved, reserved)
+
+
+    def get_batch_price(self, quantities):
+        """
+        Calculates the price of several purchases of this product in one pass.
+        Every quantity is priced as a purchase of its own, so the result equals the
+        sum of the prices buy() would return for each of them.
+
+        Args:
+            quantities (list): The quantities of the single purchases.
+
+        Returns:
+            float: The total price of all purchases.
+        """
+        if self.promotion:
+            return self.promotion.apply_promotion_batch(self, quantities)
+        return self.price * sum(quantities)
+
+
 
     def __str__(self):
         """
@@ -171,6 +441,8 @@ class NonStockedProduct(Product):
         quantity (int): Always 0 on default
     """
 
+    __slots__ = ()
+
     def __init__(self, name, price):
         """
         Initializes a NonStockedProduct instance.
@@ -185,14 +457,14 @@ class NonStockedProduct(Product):
         self.name = str(name)
         if self.name == "":
             raise ValueError("Name must not be empty")
-        try:
-            self.price = float(price)
-        except (ValueError, TypeError):
-            raise ValueError("Price must be a valid number")
-        if self.price < 0:
-            raise ValueError("Price must be greater than 0")
+        self._observers = ()
+        self._price = 0.0
+        self._price_cents = None
+        self.price = price
         self.active = True
+        self.promotion = None
         self.quantity = 0
+        self.reserved = 0
 
 
     def get_quantity(self):
@@ -231,25 +503,56 @@ class NonStockedProduct(Product):
         return info
 
 
-    def buy(self, quantity):
+    def get_available_quantity(self):
+        """
+        Always returns False because there is no quantity.
+
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+
+    def reserve(self, quantity):
         """
-        Processes of buying of a NonStockedProduct.
+        Validates a reservation. There is no stock to hold.
 
         Args:
-            quantity (int): The quantity to purchase. Must be positive.
+            quantity (int): The quantity to hold. Must not be negative.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
 
-        Returns:
-            float: The total price of the purchase.
+
+    def release(self, quantity):
+        """
+        Validates a release. There is no stock to give free.
+
+        Args:
+            quantity (int): The quantity to release. Must not be negative.
 
         Raises:
             ValueError: If the quantity is negative.
         """
+        if quantity < 0:
+            raise ValueError("Quantity must not be negative")
+
 
+    def reduce_quantity(self, quantity):
+        """
+        Validates a purchase of a NonStockedProduct. There is no stock to reduce.
+
+        Args:
+            quantity (int): The quantity to purchase. Must be positive.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
         if quantity < 0:
             raise ValueError("Quantity must not be negative")
-        if self.promotion:
-            return self.promotion.apply_promotion(self, quantity)
-        return self.price * quantity
 
 
 class LimitedProduct(Product):
@@ -259,13 +562,16 @@ class LimitedProduct(Product):
     Attributes:
         maximum (int): The maximum allowed quantity per purchase.
     """
+
+    __slots__ = ("maximum",)
+
     def __init__(self, name, price, quantity, maximum):
         super().__init__(name, price, quantity)
         try:
             self.maximum = int(maximum)
         except (ValueError, TypeError):
             raise ValueError("Maximum must be a valid number")
-        if self.price < 0:
+        if self.maximum <= 0:
             raise ValueError("Maximum must be greater than 0")
 
 
@@ -283,6 +589,21 @@ class LimitedProduct(Product):
         return info
 
 
+    def reduce_quantity(self, quantity):
+        """
+        Takes the given quantity out of stock, enforcing the maximum per order.
+
+        Args:
+            quantity (int): The quantity to remove. Must not exceed the maximum or the available quantity.
+
+        Raises:
+            ValueError: If the quantity is negative, exceeds the maximum or the available stock.
+        """
+        if quantity > self.maximum:
+            raise ValueError(f"Quantity exceeds the maximum of {self.maximum} per order")
+        super().reduce_quantity(quantity)
+
+
     def get_maximum(self):
         """
         Returns the maximum quantity thats allowed in an order.
@@ -1,11 +1,27 @@
 from abc import abstractmethod
 
+from .money import divide_half_up, to_cents
+
+
+class _CentsPrice:
+    """
+    Stand-in product with a price given in cents, for Promotion.apply_promotion_cents().
+    """
+
+    def __init__(self, price_cents):
+        self.price = price_cents / 100
+
 
 class Promotion:
     """
     Base class for product promotions. This one is not to be used, but the child classes are.
+
+    Attributes:
+        kind (str): Short identifier of the promotion class, used in catalog files and snapshots.
     """
 
+    kind = None
+
     def __init__(self, name):
         """
         Initializes the Promotion instance.
@@ -24,11 +40,43 @@ class Promotion:
         pass
 
 
+    def apply_promotion_batch(self, product, quantities):
+        """
+        Calculates the total price of several purchases of the same product.
+        Child classes override this with a closed form over the whole batch.
+
+        Args:
+            product: Object name to target its price.
+            quantities (list): The quantities of the single purchases.
+
+        Returns:
+            float: The sum of apply_promotion() over all quantities.
+        """
+        return sum(self.apply_promotion(product, quantity) for quantity in quantities)
+
+
+    def apply_promotion_cents(self, price_cents, quantity):
+        """
+        Calculates the promotion price in whole cents. Child classes override this with
+        integer arithmetic; this fallback rounds the float price half up.
+
+        Args:
+            price_cents (int): The price of a single unit in cents.
+            quantity (int): The quantity purchased.
+
+        Returns:
+            int: The total price in cents.
+        """
+        return to_cents(self.apply_promotion(_CentsPrice(price_cents), quantity))
+
+
 class PercentDiscount(Promotion):
     """
     Promotion applies a percentage discount to the total price.
     """
 
+    kind = "percent_discount"
+
     def __init__(self, name, percent):
         """
         Initializes the PercentDiscount instance.
@@ -41,6 +89,23 @@ class PercentDiscount(Promotion):
         self.percent = percent
 
 
+    @property
+    def percent(self):
+        """
+        The percentage discount (0-100).
+        """
+        return self._percent
+
+
+    @percent.setter
+    def percent(self, percent):
+        """
+        Sets the discount and the same discount in basis points (1/100 percent) for cents pricing.
+        """
+        self._percent = percent
+        self._basis_points = round(percent * 100)
+
+
     def apply_promotion(self, product, quantity):
         """
         Calculates the total price after applying the percentage discount.
@@ -52,7 +117,36 @@ class PercentDiscount(Promotion):
         Returns:
             float: The total price after applying the percentage discount.
         """
-        return product.price * quantity * (1 - self.percent / 100)
+        return product.price * quantity * (1 - self._percent / 100)
+
+
+    def apply_promotion_batch(self, product, quantities):
+        """
+        Calculates the total price of several purchases after the percentage discount.
+
+        Args:
+            product: Object name to target its price.
+            quantities (list): The quantities of the single purchases.
+
+        Returns:
+            float: The total price after applying the percentage discount to every purchase.
+        """
+        return product.price * sum(quantities) * (1 - self._percent / 100)
+
+
+    def apply_promotion_cents(self, price_cents, quantity):
+        """
+        Calculates the discounted price in whole cents. The percent is taken in basis
+        points (1/100 percent) and the result is rounded half up once per purchase.
+
+        Args:
+            price_cents (int): The price of a single unit in cents.
+            quantity (int): The quantity purchased.
+
+        Returns:
+            int: The total price in cents.
+        """
+        return divide_half_up(price_cents * quantity * (10000 - self._basis_points), 10000)
 
 
 class SecondHalfPrice(Promotion):
@@ -60,6 +154,8 @@ class SecondHalfPrice(Promotion):
     A promotion where every second item is sold at half price.
     """
 
+    kind = "second_half_price"
+
     def apply_promotion(self, product, quantity):
         """
         Calculate total price for Second item half price.
@@ -76,12 +172,50 @@ class SecondHalfPrice(Promotion):
         return (pairs * 1.5 + reminder) *  product.price
 
 
+    def apply_promotion_batch(self, product, quantities):
+        """
+        Calculate total price for several purchases with second item half price.
+
+        Args:
+            product: Object name to target its price.
+            quantities (list): The quantities of the single purchases.
+
+        Returns:
+            float: The total price after applying the promotion to every purchase.
+        """
+        pairs = 0
+        reminder = 0
+        for quantity in quantities:
+            pairs += quantity // 2
+            reminder += quantity % 2
+        return (pairs * 1.5 + reminder) * product.price
+
+
+    def apply_promotion_cents(self, price_cents, quantity):
+        """
+        Calculate total price in whole cents for second item half price.
+        An odd half cent is rounded up.
+
+        Args:
+            price_cents (int): The price of a single unit in cents.
+            quantity (int): The quantity purchased.
+
+        Returns:
+            int: The total price in cents.
+        """
+        pairs = quantity // 2
+        reminder = quantity % 2
+        return divide_half_up((pairs * 3 + reminder * 2) * price_cents, 2)
+
+
 
 class ThirdOneFree(Promotion):
     """
     A promotion where every third item is free.
     """
 
+    kind = "third_one_free"
+
     def apply_promotion(self, product, quantity):
         """
         Calculate total price for every third item is free.
@@ -95,4 +229,71 @@ class ThirdOneFree(Promotion):
         """
         group_of_three = quantity // 3
         reminder = quantity % 3
-        return (group_of_three * 2 + reminder) * product.price
\ No newline at end of file
+        return (group_of_three * 2 + reminder) * product.price
+
+
+    def apply_promotion_batch(self, product, quantities):
+        """
+        Calculate total price for several purchases with every third item free.
+
+        Args:
+            product: Object name to target its price.
+            quantities (list): The quantities of the single purchases.
+
+        Returns:
+            float: The total price after applying the promotion to every purchase.
+        """
+        group_of_three = 0
+        reminder = 0
+        for quantity in quantities:
+            group_of_three += quantity // 3
+            reminder += quantity % 3
+        return (group_of_three * 2 + reminder) * product.price
+
+
+    def apply_promotion_cents(self, price_cents, quantity):
+        """
+        Calculate total price in whole cents for every third item is free.
+
+        Args:
+            price_cents (int): The price of a single unit in cents.
+            quantity (int): The quantity purchased.
+
+        Returns:
+            int: The total price in cents.
+        """
+        group_of_three = quantity // 3
+        reminder = quantity % 3
+        return (group_of_three * 2 + reminder) * price_cents
+
+
+PROMOTION_TYPES = {promotion_class.kind: promotion_class
+                   for promotion_class in (PercentDiscount, SecondHalfPrice, ThirdOneFree)}
+
+
+def create_promotion(kind, name, percent=None):
+    """
+    Creates a promotion from its kind identifier.
+
+    Args:
+        kind (str): "percent_discount", "second_half_price" or "third_one_free".
+        name (str): The name of the promotion.
+        percent (float): The discount in percent. Only used for "percent_discount".
+
+    Returns:
+        Promotion: The new promotion.
+
+    Raises:
+        ValueError: If the kind is unknown or the percent is invalid.
+    """
+    if kind not in PROMOTION_TYPES:
+        raise ValueError(f"Unknown promotion '{kind}'")
+    if kind != PercentDiscount.kind:
+        return PROMOTION_TYPES[kind](name)
+    try:
+        percent = float(percent)
+    except (ValueError, TypeError):
+        raise ValueError("Percent must be a valid number")
+    if not 0 <= percent <= 100:
+        raise ValueError("Percent must be between 0 and 100")
+    return PercentDiscount(name, percent)
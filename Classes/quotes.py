@@ -0,0 +1,149 @@
+import threading
+from collections import OrderedDict
+
+
+class QuoteCache:
+    """
+    LRU cache of price quotes. Entries are keyed on (product, promotion, price, quantity),
+    so a changed price or promotion never returns an old quote. Entries of a product can
+    also be dropped explicitly with invalidate(), which the Store does on every price or
+    promotion change so stale entries do not take up room.
+
+    Attributes:
+        maxsize (int): The maximum number of cached quotes.
+        in_cents (bool): If True, quotes are integer cents.
+        hits (int): Quotes answered from the cache.
+        misses (int): Quotes that had to be calculated.
+        evictions (int): Entries dropped because the cache was full.
+        invalidations (int): Entries dropped by invalidate().
+    """
+
+    def __init__(self, maxsize=4096, in_cents=False):
+        """
+        Initializes an empty QuoteCache.
+
+        Args:
+            maxsize (int): The maximum number of cached quotes. Must be positive.
+            in_cents (bool): If True, quotes are integer cents (Product.quote_cents()).
+
+        Raises:
+            ValueError: If maxsize is not positive.
+        """
+        if maxsize <= 0:
+            raise ValueError("Maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.in_cents = in_cents
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._keys_by_product = {}
+        self._lock = threading.Lock()
+
+
+    def quote(self, product, quantity):
+        """
+        Returns the price of a purchase, from the cache if possible. Stock is not changed.
+
+        Args:
+            product: The product to price.
+            quantity (int): The quantity to price. Must not be negative.
+
+        Returns:
+            float or int: The price Product.buy() would return, in cents if in_cents is set.
+
+        Raises:
+            ValueError: If the quantity is negative.
+        """
+        key = (product, product.promotion, product.price, quantity)
+        with self._lock:
+            price = self._entries.get(key)
+            if price is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return price
+        price = product.quote_cents(quantity) if self.in_cents else product.quote(quantity)
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = price
+                self._keys_by_product.setdefault(product, set()).add(key)
+                if len(self._entries) > self.maxsize:
+                    old_key, old_price = self._entries.popitem(last=False)
+                    self._forget(old_key)
+                    self.evictions += 1
+        return price
+
+
+    def invalidate(self, product):
+        """
+        Drops all cached quotes of a product.
+
+        Args:
+            product: The product whose price or promotion changed.
+        """
+        with self._lock:
+            for key in self._keys_by_product.pop(product, ()):
+                del self._entries[key]
+                self.invalidations += 1
+
+
+    def clear(self):
+        """
+        Drops all cached quotes. The counters are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_product.clear()
+
+
+    def _forget(self, key):
+        """
+        Removes an evicted key from the per-product index. The caller holds the lock.
+        """
+        keys = self._keys_by_product[key[0]]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_product[key[0]]
+
+
+    def __len__(self):
+        """
+        Returns the number of cached quotes.
+        """
+        return len(self._entries)
+
+
+    def get_stats(self):
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Hits, misses, evictions, invalidations, the number of entries and the hit rate.
+        """
+        requests = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "hit_rate": self.hits / requests if requests else 0.0}
+
+
+_default_cache = QuoteCache()
+
+
+def quote(product, quantity, cache=None):
+    """
+    Returns the price of a purchase without changing the stock.
+
+    Args:
+        product: The product to price.
+        quantity (int): The quantity to price. Must not be negative.
+        cache (QuoteCache): The cache to use. Defaults to a module wide cache.
+
+    Returns:
+        float: The price Product.buy() would return.
+    """
+    return (cache or _default_cache).quote(product, quantity)
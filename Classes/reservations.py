@@ -0,0 +1,216 @@
+import heapq
+import itertools
+import threading
+import time
+
+
+class Reservation:
+    """
+    Units held for one cart until they are bought or the reservation expires.
+
+    Attributes:
+        cart_id: The cart the units are held for.
+        lines (list): The reserved (Product, int) tuples.
+        expires_at (float): Clock time after which the units are given free again.
+    """
+
+    def __init__(self, cart_id, lines, expires_at):
+        """
+        Initializes a Reservation. Use ReservationManager.reserve() to create one.
+        """
+        self.cart_id = cart_id
+        self.lines = lines
+        self.expires_at = expires_at
+
+
+class ReservationManager:
+    """
+    Reserves stock of a store for carts with a time to live. Expiry times are kept in
+    a heap, so expiring stale reservations only looks at the ones that are due
+    instead of scanning every product or cart. The manager registers itself with
+    the store, which expires due reservations before every order.
+
+    Attributes:
+        store (Store): The store whose products are reserved.
+        default_ttl (float): Seconds a reservation lives if reserve() gets no ttl.
+    """
+
+    def __init__(self, store, default_ttl=900, clock=time.monotonic):
+        """
+        Initializes a ReservationManager.
+
+        Args:
+            store (Store): The store whose products are reserved.
+            default_ttl (float): Seconds a reservation lives by default. Must be positive.
+            clock (callable): Returns the current time in seconds, e.g. for tests.
+
+        Raises:
+            ValueError: If default_ttl is not positive.
+        """
+        if default_ttl <= 0:
+            raise ValueError("TTL must be greater than 0")
+        self.store = store
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._reservations = {}
+        self._expiry_heap = []
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+        store.set_reservations(self)
+
+
+    def reserve(self, cart_id, shopping_list, ttl=None):
+        """
+        Holds all lines of a shopping list for a cart. Either every line is reserved or none.
+
+        Args:
+            cart_id: The cart to reserve for. Must not have a reservation yet.
+            shopping_list (list): A list of (Product, int) tuples.
+            ttl (float): Seconds the reservation lives. Defaults to default_ttl.
+
+        Returns:
+            Reservation: The new reservation.
+
+        Raises:
+            ValueError: If the cart already has a reservation or a line cannot be reserved.
+        """
+        with self._lock:
+            self.expire()
+            if cart_id in self._reservations:
+                raise ValueError(f"Cart '{cart_id}' already has a reservation")
+            self.store.validate_shopping_list(shopping_list)
+            with self.store.lock_products(product for product, quantity in shopping_list):
+                reserved = []
+                try:
+                    for product, quantity in shopping_list:
+                        product.reserve(quantity)
+                        reserved.append((product, quantity))
+                except ValueError:
+                    for product, quantity in reserved:
+                        product.release(quantity)
+                    raise
+            expires_at = self._clock() + (ttl if ttl is not None else self.default_ttl)
+            reservation = Reservation(cart_id, list(shopping_list), expires_at)
+            self._reservations[cart_id] = reservation
+            heapq.heappush(self._expiry_heap, (expires_at, next(self._counter), reservation))
+            return reservation
+
+
+    def get_reservation(self, cart_id):
+        """
+        Returns the active reservation of a cart.
+
+        Args:
+            cart_id: The cart.
+
+        Returns:
+            Reservation or None: The reservation, or None if there is none or it expired.
+        """
+        with self._lock:
+            self.expire()
+            return self._reservations.get(cart_id)
+
+
+    def release(self, cart_id):
+        """
+        Gives the units of a cart free again.
+
+        Args:
+            cart_id: The cart.
+
+        Raises:
+            KeyError: If the cart has no reservation.
+        """
+        with self._lock:
+            reservation = self._reservations.pop(cart_id)
+            self._release_lines(reservation)
+
+
+    def _release_lines(self, reservation):
+        """
+        Releases the units of all lines of a reservation.
+        """
+        with self.store.lock_products(product for product, quantity in reservation.lines):
+            for product, quantity in reservation.lines:
+                product.release(quantity)
+
+
+    def checkout(self, cart_id):
+        """
+        Turns the reservation of a cart into an order. The reserved units are released
+        and bought while the products are locked, so nobody else can take them in between.
+        Due reservations are expired before the products are locked, never while they
+        are held. If the order fails, the units are held again and the reservation stays.
+
+        Args:
+            cart_id: The cart.
+
+        Returns:
+            OrderResult: The result of Store.place_order() for the reserved lines.
+
+        Raises:
+            ValueError: If the cart has no reservation or it expired.
+        """
+        with self._lock:
+            self.expire()
+            reservation = self._reservations.get(cart_id)
+            if reservation is None:
+                raise ValueError(f"Cart '{cart_id}' has no active reservation")
+            with self.store.lock_products(product for product, quantity in reservation.lines):
+                for product, quantity in reservation.lines:
+                    product.release(quantity)
+                result = None
+                try:
+                    # Not place_order(): it would expire reservations again while the
+                    # products of this cart are locked.
+                    result = self.store._place_order(reservation.lines)
+                finally:
+                    if result is None or not result.is_successful():
+                        for product, quantity in reservation.lines:
+                            product.reserve(quantity)
+                if result.is_successful():
+                    del self._reservations[cart_id]
+                return result
+
+
+    def expire(self):
+        """
+        Releases every reservation whose time to live is over.
+
+        Returns:
+            int: The number of expired reservations.
+        """
+        with self._lock:
+            now = self._clock()
+            expired = 0
+            while self._expiry_heap and self._expiry_heap[0][0] <= now:
+                expires_at, number, reservation = heapq.heappop(self._expiry_heap)
+                if self._reservations.get(reservation.cart_id) is not reservation:
+                    continue
+                del self._reservations[reservation.cart_id]
+                self._release_lines(reservation)
+                expired += 1
+            return expired
+
+
+    def expire_due(self):
+        """
+        Runs expire() only if the earliest reservation is due. Checking costs one
+        clock read, so the store calls this before every order.
+
+        Returns:
+            int: The number of expired reservations.
+        """
+        heap = self._expiry_heap
+        try:
+            due = heap[0][0] <= self._clock()
+        except IndexError:
+            return 0
+        return self.expire() if due else 0
+
+
+    def __len__(self):
+        """
+        Returns the number of active reservations, expired ones included until expire() runs.
+        """
+        return len(self._reservations)
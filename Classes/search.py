@@ -0,0 +1,201 @@
+import bisect
+import threading
+
+
+GRAM_SIZE = 3
+
+
+def _grams(text):
+    """
+    Returns the set of n-grams (of GRAM_SIZE characters) of a lowercase text.
+    """
+    return {text[index:index + GRAM_SIZE] for index in range(len(text) - GRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Indexes product names and prices for Store.search(). Names are kept sorted
+    (case-insensitive) for prefix search with bisect, every name is listed under its
+    n-grams for substring search, and (price, name) pairs are kept sorted for price
+    ranges. The index follows price changes and added or removed products as a
+    store observer; stock and active state are read from the products when searching.
+    A search that runs while products are added or removed in another thread may
+    miss or repeat one of them, but never fails.
+    """
+
+    def __init__(self, entries=()):
+        """
+        Initializes a SearchIndex. The n-gram and price indexes are only built when
+        the first query needs them.
+
+        Args:
+            entries (iterable): (name, price) pairs of the products to index.
+        """
+        self._price_of = dict(entries)
+        self._names = sorted((name.lower(), name) for name in self._price_of)
+        self._prices = None
+        self._names_by_gram = None
+        self._lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self._price_of)
+
+
+    def add(self, name, price):
+        """
+        Adds a product. A product that is already indexed is left as it is.
+
+        Args:
+            name (str): The product name.
+            price (float): The product price.
+        """
+        with self._lock:
+            if name in self._price_of:
+                return
+            self._price_of[name] = price
+            bisect.insort(self._names, (name.lower(), name))
+            if self._prices is not None:
+                bisect.insort(self._prices, (price, name))
+            if self._names_by_gram is not None:
+                for gram in _grams(name.lower()):
+                    self._names_by_gram.setdefault(gram, set()).add(name)
+
+
+    def remove(self, name):
+        """
+        Removes a product.
+
+        Args:
+            name (str): The product name.
+
+        Raises:
+            KeyError: If the product is not indexed.
+        """
+        with self._lock:
+            price = self._price_of.pop(name)
+            del self._names[bisect.bisect_left(self._names, (name.lower(), name))]
+            if self._prices is not None:
+                del self._prices[bisect.bisect_left(self._prices, (price, name))]
+            if self._names_by_gram is not None:
+                for gram in _grams(name.lower()):
+                    names = self._names_by_gram[gram]
+                    names.discard(name)
+                    if not names:
+                        del self._names_by_gram[gram]
+
+
+    def set_price(self, name, price):
+        """
+        Moves a product to its new place in the price index.
+        """
+        with self._lock:
+            old_price = self._price_of[name]
+            self._price_of[name] = price
+            if self._prices is not None:
+                del self._prices[bisect.bisect_left(self._prices, (old_price, name))]
+                bisect.insort(self._prices, (price, name))
+
+
+    def on_change(self, product, field, old_value, new_value):
+        """
+        Store observer callback that keeps the index up to date.
+        """
+        if field == "price":
+            self.set_price(product.name, new_value)
+        elif field == "added":
+            self.add(product.name, product.price)
+        elif field == "removed":
+            self.remove(product.name)
+
+
+    def iter_names(self, prefix=None, text=None, min_price=None, max_price=None, order_by="name"):
+        """
+        Yields the names that match all given conditions, using the most selective index.
+        Matching is case-insensitive. Only the names of one page need to be produced,
+        the generator stops as soon as the caller stops reading.
+
+        Args:
+            prefix (str): The names must start with this text.
+            text (str): The names must contain this text.
+            min_price (float): The lowest price, inclusive.
+            max_price (float): The highest price, inclusive.
+            order_by (str): "name" or "price".
+
+        Yields:
+            str: The matching names in the requested order.
+
+        Raises:
+            ValueError: If order_by is unknown.
+        """
+        prefix = prefix.lower() if prefix else None
+        text = text.lower() if text else None
+        if order_by == "price":
+            candidates = self._by_price(min_price, max_price)
+        elif order_by == "name":
+            if text is not None and len(text) >= GRAM_SIZE:
+                candidates = self._by_text(text)
+            else:
+                candidates = self._by_prefix(prefix or "")
+        else:
+            raise ValueError(f"Unknown order '{order_by}'")
+        for key, name in candidates:
+            if prefix is not None and not key.startswith(prefix):
+                continue
+            if text is not None and text not in key:
+                continue
+            if min_price is not None or max_price is not None:
+                price = self._price_of.get(name)
+                if price is None:
+                    continue
+                if min_price is not None and price < min_price:
+                    continue
+                if max_price is not None and price > max_price:
+                    continue
+            yield name
+
+
+    def _by_prefix(self, prefix):
+        """
+        Yields (lowercase name, name) pairs that start with prefix, in name order.
+        """
+        with self._lock:
+            names = self._names
+            start = bisect.bisect_left(names, (prefix,))
+        for index in range(start, len(names)):
+            entry = names[index] if index < len(names) else None
+            if entry is None or not entry[0].startswith(prefix):
+                return
+            yield entry
+
+
+    def _by_text(self, text):
+        """
+        Returns (lowercase name, name) pairs that contain all n-grams of text, in name order.
+        """
+        with self._lock:
+            if self._names_by_gram is None:
+                self._names_by_gram = {}
+                for name in self._price_of:
+                    for gram in _grams(name.lower()):
+                        self._names_by_gram.setdefault(gram, set()).add(name)
+            sets = [self._names_by_gram.get(gram, set()) for gram in _grams(text)]
+            sets.sort(key=len)
+            names = set(sets[0]).intersection(*sets[1:])
+        return sorted((name.lower(), name) for name in names)
+
+
+    def _by_price(self, min_price, max_price):
+        """
+        Yields (lowercase name, name) pairs within the price range, in price order.
+        """
+        with self._lock:
+            if self._prices is None:
+                self._prices = sorted((price, name) for name, price in self._price_of.items())
+            prices = self._prices
+            start = 0 if min_price is None else bisect.bisect_left(prices, (min_price,))
+        for index in range(start, len(prices)):
+            entry = prices[index] if index < len(prices) else None
+            if entry is None or (max_price is not None and entry[0] > max_price):
+                return
+            yield entry[1].lower(), entry[1]
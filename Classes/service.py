@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+
+class OrderService:
+    """
+    Asynchronous front end for a Store. Orders are put into a bounded queue and
+    processed by a number of worker coroutines that call Store.place_order().
+    When the queue is full, submit() waits until there is room again (backpressure).
+
+    Attributes:
+        store (Store): The store the orders are placed in.
+        workers (int): The number of worker coroutines.
+        queue_size (int): The maximum number of orders waiting in the queue.
+        use_threads (bool): If True, workers run place_order() in a thread so the event
+                            loop is never blocked. The store should be thread safe then.
+    """
+
+    def __init__(self, store, workers=4, queue_size=100, use_threads=False):
+        """
+        Initializes an OrderService. Call start() inside a running event loop to begin.
+
+        Args:
+            store (Store): The store the orders are placed in.
+            workers (int): The number of worker coroutines. Must be positive.
+            queue_size (int): The maximum number of waiting orders. Must be positive.
+            use_threads (bool): Run place_order() in a thread instead of on the event loop.
+
+        Raises:
+            ValueError: If workers or queue_size is not positive.
+        """
+        if workers <= 0:
+            raise ValueError("Workers must be greater than 0")
+        if queue_size <= 0:
+            raise ValueError("Queue size must be greater than 0")
+        self.store = store
+        self.workers = workers
+        self.queue_size = queue_size
+        self.use_threads = use_threads
+        self._queue = None
+        self._tasks = []
+        self._started_at = None
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+
+    async def start(self):
+        """
+        Creates the queue and starts the worker coroutines.
+        """
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._started_at = time.perf_counter()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+
+    async def stop(self):
+        """
+        Waits until every queued order is processed and stops the workers.
+        """
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+    async def submit(self, shopping_list):
+        """
+        Queues an order and waits for its result. Waits for room if the queue is full.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Returns:
+            OrderResult: The result of the order.
+
+        Raises:
+            Exception: Any error place_order() raised for the order.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((shopping_list, future, time.perf_counter()))
+        self.submitted += 1
+        return await future
+
+
+    def try_submit(self, shopping_list):
+        """
+        Queues an order without waiting. The order is rejected if the queue is full.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Returns:
+            Future or None: A future for the OrderResult, or None if the order was rejected.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((shopping_list, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        self.submitted += 1
+        return future
+
+
+    async def _worker(self):
+        """
+        Takes orders from the queue and places them in the store. Any error of an order
+        is passed to its future and the worker goes on with the next order.
+        """
+        while True:
+            shopping_list, future, queued_at = await self._queue.get()
+            try:
+                if self.use_threads:
+                    result = await asyncio.to_thread(self.store.place_order, shopping_list)
+                else:
+                    result = self.store.place_order(shopping_list)
+            except Exception as error:
+                self.failed += 1
+                if not future.cancelled():
+                    future.set_exception(error)
+            else:
+                if result.is_successful():
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                latency = time.perf_counter() - queued_at
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+                self._queue.task_done()
+
+
+    def get_stats(self):
+        """
+        Returns the counters of the service.
+
+        Returns:
+            dict: Submitted, completed, failed and rejected orders, the queue depth,
+                  mean and max latency in seconds and the throughput in orders per second.
+        """
+        processed = self.completed + self.failed
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {"submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "queued": self._queue.qsize() if self._queue else 0,
+                "mean_latency": self._latency_total / processed if processed else 0.0,
+                "max_latency": self._latency_max,
+                "throughput": processed / elapsed if elapsed else 0.0}
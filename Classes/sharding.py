@@ -0,0 +1,365 @@
+import multiprocessing
+import zlib
+
+from .loader import build_product, product_to_row
+from .products import NonStockedProduct
+from .store import Store
+
+
+def _execute(store, command, payload):
+    """
+    Runs one coordinator command against a shard store.
+
+    Commands:
+        "add": payload is a list of catalog rows, returns the number of added products.
+               Either all rows are added or none.
+        "remove": payload is a list of product names to remove, returns None.
+        "orders": payload is a list of [(name, quantity), ...] sub-orders, returns a list
+                  of (True, total, active flags before the order) or (False, reason, None)
+                  tuples, one per sub-order.
+        "undo": payload is a list of [(name, quantity, active), ...] sub-orders whose stock
+                is given back and whose products get their active flag from before the
+                order again, returns None.
+        "stats": returns (total quantity, total value, active count).
+    """
+    if command == "add":
+        promotions = {}
+        products = [build_product(row, promotions) for row in payload]
+        added = []
+        try:
+            for product in products:
+                store.add_product(product)
+                added.append(product)
+        except ValueError:
+            for product in added:
+                store.remove_product(product)
+            raise
+        return len(products)
+    if command == "remove":
+        for name in payload:
+            store.remove_product(store.get_product(name))
+        return None
+    if command == "orders":
+        results = []
+        for lines in payload:
+            shopping_list = []
+            for name, quantity in lines:
+                product = store.get_product(name)
+                if product is None:
+                    break
+                shopping_list.append((product, quantity))
+            else:
+                name = None
+            if name is not None:
+                results.append((False, f"Unknown product '{name}'", None))
+                continue
+            active = [product.is_active() for product, quantity in shopping_list]
+            result = store.place_order(shopping_list)
+            if result.is_successful():
+                results.append((True, result.total, active))
+            else:
+                results.append((False, result.failures[0][2], None))
+        return results
+    if command == "undo":
+        for lines in reversed(payload):
+            for name, quantity, active in reversed(lines):
+                product = store.get_product(name)
+                if isinstance(product, NonStockedProduct):
+                    continue
+                with store.lock_products((product,)):
+                    product.set_quantity(product.get_quantity() + quantity)
+                    if active:
+                        product.activate()
+                    else:
+                        product.deactivate()
+        return None
+    if command == "stats":
+        return store.get_total_quantity(), store.get_total_value(), store.get_active_count()
+    raise ValueError(f"Unknown shard command '{command}'")
+
+
+def _serve(connection, use_cents):
+    """
+    Main loop of a shard process: owns one Store and answers commands until "stop".
+    """
+    store = Store(use_cents=use_cents)
+    while True:
+        command, payload = connection.recv()
+        if command == "stop":
+            break
+        try:
+            connection.send((True, _execute(store, command, payload)))
+        except Exception as error:
+            connection.send((False, f"{type(error).__name__}: {error}"))
+    connection.close()
+
+
+class _LocalShard:
+    """
+    Shard that lives in the coordinator process, with the same send/receive interface
+    as a shard process.
+    """
+
+    def __init__(self, use_cents):
+        self.store = Store(use_cents=use_cents)
+        self._reply = None
+
+
+    def send(self, command, payload):
+        try:
+            self._reply = (True, _execute(self.store, command, payload))
+        except Exception as error:
+            self._reply = (False, f"{type(error).__name__}: {error}")
+
+
+    def receive(self):
+        return self._reply
+
+
+    def close(self):
+        pass
+
+
+class _ProcessShard:
+    """
+    Shard that runs in its own process and is talked to through a pipe.
+    """
+
+    def __init__(self, use_cents):
+        self._connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child_connection, use_cents), daemon=True)
+        self._process.start()
+        child_connection.close()
+
+
+    def send(self, command, payload):
+        self._connection.send((command, payload))
+
+
+    def receive(self):
+        return self._connection.recv()
+
+
+    def close(self):
+        self._connection.send(("stop", None))
+        self._process.join()
+        self._connection.close()
+
+
+class ShardedStore:
+    """
+    Inventory split over several Store shards, e.g. one per warehouse. Products are
+    assigned to a shard by a stable hash of their SKU (name) or of a custom key.
+    Orders are split by shard, the sub-orders of all shards run in parallel in shard
+    processes, and the totals are added up. An order either succeeds on every shard
+    or its successful sub-orders are given back.
+
+    Attributes:
+        shard_count (int): The number of shards.
+        use_cents (bool): If True, the shards price in whole cents and totals are ints.
+    """
+
+    def __init__(self, shard_count=4, processes=True, shard_key=None, use_cents=False):
+        """
+        Initializes a ShardedStore and starts the shards.
+
+        Args:
+            shard_count (int): The number of shards. Must be positive.
+            processes (bool): If True, every shard runs in its own process. Otherwise all
+                              shards live in this process (for tests and as baseline).
+            shard_key (callable): Maps a product to the key that is hashed to pick its shard,
+                                  e.g. its warehouse. Defaults to the product name.
+            use_cents (bool): Passed on to the shard stores.
+
+        Raises:
+            ValueError: If shard_count is not positive.
+        """
+        if shard_count <= 0:
+            raise ValueError("Shard count must be greater than 0")
+        self.shard_count = shard_count
+        self.use_cents = use_cents
+        self._shard_key = shard_key or (lambda product: product.name)
+        shard_class = _ProcessShard if processes else _LocalShard
+        self._shards = [shard_class(use_cents) for _ in range(shard_count)]
+        self._shard_of = {}
+
+
+    def _call_all(self, commands):
+        """
+        Sends commands to several shards first and then collects the replies, so the
+        shards work in parallel.
+
+        Args:
+            commands (dict): Shard number mapped to (command, payload).
+
+        Returns:
+            dict: Shard number mapped to the reply.
+
+        Raises:
+            RuntimeError: If a shard failed to run its command.
+        """
+        replies = {}
+        for number, (ok, reply) in self._gather(commands).items():
+            if not ok:
+                raise RuntimeError(f"Shard {number} failed: {reply}")
+            replies[number] = reply
+        return replies
+
+
+    def _gather(self, commands):
+        """
+        Sends commands to several shards and collects every reply, also after a shard
+        failed, so no reply is left waiting in a pipe.
+
+        Args:
+            commands (dict): Shard number mapped to (command, payload).
+
+        Returns:
+            dict: Shard number mapped to (ok, reply).
+        """
+        for number, (command, payload) in commands.items():
+            self._shards[number].send(command, payload)
+        return {number: self._shards[number].receive() for number in commands}
+
+
+    def add_products(self, products):
+        """
+        Distributes products over the shards.
+
+        Args:
+            products (iterable): The products to add. The objects are copied into the shards.
+
+        Either all products are added or none.
+
+        Raises:
+            ValueError: If a product with the same name is already in the store or a
+                        product cannot be turned into a catalog row.
+            RuntimeError: If a shard failed to add its products.
+        """
+        rows_by_shard = {}
+        shard_of = {}
+        for product in products:
+            if product.name in self._shard_of or product.name in shard_of:
+                raise ValueError(f"Product '{product.name}' is already in the store")
+            key = str(self._shard_key(product)).encode("utf-8")
+            number = zlib.crc32(key) % self.shard_count
+            rows_by_shard.setdefault(number, []).append(product_to_row(product))
+            shard_of[product.name] = number
+        replies = self._gather({number: ("add", rows) for number, rows in rows_by_shard.items()})
+        failed = {number: reply for number, (ok, reply) in replies.items() if not ok}
+        if failed:
+            self._call_all({number: ("remove", [row["name"] for row in rows_by_shard[number]])
+                            for number in replies if number not in failed})
+            number, reply = next(iter(failed.items()))
+            raise RuntimeError(f"Shard {number} failed: {reply}")
+        self._shard_of.update(shard_of)
+
+
+    def get_shard(self, name):
+        """
+        Returns the shard a product lives in.
+
+        Args:
+            name (str): The product name.
+
+        Returns:
+            int or None: The shard number, or None if the product is unknown.
+        """
+        return self._shard_of.get(name)
+
+
+    def place_orders(self, orders):
+        """
+        Places several orders. Every shard runs its share of all orders in one go.
+        If a sub-order fails, the other sub-orders of the same order are given back,
+        so each order is all-or-nothing. Orders of the same batch that were rejected
+        because a later failed order held their stock are not retried.
+
+        Args:
+            orders (list): Orders as lists of (product name, quantity) tuples.
+
+        Returns:
+            list: (total, None) for every successful order and (None, reason) for every failed one.
+        """
+        sub_orders = {}
+        results = [None] * len(orders)
+        for index, lines in enumerate(orders):
+            split = {}
+            for name, quantity in lines:
+                number = self._shard_of.get(name)
+                if number is None:
+                    results[index] = (None, f"Unknown product '{name}'")
+                    break
+                split.setdefault(number, []).append((name, quantity))
+            else:
+                for number, shard_lines in split.items():
+                    sub_orders.setdefault(number, []).append((index, shard_lines))
+        replies = self._call_all({number: ("orders", [lines for index, lines in entries])
+                                  for number, entries in sub_orders.items()})
+        totals = [0 if self.use_cents else 0.0] * len(orders)
+        succeeded = {}
+        for number, entries in sub_orders.items():
+            for (index, lines), (ok, value, active) in zip(entries, replies[number]):
+                if ok:
+                    totals[index] += value
+                    lines = [(name, quantity, flag) for (name, quantity), flag in zip(lines, active)]
+                    succeeded.setdefault(index, []).append((number, lines))
+                elif results[index] is None:
+                    results[index] = (None, value)
+        undo = {}
+        for index, parts in succeeded.items():
+            if results[index] is not None:
+                for number, lines in parts:
+                    undo.setdefault(number, []).append(lines)
+        if undo:
+            self._call_all({number: ("undo", payload) for number, payload in undo.items()})
+        return [result or (totals[index], None) for index, result in enumerate(results)]
+
+
+    def order(self, shopping_list):
+        """
+        Places one order.
+
+        Args:
+            shopping_list (list): A list of (product name, quantity) tuples.
+
+        Returns:
+            float: The total price of the order.
+
+        Raises:
+            ValueError: If a line cannot be bought. No stock is changed in that case.
+        """
+        total, reason = self.place_orders([shopping_list])[0]
+        if reason is not None:
+            raise ValueError(reason)
+        return total
+
+
+    def get_stats(self):
+        """
+        Adds up the inventory totals of all shards.
+
+        Returns:
+            dict: Total quantity, total value and number of active products.
+        """
+        replies = self._call_all({number: ("stats", None) for number in range(self.shard_count)})
+        return {"total_quantity": sum(reply[0] for reply in replies.values()),
+                "total_value": sum(reply[1] for reply in replies.values()),
+                "active_count": sum(reply[2] for reply in replies.values())}
+
+
+    def close(self):
+        """
+        Stops the shard processes.
+        """
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,121 @@
+import json
+import mmap
+import struct
+
+from .promotions import create_promotion
+from .store import Store
+from .table import ProductTable, REMOVED
+
+
+MAGIC = b"BBSNAP02"
+HEADER = struct.Struct("<8sQ")
+ALIGNMENT = 8
+
+
+def _compact_table(store):
+    """
+    Returns a table with the current state of all products of a store, removed rows excluded.
+    """
+    table = ProductTable()
+    backing_table = store.table
+    if backing_table is None:
+        for product in store.list_of_products:
+            table.add_product(product)
+        return table
+    for row, kind in enumerate(backing_table.kinds):
+        if kind == REMOVED:
+            continue
+        name = backing_table.name_of(row)
+        promotion_id = backing_table.promotion_ids[row]
+        table.add(kind, name, backing_table.prices[row],
+                  quantity=backing_table.quantities[row],
+                  maximum=backing_table.maximums[row],
+                  promotion=backing_table.promotions[promotion_id] if promotion_id >= 0 else None,
+                  active=bool(backing_table.active[row]))
+    return table
+
+
+def save_snapshot(store, path):
+    """
+    Writes products, quantities, active flags, promotions and the order sequence number
+    of a store to a binary file.
+
+    Layout: magic, length of a JSON header (promotions, column offsets), the header
+    itself and the columns as raw arrays, each aligned to 8 bytes. The names and their
+    hash index are columns too, so loading needs no decoding per product.
+    Products of a table backed store are read from the table, so unused rows are
+    not materialized.
+
+    Args:
+        store (Store): The store to save.
+        path (str): The snapshot file.
+
+    Raises:
+        ValueError: If a product uses a promotion without kind, which cannot be saved.
+    """
+    table = _compact_table(store)
+    promotions = []
+    for promotion in table.promotions:
+        if promotion.kind is None:
+            raise ValueError(f"Promotion '{promotion.name}' cannot be saved")
+        promotions.append([promotion.kind, promotion.name, getattr(promotion, "percent", None)])
+    columns = table.columns()
+    column_specs = []
+    offset = 0
+    for column_name, column in columns.items():
+        offset += -offset % ALIGNMENT
+        column_specs.append([column_name, column.typecode, offset, len(column)])
+        offset += len(column) * column.itemsize
+    header = {"rows": len(table.kinds), "promotions": promotions,
+              "order_sequence": store.get_order_sequence(), "columns": column_specs}
+    header_bytes = json.dumps(header).encode("utf-8")
+    data_start = _data_start(len(header_bytes))
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(header_bytes)))
+        file.write(header_bytes)
+        for (column_name, typecode, column_offset, length), column in zip(column_specs, columns.values()):
+            file.write(b"\0" * (data_start + column_offset - file.tell()))
+            file.write(column.tobytes())
+
+
+def _data_start(header_length):
+    """
+    Returns the file offset of the first column, the end of the header aligned to 8 bytes.
+    """
+    end = HEADER.size + header_length
+    return end + -end % ALIGNMENT
+
+
+def load_snapshot(path, thread_safe=False):
+    """
+    Restores a store from a snapshot file. The numeric columns are memory mapped, not
+    read, and products are only turned into objects when they are first accessed.
+    Changes are made to a private copy of the mapping, the file stays unchanged.
+
+    Args:
+        path (str): The snapshot file.
+        thread_safe (bool): Passed on to the Store.
+
+    Returns:
+        Store: A store backed by a ProductTable over the mapped file.
+
+    Raises:
+        ValueError: If the file is no snapshot.
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    if len(buffer) < HEADER.size:
+        raise ValueError("File is no store snapshot")
+    magic, header_length = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("File is no store snapshot")
+    header = json.loads(buffer[HEADER.size:HEADER.size + header_length])
+    data_start = _data_start(header_length)
+    view = memoryview(buffer)
+    columns = {}
+    for column_name, typecode, offset, length in header["columns"]:
+        start = data_start + offset
+        columns[column_name] = view[start:start + length * struct.calcsize(typecode)].cast(typecode)
+    promotions = [create_promotion(kind, name, percent) for kind, name, percent in header["promotions"]]
+    table = ProductTable.from_columns(promotions=promotions, **columns)
+    return Store(thread_safe=thread_safe, table=table, order_sequence=header["order_sequence"])
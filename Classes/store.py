@@ -1,21 +1,95 @@
-from .products import Product
+import contextlib
+import itertools
+import math
+import operator
+import threading
+import time
+
+from .products import Product, NonStockedProduct, LimitedProduct
+from .orders import OrderResult
+from .quotes import QuoteCache
+from .search import SearchIndex
+from .updates import UpdateSummary
 
 
 class Store():
     """Represents a store that is created, where products are stored form the Product class."""
 
 
-    def __init__(self, initial_products=None):
+    def __init__(self, initial_products=None, thread_safe=False, table=None, order_sequence=0,
+                 use_cents=False):
         """
         Initializes a Store instance.
 
+        Products are kept in a catalog keyed by their name (which acts as SKU), plus an
+        index of the active products and running inventory totals that are kept up to
+        date through product observers.
+
         Args:
             initial_products (list): A list of Products to define the List of items in the store.
+            thread_safe (bool): If True, orders lock every product they touch and the running
+                                totals are guarded, so orders can be placed from many threads.
+                                Every product gets its own lock, kept by the store and only
+                                created when the product is first locked.
+            table (ProductTable): Optional columnar backing store. Its rows become Product
+                                  objects on first access and changes are written back to it.
+            order_sequence (int): The sequence number of the last order, when a store is restored.
+            use_cents (bool): If True, orders and quotes are priced in integer cents
+                              (Product.quote_cents()) instead of floats.
         """
-        self.list_of_products = []
+        self.thread_safe = thread_safe
+        self._stats_lock = threading.Lock() if thread_safe else contextlib.nullcontext()
+        self._product_locks = {}
+        self._catalog = {}
+        self._active = {}
+        self._active_count = 0
+        self._total_quantity = 0
+        self._total_reserved = 0
+        self._total_value = 0.0
+        self._type_counts = {}
+        self._table = table
+        self._order_sequence = order_sequence
+        self._journal = None
+        self._history = None
+        self._limiter = None
+        self._reservations = None
+        self._pricing = None
+        self._observers = ()
+        self._search_index = None
+        self.use_cents = use_cents
+        self._quote_cache = QuoteCache(in_cents=use_cents)
+        if table is not None:
+            self._total_quantity = sum(table.quantities)
+            self._total_value = math.fsum(map(operator.mul, table.quantities, table.prices))
+            self._active_count = sum(table.active)
+            self._type_counts = table.get_type_counts()
         if initial_products:
             for product in initial_products:
-                self.list_of_products.append(product)
+                self.add_product(product)
+
+
+    @property
+    def list_of_products(self):
+        """
+        All products in the store, in the order they were added.
+
+        Returns:
+            list: A list of all Product instances, active or not.
+        """
+        if self._table is not None:
+            return [self.get_product(key) for key in self._table.iter_names()]
+        return list(self._catalog.values())
+
+
+    @property
+    def table(self):
+        """
+        The columnar backing store of the store.
+
+        Returns:
+            ProductTable or None: The table, or None if the store only holds product objects.
+        """
+        return self._table
 
 
     def add_product(self, product):
@@ -24,8 +98,23 @@ class Store():
 
         Args:
             product: The product to be added.
+
+        Raises:
+            ValueError: If a product with the same name is already in the store.
         """
-        self.list_of_products.append(product)
+        key = product.name
+        with self._stats_lock:
+            if key in self._catalog or (self._table is not None and key in self._table):
+                raise ValueError(f"Product '{key}' is already in the store")
+            self._catalog[key] = product
+            if product.is_active():
+                self._active[key] = product
+            self._count_product(product, 1)
+            if self._table is not None:
+                self._table.add_product(product)
+                product.add_observer(self._table.write_back)
+        product.add_observer(self._product_changed)
+        self._notify(product, "added", None, None)
 
 
     def remove_product(self, product):
@@ -38,56 +127,926 @@ class Store():
         Raises:
             ValueError: If the product is not in the store.
         """
-        self.list_of_products.remove(product)
+        key = product.name
+        with self._stats_lock:
+            if self._catalog.get(key) is not product:
+                raise ValueError(f"Product '{key}' is not in the store")
+            del self._catalog[key]
+            self._active.pop(key, None)
+            self._count_product(product, -1)
+            if self._table is not None:
+                self._table.remove(key)
+                product.remove_observer(self._table.write_back)
+        product.remove_observer(self._product_changed)
+        self._notify(product, "removed", None, None)
+
+
+    def get_product(self, key):
+        """
+        Looks up a product by its name.
+
+        Args:
+            key (str): The name of the product.
+
+        Returns:
+            Product or None: The product, or None if it is not in the store.
+        """
+        product = self._catalog.get(key)
+        if product is None and self._table is not None and key in self._table:
+            product = self._materialize(key)
+        return product
+
+
+    def _materialize(self, key):
+        """
+        Turns a row of the backing table into a product object and registers it.
+        The running totals already contain the row, so they are not changed.
+        """
+        with self._stats_lock:
+            product = self._catalog.get(key)
+            if product is None:
+                product = self._table.materialize(key)
+                self._catalog[key] = product
+                if product.is_active():
+                    self._active[key] = product
+                product.add_observer(self._table.write_back)
+                product.add_observer(self._product_changed)
+        return product
+
+
+    def _all_products(self):
+        """
+        Returns all product objects, materializing the rows of the backing table first.
+
+        Returns:
+            dict_values: The products of the catalog.
+        """
+        if self._table is not None and len(self._catalog) < len(self._table):
+            for key in self._table.iter_names():
+                if key not in self._catalog:
+                    self._materialize(key)
+        return self._catalog.values()
+
+
+    def _count_product(self, product, sign):
+        """
+        Adds (sign = 1) or subtracts (sign = -1) a product from the running totals.
+        """
+        quantity = product.get_quantity()
+        if product.is_active():
+            self._active_count += sign
+        self._total_quantity += sign * quantity
+        self._total_reserved += sign * product.get_reserved()
+        self._total_value += sign * quantity * product.price
+        type_name = type(product).__name__
+        self._type_counts[type_name] = self._type_counts.get(type_name, 0) + sign
+        if not self._type_counts[type_name]:
+            del self._type_counts[type_name]
+
+
+    def _product_changed(self, product, field, old_value, new_value):
+        """
+        Observer callback that keeps the active index and the totals in sync with the products.
+        """
+        if field == "quantity":
+            change = new_value - old_value
+            if self.thread_safe:
+                with self._stats_lock:
+                    self._total_quantity += change
+                    self._total_value += change * product.price
+            else:
+                self._total_quantity += change
+                self._total_value += change * product.price
+            if self._observers:
+                self._notify(product, field, old_value, new_value)
+            return
+        with self._stats_lock:
+            if field == "active":
+                if new_value:
+                    self._active[product.name] = product
+                    self._active_count += 1
+                else:
+                    self._active.pop(product.name, None)
+                    self._active_count -= 1
+            elif field == "reserved":
+                self._total_reserved += new_value - old_value
+            elif field == "price":
+                self._total_value += product.get_quantity() * (new_value - old_value)
+        if field in ("price", "promotion"):
+            self._quote_cache.invalidate(product)
+        self._notify(product, field, old_value, new_value)
+
+
+    def add_observer(self, observer):
+        """
+        Registers a callback that is informed about every product change in the store
+        and about products being added or removed.
+
+        Args:
+            observer (callable): Called as observer(product, field, old_value, new_value),
+                                 like a product observer, plus field "added" or "removed"
+                                 (with old_value and new_value None) for catalog changes.
+        """
+        self._observers = self._observers + (observer,)
+
+
+    def remove_observer(self, observer):
+        """
+        Unregisters a callback added with add_observer().
+
+        Args:
+            observer (callable): The callback to remove.
+
+        Raises:
+            ValueError: If the callback was never registered.
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+
+    def _notify(self, product, field, old_value, new_value):
+        """
+        Informs all store observers about a change.
+        """
+        for observer in self._observers:
+            observer(product, field, old_value, new_value)
 
 
     def get_total_quantity(self):
         """
-        Calculates the total quantity of all products in the store.
+        Returns the total quantity of all products in the store.
 
         Returns:
             int: The total quantity of all products in the store.
         """
-        return sum([item.get_quantity() for item in self.list_of_products])
+        return self._total_quantity
+
+
+    def get_reserved_quantity(self):
+        """
+        Returns the number of units held for carts over all products.
+
+        Returns:
+            int: The total reserved quantity.
+        """
+        return self._total_reserved
+
+
+    def get_available_quantity(self):
+        """
+        Returns the number of units that can be bought right now.
+
+        Returns:
+            int: The total quantity minus the reserved quantity.
+        """
+        return self._total_quantity - self._total_reserved
+
+
+    def get_total_value(self):
+        """
+        Returns the value of the whole stock at list price.
+
+        Returns:
+            float: The sum of quantity * price over all products.
+        """
+        return self._total_value
+
+
+    def get_active_count(self):
+        """
+        Returns the number of active products.
+
+        Returns:
+            int: The number of products that are available for purchase.
+        """
+        return self._active_count
+
+
+    def get_type_counts(self):
+        """
+        Returns how many products of each product type are in the store.
+
+        Returns:
+            dict: Product class name mapped to the number of products of that type.
+        """
+        return dict(self._type_counts)
+
+
+    def check_consistency(self):
+        """
+        Recalculates all running totals from scratch and compares them with the maintained ones.
+
+        Returns:
+            bool: True if the maintained totals match the recalculated ones.
+        """
+        products = self._all_products()
+        total_quantity = sum(product.get_quantity() for product in products)
+        total_reserved = sum(product.get_reserved() for product in products)
+        total_value = sum(product.get_quantity() * product.price for product in products)
+        active = {product.name for product in products if product.is_active()}
+        type_counts = {}
+        for product in products:
+            type_name = type(product).__name__
+            type_counts[type_name] = type_counts.get(type_name, 0) + 1
+        return (total_quantity == self._total_quantity
+                and total_reserved == self._total_reserved
+                and math.isclose(total_value, self._total_value, rel_tol=1e-9, abs_tol=1e-6)
+                and active == set(self._active)
+                and len(active) == self._active_count
+                and type_counts == self._type_counts)
 
 
     def get_all_products(self):
         """
-        Returns all products in the store that are active and give back is_active(True).
+        Returns all products in the store that are active and give back is_active(True),
+        in catalog order, also for products that were deactivated and activated again.
 
         Returns:
             list: A list of active Product instances.
         """
-        return [product for product in self.list_of_products if product.is_active()]
+        active = self._active
+        return [product for product in self.list_of_products if product.name in active]
 
 
 
-    def order(self, shopping_list):
+    def apply_updates(self, updates):
         """
-        Make an order by reducing product quantities and calculating the total cost.
+        Applies a batch of stock, price and activation updates, e.g. a nightly feed.
+        All updates are validated first; several updates of the same product are merged,
+        so every product is changed once, with its observers informed as usual.
+        Invalid updates are reported and skipped, the valid ones are applied.
+        The validation costs time: for a plain store the batch is slower than calling
+        set_quantity() and set_price() directly (see Benchmarks/bench_updates.py).
+
+        Every update is a dict with the product "name" and any of:
+            "quantity": the new stock (absolute),
+            "delta": a change of the stock, e.g. 50 for a restock or -3 for a write-off,
+            "price": the new price,
+            "active": True or False.
+
+        A product whose stock drops to 0 is deactivated; a product restocked from 0 is
+        activated unless the update sets "active" explicitly.
+
+        Args:
+            updates (iterable): The update dicts.
+
+        Returns:
+            UpdateSummary: The numbers of applied updates, changed products and
+                           (de)activations, and the rejected updates.
+        """
+        summary = UpdateSummary()
+        start = time.perf_counter()
+        catalog = self._catalog
+        errors = summary.errors
+        plans = {}
+        for index, update in enumerate(updates):
+            try:
+                name = update.get("name")
+                product = catalog.get(name)
+                if product is None:
+                    product = self.get_product(name) if name is not None else None
+                    if product is None:
+                        raise ValueError(f"Unknown product '{name}'")
+                quantity = update.get("quantity")
+                delta = update.get("delta")
+                changes_stock = quantity is not None or delta is not None
+                if changes_stock:
+                    if isinstance(product, NonStockedProduct):
+                        raise ValueError("Non stocked products have no quantity")
+                    if quantity is not None:
+                        if delta is not None:
+                            raise ValueError("Quantity and delta must not be combined")
+                        try:
+                            quantity = int(quantity)
+                        except (ValueError, TypeError):
+                            raise ValueError("Invalid quantity provided")
+                        if quantity < 0:
+                            raise ValueError("Quantity must not be negative")
+                    else:
+                        try:
+                            delta = int(delta)
+                        except (ValueError, TypeError):
+                            raise ValueError("Invalid delta provided")
+                price = update.get("price")
+                if price is not None:
+                    try:
+                        price = float(price)
+                    except (ValueError, TypeError):
+                        raise ValueError("Price must be a valid number")
+                    if price < 0:
+                        raise ValueError("Price must be greater than 0")
+                active = update.get("active")
+                if active is not None and not isinstance(active, bool):
+                    raise ValueError("Active must be True or False")
+                plan = plans.get(product)
+                if plan is None:
+                    plans[product] = [quantity, delta or 0, price, active, [index]]
+                    continue
+                # A further update of the product: the merged stock is checked right
+                # away, so an update that would break it is rejected on its own.
+                if quantity is None:
+                    quantity = plan[0]
+                    delta = plan[1] + (delta or 0)
+                else:
+                    delta = 0
+                if active is None:
+                    active = plan[3]
+                if changes_stock or (active and not isinstance(product, NonStockedProduct)):
+                    self._check_stock(product, quantity, delta, active)
+                plan[0] = quantity
+                plan[1] = delta
+                if price is not None:
+                    plan[2] = price
+                plan[3] = active
+                plan[4].append(index)
+            except (ValueError, TypeError, AttributeError) as error:
+                errors.append((index, str(error)))
+        summary.applied = sum(len(plan[4]) for plan in plans.values())
+        for product, plan in plans.items():
+            try:
+                if self.thread_safe:
+                    with self._lock_of(product):
+                        self._apply_plan(product, plan, summary)
+                else:
+                    self._apply_plan(product, plan, summary)
+            except ValueError as error:
+                errors.extend((index, str(error)) for index in plan[4])
+                summary.applied -= len(plan[4])
+        errors.sort(key=operator.itemgetter(0))
+        summary.seconds = time.perf_counter() - start
+        return summary
+
+
+    @staticmethod
+    def _check_stock(product, quantity, delta, active):
+        """
+        Returns the stock a plan leads to, or raises ValueError if it is not allowed.
+        """
+        new_quantity = (quantity if quantity is not None else product.get_quantity()) + delta
+        if new_quantity < 0:
+            raise ValueError("Quantity must not be negative")
+        if new_quantity < product.get_reserved():
+            raise ValueError("Quantity must not be lower than the reserved quantity")
+        if active and new_quantity == 0:
+            raise ValueError("Product without stock cannot be activated")
+        return new_quantity
+
+
+    def _apply_plan(self, product, plan, summary):
+        """
+        Applies the updates of one product. The caller holds the lock of the product.
+        The stock is checked here, against the stock at that moment, as orders may
+        have changed it since the batch was validated.
+
+        Args:
+            plan (list): [quantity, delta, price, active, indices] of the merged updates,
+                         where quantity is an absolute stock or None and delta is added to
+                         it (or to the current stock); None means unchanged.
+        """
+        quantity, delta, price, active, indices = plan
+        was_active = product.active
+        old_quantity = product.get_quantity()
+        target_active = was_active if active is None else active
+        new_quantity = old_quantity
+        if quantity is not None or delta or (active and not isinstance(product, NonStockedProduct)):
+            new_quantity = self._check_stock(product, quantity, delta, active)
+            if new_quantity == 0:
+                target_active = False
+            elif active is None and old_quantity == 0:
+                target_active = True
+        changed = False
+        if price is not None and price != product.price:
+            product.price = price
+            changed = True
+        if new_quantity != old_quantity:
+            product.set_quantity(new_quantity)
+            changed = True
+        if target_active != product.active:
+            if target_active:
+                product.activate()
+            else:
+                product.deactivate()
+        is_active = product.active
+        if changed or was_active != is_active:
+            summary.products += 1
+        if is_active != was_active:
+            if is_active:
+                summary.activated += 1
+            else:
+                summary.deactivated += 1
+
+
+    def search(self, prefix=None, text=None, min_price=None, max_price=None, in_stock=False,
+               order_by="name", offset=0, limit=20):
+        """
+        Finds products by name and price, one page at a time. The search indexes are built
+        on the first call and kept up to date afterwards. Only the products of the requested
+        page are looked at (and materialized, for a table backed store), not the whole catalog.
+
+        Args:
+            prefix (str): The name must start with this text (case-insensitive).
+            text (str): The name must contain this text (case-insensitive).
+            min_price (float): The lowest price, inclusive.
+            max_price (float): The highest price, inclusive.
+            in_stock (bool): If True, only active products with units available are returned.
+            order_by (str): "name" or "price".
+            offset (int): The number of matches to skip, for the following pages.
+            limit (int): The maximum number of products to return.
+
+        Returns:
+            list: The matching products of the page.
+
+        Raises:
+            ValueError: If offset is negative, limit is not positive or order_by is unknown.
+        """
+        if offset < 0:
+            raise ValueError("Offset must not be negative")
+        if limit <= 0:
+            raise ValueError("Limit must be greater than 0")
+        products = self.iter_search(prefix, text, min_price, max_price, in_stock, order_by)
+        return list(itertools.islice(products, offset, offset + limit))
+
+
+    def iter_search(self, prefix=None, text=None, min_price=None, max_price=None, in_stock=False,
+                    order_by="name"):
+        """
+        Yields the products search() would return, without pages. Products are looked up
+        one by one while the generator is read, so it suits walking a large catalog page
+        by page without going back to the start for every page.
+
+        Args:
+            See search().
+
+        Yields:
+            Product: The matching products in the requested order.
+
+        Raises:
+            ValueError: If order_by is unknown.
+        """
+        for name in self._get_search_index().iter_names(prefix, text, min_price, max_price, order_by):
+            product = self.get_product(name)
+            if product is None:
+                continue
+            if in_stock and not (product.is_active() and (isinstance(product, NonStockedProduct)
+                                                          or product.get_available_quantity() > 0)):
+                continue
+            yield product
+
+
+    def _get_search_index(self):
+        """
+        Returns the search index, building it from the catalog on first use.
+        """
+        with self._stats_lock:
+            if self._search_index is None:
+                if self._table is not None:
+                    table = self._table
+                    entries = zip(table.iter_names(), table.iter_prices())
+                else:
+                    entries = ((name, product.price) for name, product in self._catalog.items())
+                self._search_index = SearchIndex(entries)
+                self.add_observer(self._search_index.on_change)
+        return self._search_index
+
+
+    def validate_shopping_list(self, shopping_list):
+        """
+        Checks the structure of a shopping list.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Raises:
+            TypeError: If "shopping_list" is not a list or if the elements of "shopping_list" are not tuples
+                       with a Product instance and an integer.
+            ValueError: If the tuple in "shopping_list" does not have exactly two elements.
+        """
+        if not isinstance(shopping_list, list):
+            raise TypeError("shopping_list has to be a list")
+        for item_order in shopping_list:
+            if not isinstance(item_order, tuple) or len(item_order) != 2:
+                raise ValueError("Order has to be a Tuple with 2 elements.")
+            if not isinstance(item_order[0], Product) or not isinstance(item_order[1], int):
+                raise TypeError("First element has to be a product and second a integer.")
+
+
+    def quote(self, shopping_list):
+        """
+        Prices a shopping list without changing any stock. Quotes of single lines are
+        cached until the price or promotion of their product changes. With a pricing
+        engine (see set_pricing()) the whole list is priced by the engine instead.
+
+        Args:
+            shopping_list (list): A list of (Product, int) tuples.
+
+        Returns:
+            float or int: The total price the order would have now, in cents if use_cents is set.
+
+        Raises:
+            TypeError: If "shopping_list" is not a list or if the elements of "shopping_list" are not tuples
+                       with a Product instance and an integer.
+            ValueError: If a tuple does not have exactly two elements or a quantity is negative.
+        """
+        self.validate_shopping_list(shopping_list)
+        if self._pricing is not None:
+            return self._pricing.price_cart(shopping_list)
+        return sum(self._quote_cache.quote(product, quantity) for product, quantity in shopping_list)
+
+
+    def get_quote_stats(self):
+        """
+        Returns the counters of the quote cache.
+
+        Returns:
+            dict: See QuoteCache.get_stats().
+        """
+        return self._quote_cache.get_stats()
+
+
+    def place_order(self, shopping_list, customer=None):
+        """
+        Make an all-or-nothing order. Every line is checked against the stock, the maximum
+        per order of limited products and the purchase limits of the customer first, and
+        stock is only changed if all lines can be bought. If a line still fails while
+        the order is committed, all lines bought so far are rolled back.
 
         Args:
             shopping_list (list): A list of tuples where each tuple contains:
                                   - A Product instance.
                                   - An integer of the quantity to purchase.
+            customer: The customer id, checked against the purchase limiter (see set_limiter()).
+                      Orders without customer are not limited per customer.
 
         Returns:
-            float: The total price of the order.
+            OrderResult: The bought lines and the total, or the failed lines if nothing was bought.
 
         Raises:
             TypeError: If "shopping_list" is not a list or if the elements of "shopping_list" are not tuples
                        with a Product instance and an integer.
             ValueError: If the tuple in "shopping_list" does not have exactly two elements.
         """
-        order_price = 0.0
+        self.validate_shopping_list(shopping_list)
+        self._expire_reservations()
+        with self.lock_products(product for product, quantity in shopping_list):
+            return self._place_order(shopping_list, customer)
+
+
+    def _place_order(self, shopping_list, customer=None):
+        """
+        Checks and commits a validated shopping list, see place_order().
+        """
+        result = OrderResult(self.use_cents)
+        requested = {}
+        for product, quantity in shopping_list:
+            if quantity < 0:
+                result.add_failure(product, quantity, "Quantity must not be negative")
+                continue
+            requested[product] = requested.get(product, 0) + quantity
+            if not isinstance(product, NonStockedProduct) and requested[product] > product.get_available_quantity():
+                result.add_failure(product, quantity, "Quantity is too high")
+            elif isinstance(product, LimitedProduct) and requested[product] > product.maximum:
+                result.add_failure(product, quantity, f"Quantity exceeds the maximum of {product.maximum} per order")
+        if not result.is_successful():
+            return result
+        limiter = self._limiter if customer is not None else None
+        if limiter is not None:
+            for product, reason in limiter.acquire(customer, requested):
+                result.add_failure(product, requested[product], reason)
+            if not result.is_successful():
+                return result
+
+        saved_state = {product: (product.get_quantity(), product.is_active())
+                       for product in requested if not isinstance(product, NonStockedProduct)}
+        plan = self._pricing.get_plan() if self._pricing is not None else None
+        try:
+            for product, quantity in shopping_list:
+                if self.use_cents:
+                    product.reduce_quantity(quantity)
+                    price = product.quote_cents(quantity)
+                elif plan is not None:
+                    product.reduce_quantity(quantity)
+                    price = plan.price_line(product, quantity)
+                else:
+                    price = product.buy(quantity)
+                result.add_line(product, quantity, price)
+            if plan is not None and plan.cart_rules:
+                lines = [(product, price) for product, quantity, price in result.lines]
+                for name, amount in plan.get_cart_discounts(lines, result.total):
+                    result.add_discount(name, amount)
+        except Exception as error:
+            self._rollback(saved_state)
+            if limiter is not None:
+                limiter.release(customer, requested)
+            if not isinstance(error, ValueError) or len(result.lines) == len(shopping_list):
+                raise
+            failed = shopping_list[len(result.lines)]
+            result = OrderResult(self.use_cents)
+            result.add_failure(failed[0], failed[1], str(error))
+        else:
+            result.sequence = self._record_order(shopping_list, result.lines)
+        return result
+
+
+    def _record_order(self, shopping_list, lines):
+        """
+        Numbers a committed order and appends it to the journal and the order history,
+        if there are any.
+
+        Args:
+            shopping_list (list): The committed (Product, int) tuples.
+            lines (list): The sold (Product, quantity, price) tuples.
+
+        Returns:
+            int: The sequence number of the order.
+        """
+        with self._stats_lock:
+            self._order_sequence += 1
+            sequence = self._order_sequence
+        if self._journal is not None:
+            self._journal.append(sequence, shopping_list)
+        if self._history is not None:
+            self._history.record(sequence, lines)
+        return sequence
+
+
+    def get_order_sequence(self):
+        """
+        Returns the sequence number of the last committed order.
+
+        Returns:
+            int: The number of orders committed since the store (or its snapshot) was created.
+        """
+        return self._order_sequence
+
+
+    def set_journal(self, journal):
+        """
+        Assigns a journal that every committed order is appended to.
+
+        Args:
+            journal (OrderJournal or None): The journal, or None to stop journaling.
+        """
+        self._journal = journal
+
+
+    def set_history(self, history):
+        """
+        Assigns an order history that the lines of every committed order are recorded in.
+
+        Args:
+            history (OrderHistory or None): The history, or None to stop recording.
+        """
+        self._history = history
+
+
+    def set_reservations(self, reservations):
+        """
+        Assigns the reservation manager whose stale reservations are expired before
+        every order, so expired carts never block a sale. ReservationManager registers
+        itself when it is created.
+
+        Args:
+            reservations (ReservationManager or None): The manager, or None to stop expiring.
+        """
+        self._reservations = reservations
+
+
+    def _expire_reservations(self):
+        """
+        Releases the reservations that are due. Runs before the products of an order are
+        locked, because expiring locks the products of the expired reservations.
+        """
+        if self._reservations is not None:
+            self._reservations.expire_due()
+
+
+    def set_pricing(self, engine):
+        """
+        Prices orders and quotes with a PromotionEngine, so its stacked product rules and
+        its bundle and spend threshold rules decide what an order charges. The engine is
+        registered as store observer and learns about promotions set on the products.
+
+        Args:
+            engine (PromotionEngine or None): The engine, or None to price with the
+                                              product promotions only.
+
+        Raises:
+            ValueError: If the store prices in cents, which the engine does not support.
+        """
+        if engine is not None and self.use_cents:
+            raise ValueError("Pricing engines do not price in cents")
+        if self._pricing is not None:
+            self.remove_observer(self._pricing.on_change)
+        self._pricing = engine
+        if engine is not None:
+            self.add_observer(engine.on_change)
+
+
+    def set_limiter(self, limiter):
+        """
+        Assigns a purchase limiter that orders with a customer are checked against.
+
+        Args:
+            limiter (PurchaseLimiter or None): The limiter, or None to stop limiting.
+        """
+        self._limiter = limiter
+
+
+    def lock_products(self, products):
+        """
+        Acquires the locks of all given products in a fixed order (by name), so that
+        orders sharing products cannot deadlock. Products do not share locks, so orders
+        of unrelated products never wait for each other. Does nothing if the store is
+        not thread safe.
+
+        Args:
+            products (iterable): The products to lock, duplicates are allowed.
+
+        Returns:
+            ExitStack: A context manager that releases the locks on exit.
+        """
+        stack = contextlib.ExitStack()
+        if self.thread_safe:
+            for product in sorted({product.name: product for product in products}.values(),
+                                  key=operator.attrgetter("name")):
+                stack.enter_context(self._lock_of(product))
+        return stack
+
+
+    def _lock_of(self, product):
+        """
+        Returns the lock of a product, creating it when the product is first locked.
+        """
+        lock = self._product_locks.get(product.name)
+        if lock is None:
+            lock = self._product_locks.setdefault(product.name, threading.RLock())
+        return lock
+
+
+    def _rollback(self, saved_state):
+        """
+        Restores quantity and active flag of products after a failed order.
+
+        Args:
+            saved_state (dict): Product mapped to its (quantity, active) before the order.
+        """
+        for product, (quantity, active) in saved_state.items():
+            product.set_quantity(quantity)
+            if active:
+                product.activate()
+            else:
+                product.deactivate()
+
+
+    def order(self, shopping_list, customer=None):
+        """
+        Make an order by reducing product quantities and calculating the total cost.
+        The order is all-or-nothing, see place_order().
+
+        Args:
+            shopping_list (list): A list of tuples where each tuple contains:
+                                  - A Product instance.
+                                  - An integer of the quantity to purchase.
+            customer: The customer id for the purchase limits, see place_order().
+
+        Returns:
+            float or int: The total price of the order, in cents if use_cents is set.
+
+        Raises:
+            TypeError: If "shopping_list" is not a list or if the elements of "shopping_list" are not tuples
+                       with a Product instance and an integer.
+            ValueError: If the tuple in "shopping_list" does not have exactly two elements, or if a line
+                        cannot be bought. No stock is changed in that case.
+        """
+        if (customer is None and not self.thread_safe and not self.use_cents and self._limiter is None
+                and self._journal is None and self._history is None and self._pricing is None):
+            return self._order_plain(shopping_list)
+        result = self.place_order(shopping_list, customer)
+        if not result.is_successful():
+            raise ValueError(result.failures[0][2])
+        return result.total
+
+
+    def _order_plain(self, shopping_list):
+        """
+        The order() path of a store without locks, limiter, journal, history, pricing
+        engine or cents: no OrderResult is built and no state is saved up front. Every
+        line is checked before anything is bought, so usually only a failing promotion
+        or a product named twice can stop the commit; the lines bought until then are
+        given back in reverse order, which restores stock and active flags.
+        """
         if not isinstance(shopping_list, list):
             raise TypeError("shopping_list has to be a list")
+        self._expire_reservations()
         for item_order in shopping_list:
-            if not isinstance(item_order, tuple) and len(tuple) != 2:
+            if not isinstance(item_order, tuple) or len(item_order) != 2:
                 raise ValueError("Order has to be a Tuple with 2 elements.")
-            if not isinstance(item_order[0], Product) and not isinstance(item_order[1], int):
+            product, quantity = item_order
+            if not isinstance(product, Product) or not isinstance(quantity, int):
                 raise TypeError("First element has to be a product and second a integer.")
-            order_price += item_order[0].buy(item_order[1])
-        return order_price
+            if quantity > product.quantity - product.reserved and not isinstance(product, NonStockedProduct):
+                break
+            if quantity < 0 or isinstance(product, LimitedProduct) and quantity > product.maximum:
+                break
+        else:
+            order_price = 0.0
+            bought = []
+            try:
+                for product, quantity in shopping_list:
+                    old_quantity = product.quantity
+                    was_active = product.active
+                    order_price += product.buy(quantity)
+                    bought.append((product, quantity, was_active))
+            except Exception:
+                if product.quantity != old_quantity:
+                    self._rollback({product: (old_quantity, was_active)})
+                for product, quantity, was_active in reversed(bought):
+                    if not isinstance(product, NonStockedProduct):
+                        self._rollback({product: (product.quantity + quantity, was_active)})
+                raise
+            self._order_sequence += 1
+            return order_price
+        result = self.place_order(shopping_list)
+        if not result.is_successful():
+            raise ValueError(result.failures[0][2])
+        return result.total
 
 
+    def order_batch(self, shopping_list, customer=None):
+        """
+        Make a bulk order. Lines are grouped by product, the stock of the whole batch is
+        validated before anything is changed, every product is reduced once and each
+        promotion prices all lines of a product in a single pass. If a product fails
+        while the batch is committed, stock and purchase limits are rolled back.
+        The total equals the one of order() for the same shopping list.
+
+        Args:
+            shopping_list (list): A list of tuples where each tuple contains:
+                                  - A Product instance.
+                                  - An integer of the quantity to purchase.
+            customer: The customer id for the purchase limits, see place_order().
+
+        Returns:
+            float or int: The total price of the order, in cents if use_cents is set.
+
+        Raises:
+            TypeError: If "shopping_list" is not a list or if the elements of "shopping_list" are not tuples
+                       with a Product instance and an integer.
+            ValueError: If a tuple does not have exactly two elements, a quantity is negative,
+                        the batch asks for more than a product has in stock or allows per
+                        order, or the customer is over a purchase limit.
+        """
+        self.validate_shopping_list(shopping_list)
+        self._expire_reservations()
+        with self.lock_products(product for product, quantity in shopping_list):
+            return self._order_batch(shopping_list, customer)
+
+
+    def _order_batch(self, shopping_list, customer=None):
+        """
+        Checks and commits a validated bulk order, see order_batch().
+        """
+        lines_by_product = {}
+        for product, quantity in shopping_list:
+            if quantity < 0:
+                raise ValueError("Quantity must not be negative")
+            lines_by_product.setdefault(product, []).append(quantity)
+        totals = {product: sum(quantities) for product, quantities in lines_by_product.items()}
+        for product, total in totals.items():
+            if not isinstance(product, NonStockedProduct) and total > product.get_available_quantity():
+                raise ValueError(f"Quantity is too high for '{product.name}'")
+            if isinstance(product, LimitedProduct) and total > product.maximum:
+                raise ValueError(f"Quantity exceeds the maximum of {product.maximum} per order for '{product.name}'")
+        limiter = self._limiter if customer is not None else None
+        if limiter is not None:
+            failures = limiter.acquire(customer, totals)
+            if failures:
+                product, reason = failures[0]
+                raise ValueError(f"{reason} for '{product.name}'")
+        saved_state = {product: (product.get_quantity(), product.is_active())
+                       for product in totals if not isinstance(product, NonStockedProduct)}
+        plan = self._pricing.get_plan() if self._pricing is not None else None
+        order_price = 0 if self.use_cents else 0.0
+        lines = []
+        try:
+            for product, quantities in lines_by_product.items():
+                product.reduce_quantity(totals[product])
+                if self.use_cents:
+                    price = sum(product.quote_cents(quantity) for quantity in quantities)
+                elif plan is not None:
+                    price = sum(plan.price_line(product, quantity) for quantity in quantities)
+                else:
+                    price = product.get_batch_price(quantities)
+                order_price += price
+                lines.append((product, totals[product], price))
+        except Exception:
+            self._rollback(saved_state)
+            if limiter is not None:
+                limiter.release(customer, totals)
+            raise
+        if plan is not None and plan.cart_rules:
+            discounts = plan.get_cart_discounts([(product, price) for product, quantity, price in lines], order_price)
+            order_price -= sum(amount for name, amount in discounts)
+        self._record_order(shopping_list, lines)
+        return order_price
@@ -0,0 +1,446 @@
+import itertools
+import zlib
+from array import array
+
+from .products import Product, NonStockedProduct, LimitedProduct
+
+
+PRODUCT = 0
+NON_STOCKED = 1
+LIMITED = 2
+REMOVED = -1
+REMOVED_BYTE = REMOVED.to_bytes(1, "little", signed=True)
+EMPTY_SLOT = -1
+FREED_SLOT = -2
+
+KIND_CLASSES = {PRODUCT: Product, NON_STOCKED: NonStockedProduct, LIMITED: LimitedProduct}
+
+
+def kind_of(product):
+    """
+    Returns the kind code of a product instance.
+
+    Args:
+        product: A Product, NonStockedProduct or LimitedProduct.
+
+    Returns:
+        int: PRODUCT, NON_STOCKED or LIMITED.
+    """
+    if isinstance(product, LimitedProduct):
+        return LIMITED
+    if isinstance(product, NonStockedProduct):
+        return NON_STOCKED
+    return PRODUCT
+
+
+class ProductTable:
+    """
+    Columnar storage of a product catalog. Every product is one row, spread over
+    parallel arrays, so a large catalog needs no Python object per product.
+    A Store can use the table as backing store: rows are turned into Product objects
+    only when they are accessed, and changes of those objects are written back.
+
+    Names are kept as UTF-8 bytes in one column and found through an open addressing
+    hash table of row numbers (CRC-32 of the name, linear probing), not a dict: no
+    str and int object per row, and the index can be saved and mapped like the
+    other columns.
+
+    Attributes:
+        name_bytes (array): The UTF-8 encoded names of all rows, back to back.
+        name_offsets (array): Where the name of every row starts in name_bytes, plus the end.
+        index (array): Hash slots holding a row number, EMPTY_SLOT or FREED_SLOT.
+        kinds (array): The kind code of every row (PRODUCT, NON_STOCKED, LIMITED or REMOVED).
+        prices (array): The price of every row.
+        quantities (array): The quantity of every row, 0 for non stocked products.
+        active (array): 1 if the product of the row is active, 0 otherwise.
+        maximums (array): The maximum per order of limited products, -1 for other rows.
+        promotion_ids (array): Index into promotions, -1 if the row has no promotion.
+        promotions (list): The distinct promotions used by the rows.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty ProductTable.
+        """
+        self.name_bytes = array("B")
+        self.name_offsets = array("q", [0])
+        self.index = array("i", [EMPTY_SLOT]) * 8
+        self.kinds = array("b")
+        self.prices = array("d")
+        self.quantities = array("q")
+        self.active = array("b")
+        self.maximums = array("q")
+        self.promotion_ids = array("i")
+        self.promotions = []
+        self._promotion_ids = {}
+        self._size = 0
+        self._used_slots = 0
+        self._materialized_rows = {}
+        self._mapped = False
+
+
+    @classmethod
+    def from_columns(cls, name_bytes, name_offsets, index, kinds, prices, quantities, active, maximums,
+                     promotion_ids, promotions):
+        """
+        Creates a table over existing columns without copying them. The columns can be
+        arrays or memoryviews, e.g. of a memory mapped snapshot file.
+
+        Args:
+            name_bytes, name_offsets, index: The names and their hash index, see the class attributes.
+            kinds, prices, quantities, active, maximums, promotion_ids: The columns, see the class attributes.
+            promotions (list): The promotions referenced by promotion_ids.
+
+        Returns:
+            ProductTable: The new table.
+        """
+        table = cls()
+        for column_name, column in (("name_bytes", name_bytes), ("name_offsets", name_offsets),
+                                    ("index", index), ("kinds", kinds), ("prices", prices),
+                                    ("quantities", quantities), ("active", active),
+                                    ("maximums", maximums), ("promotion_ids", promotion_ids)):
+            setattr(table, column_name, column)
+        table.promotions = list(promotions)
+        table._size = len(kinds) - kinds.tobytes().count(REMOVED_BYTE)
+        table._used_slots = len(kinds)
+        table._promotion_ids = {id(promotion): number for number, promotion in enumerate(table.promotions)}
+        table._mapped = True
+        return table
+
+
+    def columns(self):
+        """
+        Returns the columns by name, the names and their index included.
+
+        Returns:
+            dict: Column name mapped to the array (or memoryview) holding it.
+        """
+        return {"name_bytes": self.name_bytes, "name_offsets": self.name_offsets, "index": self.index,
+                "kinds": self.kinds, "prices": self.prices, "quantities": self.quantities,
+                "active": self.active, "maximums": self.maximums, "promotion_ids": self.promotion_ids}
+
+
+    def _make_growable(self):
+        """
+        Copies columns that are memoryviews into arrays, so rows can be appended.
+        """
+        if not self._mapped:
+            return
+        for column_name, column in self.columns().items():
+            if isinstance(column, memoryview):
+                growable = array(column.format)
+                growable.frombytes(column.tobytes())
+                setattr(self, column_name, growable)
+        self._mapped = False
+
+
+    def __len__(self):
+        """
+        Returns the number of products in the table, removed rows excluded.
+        """
+        return self._size
+
+
+    def __contains__(self, name):
+        """
+        Checks if a product with the given name is in the table.
+        """
+        return self._find(str(name).encode("utf-8"))[1] >= 0
+
+
+    def _find(self, encoded):
+        """
+        Looks up a UTF-8 encoded name in the index.
+
+        Returns:
+            tuple: The slot and the row of the name, or the first empty slot of its
+                   probe sequence and -1 if no row has that name.
+        """
+        index = self.index
+        mask = len(index) - 1
+        name_bytes = self.name_bytes
+        name_offsets = self.name_offsets
+        slot = zlib.crc32(encoded) & mask
+        while True:
+            row = index[slot]
+            if row == EMPTY_SLOT:
+                return slot, -1
+            if row >= 0:
+                start = name_offsets[row]
+                end = name_offsets[row + 1]
+                if end - start == len(encoded) and name_bytes[start:end].tobytes() == encoded:
+                    return slot, row
+            slot = (slot + 1) & mask
+
+
+    def _rebuild_index(self, capacity):
+        """
+        Builds a new index with the given number of slots (a power of two) from the
+        rows that are not removed, dropping freed slots.
+        """
+        self.index = array("i", [EMPTY_SLOT]) * capacity
+        mask = capacity - 1
+        name_bytes = self.name_bytes
+        name_offsets = self.name_offsets
+        for row, kind in enumerate(self.kinds):
+            if kind == REMOVED:
+                continue
+            slot = zlib.crc32(name_bytes[name_offsets[row]:name_offsets[row + 1]]) & mask
+            while self.index[slot] != EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            self.index[slot] = row
+        self._used_slots = self._size
+
+
+    def name_of(self, row):
+        """
+        Returns the name of a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            str: The name of the product of the row, also for removed rows.
+        """
+        return self.name_bytes[self.name_offsets[row]:self.name_offsets[row + 1]].tobytes().decode("utf-8")
+
+
+    def row_of(self, name):
+        """
+        Returns the row of a product.
+
+        Args:
+            name (str): The name of the product.
+
+        Returns:
+            int: The row number.
+
+        Raises:
+            KeyError: If the product is not in the table.
+        """
+        row = self._materialized_rows.get(name)
+        if row is None:
+            row = self._find(str(name).encode("utf-8"))[1]
+            if row < 0:
+                raise KeyError(name)
+        return row
+
+
+    def iter_names(self):
+        """
+        Yields the names of all products in row order, removed rows excluded. The name
+        column is decoded at once; if it is pure ASCII, byte offsets are string offsets
+        and the names are sliced out of the decoded text.
+        """
+        data = self.name_bytes.tobytes()
+        offsets = self.name_offsets
+        text = data.decode("utf-8")
+        source = text if len(text) == len(data) else data
+        names = map(source.__getitem__, map(slice, offsets, offsets[1:]))
+        if source is data:
+            names = (name.decode("utf-8") for name in names)
+        yield from itertools.compress(names, map(REMOVED.__ne__, self.kinds))
+
+
+    def iter_prices(self):
+        """
+        Yields the prices of all products in the order of iter_names(), removed rows excluded.
+        """
+        yield from itertools.compress(self.prices, map(REMOVED.__ne__, self.kinds))
+
+
+    def promotion_id(self, promotion):
+        """
+        Returns the id of a promotion, registering it if it is new.
+
+        Args:
+            promotion (Promotion or None): The promotion.
+
+        Returns:
+            int: The index into promotions, or -1 for None.
+        """
+        if promotion is None:
+            return -1
+        key = id(promotion)
+        if key not in self._promotion_ids:
+            self._promotion_ids[key] = len(self.promotions)
+            self.promotions.append(promotion)
+        return self._promotion_ids[key]
+
+
+    def add(self, kind, name, price, quantity=0, maximum=-1, promotion=None, active=None):
+        """
+        Adds a row with the same validation as the product classes.
+
+        Args:
+            kind (int): PRODUCT, NON_STOCKED or LIMITED.
+            name (str): The name of the product. Must not be empty or already in the table.
+            price (float): The price of the product. Must not be negative.
+            quantity (int): The quantity of the product. Must not be negative. Ignored for NON_STOCKED.
+            maximum (int): The maximum per order. Only used for LIMITED.
+            promotion (Promotion or None): The promotion of the product.
+            active (bool or None): The active flag. Defaults to True if the product is in stock.
+
+        Returns:
+            int: The number of the new row.
+
+        Raises:
+            ValueError: If any of the values is invalid.
+        """
+        if kind not in KIND_CLASSES:
+            raise ValueError("Unknown product kind")
+        name = str(name)
+        if name == "":
+            raise ValueError("Name must not be empty")
+        self._make_growable()
+        if (self._used_slots + 1) * 2 > len(self.index):
+            capacity = len(self.index)
+            while capacity < (self._size + 1) * 4:
+                capacity *= 2
+            self._rebuild_index(capacity)
+        encoded = name.encode("utf-8")
+        slot, row = self._find(encoded)
+        if row >= 0:
+            raise ValueError(f"Product '{name}' is already in the table")
+        try:
+            price = float(price)
+        except (ValueError, TypeError):
+            raise ValueError("Price must be a valid number")
+        if price < 0:
+            raise ValueError("Price must be greater than 0")
+        if kind == NON_STOCKED:
+            quantity = 0
+        else:
+            try:
+                quantity = int(quantity)
+            except (ValueError, TypeError):
+                raise ValueError("Invalid quantity provided")
+            if quantity < 0:
+                raise ValueError("Quantity must not be negative")
+        if kind == LIMITED:
+            try:
+                maximum = int(maximum)
+            except (ValueError, TypeError):
+                raise ValueError("Maximum must be a valid number")
+            if maximum <= 0:
+                raise ValueError("Maximum must be greater than 0")
+        else:
+            maximum = -1
+        if active is None:
+            active = kind == NON_STOCKED or quantity > 0
+        row = len(self.kinds)
+        self.name_bytes.frombytes(encoded)
+        self.name_offsets.append(len(self.name_bytes))
+        self.kinds.append(kind)
+        self.prices.append(price)
+        self.quantities.append(quantity)
+        self.active.append(1 if active else 0)
+        self.maximums.append(maximum)
+        self.promotion_ids.append(self.promotion_id(promotion))
+        self.index[slot] = row
+        self._size += 1
+        self._used_slots += 1
+        return row
+
+
+    def add_product(self, product):
+        """
+        Adds a row holding the current state of a product object.
+
+        Args:
+            product: The product to store.
+
+        Returns:
+            int: The number of the new row.
+        """
+        kind = kind_of(product)
+        row = self.add(kind, product.name, product.price,
+                        quantity=product.get_quantity() if kind != NON_STOCKED else 0,
+                        maximum=product.get_maximum() if kind == LIMITED else -1,
+                        promotion=product.get_promotion(),
+                        active=product.is_active())
+        self._materialized_rows[product.name] = row
+        return row
+
+
+    def remove(self, name):
+        """
+        Removes a product. Its row stays in the arrays but is marked as REMOVED.
+
+        Args:
+            name (str): The name of the product.
+
+        Raises:
+            KeyError: If the product is not in the table.
+        """
+        slot, row = self._find(str(name).encode("utf-8"))
+        if row < 0:
+            raise KeyError(name)
+        self.index[slot] = FREED_SLOT
+        self._size -= 1
+        self._materialized_rows.pop(name, None)
+        self.kinds[row] = REMOVED
+        self.quantities[row] = 0
+        self.active[row] = 0
+
+
+    def materialize(self, name):
+        """
+        Builds a product object from a row.
+
+        Args:
+            name (str): The name of the product.
+
+        Returns:
+            Product: A new Product, NonStockedProduct or LimitedProduct with the state of the row.
+
+        Raises:
+            KeyError: If the product is not in the table.
+        """
+        row = self.row_of(name)
+        kind = self.kinds[row]
+        if kind == NON_STOCKED:
+            product = NonStockedProduct(name, self.prices[row])
+        elif kind == LIMITED:
+            product = LimitedProduct(name, self.prices[row], self.quantities[row], self.maximums[row])
+        else:
+            product = Product(name, self.prices[row], self.quantities[row])
+        product.active = bool(self.active[row])
+        promotion_id = self.promotion_ids[row]
+        if promotion_id >= 0:
+            product.promotion = self.promotions[promotion_id]
+        self._materialized_rows[name] = row
+        return product
+
+
+    def write_back(self, product, field, old_value, new_value):
+        """
+        Product observer that copies changes of a materialized product into its row.
+        """
+        row = self._materialized_rows.get(product.name)
+        if row is None:
+            return
+        if field == "quantity":
+            self.quantities[row] = new_value
+        elif field == "price":
+            self.prices[row] = new_value
+        elif field == "active":
+            self.active[row] = 1 if new_value else 0
+        elif field == "promotion":
+            self.promotion_ids[row] = self.promotion_id(new_value)
+
+
+    def get_type_counts(self):
+        """
+        Counts the rows per product class.
+
+        Returns:
+            dict: Product class name mapped to the number of rows of that kind.
+        """
+        kind_bytes = self.kinds.tobytes()
+        counts = {}
+        for kind, product_class in KIND_CLASSES.items():
+            count = kind_bytes.count(bytes([kind]))
+            if count:
+                counts[product_class.__name__] = count
+        return counts
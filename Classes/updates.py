@@ -0,0 +1,43 @@
+class UpdateSummary:
+    """
+    Outcome of a batch of stock, price and activation updates, see Store.apply_updates().
+
+    Attributes:
+        applied (int): The number of accepted updates.
+        products (int): The number of products that changed.
+        activated (int): The number of products that became active.
+        deactivated (int): The number of products that became inactive.
+        errors (list): (index, message) tuples of the rejected updates.
+        seconds (float): The time the batch took.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty UpdateSummary.
+        """
+        self.applied = 0
+        self.products = 0
+        self.activated = 0
+        self.deactivated = 0
+        self.errors = []
+        self.seconds = 0.0
+
+
+    def get_updates_per_second(self):
+        """
+        Calculates the throughput of the batch.
+
+        Returns:
+            float: Processed updates (applied and rejected) per second.
+        """
+        updates = self.applied + len(self.errors)
+        return updates / self.seconds if self.seconds else 0.0
+
+
+    def __str__(self):
+        """
+        Returns a one line summary of the batch.
+        """
+        return (f"Applied {self.applied} updates to {self.products} products "
+                f"({self.activated} activated, {self.deactivated} deactivated), "
+                f"{len(self.errors)} errors, {self.get_updates_per_second():.0f} updates/sec")
@@ -0,0 +1,18 @@
+import pytest
+
+
+class FakeClock:
+    """
+    Clock for tests: returns the time in now, which the test sets.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
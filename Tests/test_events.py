@@ -0,0 +1,51 @@
+import time
+from Classes import Store, Product
+from Classes.events import EventBus, STOCK_CHANGED, THRESHOLD_CROSSED, SOLD_OUT, DEACTIVATED, PRODUCT_ADDED
+
+
+def test_stock_threshold_and_sold_out_events_are_batched():
+    bose = Product("Bose", 10, 100)
+    store = Store([bose])
+    bus = EventBus(flush_interval=0)
+    received = []
+    alerts = []
+    bus.subscribe(received.extend)
+    bus.subscribe(alerts.extend, kinds=[THRESHOLD_CROSSED, SOLD_OUT])
+    bus.attach(store)
+    for threshold in (50, 10, 20):
+        bus.set_threshold(bose, threshold)
+    assert bus.get_thresholds(bose) == [10, 20, 50]
+
+    bose.buy(85)
+    assert received == []
+    bus.flush()
+    assert [event.threshold for event in alerts] == [20, 50]
+    bose.buy(15)
+    bose.set_quantity(30)
+    pixel = Product("Pixel", 50, 10)
+    store.add_product(pixel)
+    bus.flush()
+    kinds = [event.kind for event in received]
+    assert kinds == [STOCK_CHANGED, THRESHOLD_CROSSED, THRESHOLD_CROSSED,
+                     STOCK_CHANGED, THRESHOLD_CROSSED, SOLD_OUT, DEACTIVATED,
+                     STOCK_CHANGED, THRESHOLD_CROSSED, THRESHOLD_CROSSED, PRODUCT_ADDED]
+    assert [(event.old_value, event.new_value, event.threshold) for event in alerts[2:]] == \
+           [(15, 0, 10), (15, 0, None), (0, 30, 10), (0, 30, 20)]
+    bus.detach(store)
+    pixel.buy(1)
+    bus.close()
+    assert received[-1].kind == PRODUCT_ADDED
+
+
+def test_events_are_delivered_in_the_background():
+    bose = Product("Bose", 10, 100)
+    received = []
+    with EventBus(batch_size=2, flush_interval=10) as bus:
+        bus.subscribe(received.extend)
+        bus.watch(bose)
+        bose.buy(1)
+        bose.buy(1)
+        deadline = time.monotonic() + 5
+        while len(received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(received) == 2
@@ -0,0 +1,35 @@
+import pytest
+from Classes import Store, Product, PercentDiscount
+from Classes.history import OrderHistory
+
+
+def test_history_rolls_up_committed_orders(clock):
+    pixel = Product("Pixel", 500, 100)
+    bose = Product("Bose", 250, 100)
+    sale = PercentDiscount("10% off", 10)
+    bose.set_promotion(sale)
+    store = Store([pixel, bose])
+    history = OrderHistory(bucket_seconds=3600, clock=clock)
+    store.set_history(history)
+
+    store.order([(pixel, 2), (bose, 4)])
+    clock.now = 2 * 3600 + 5
+    store.order_batch([(pixel, 1), (pixel, 1)])
+    store.place_order([(pixel, 1000)])
+
+    assert len(history) == 3
+    assert history.get_order_count() == 2
+    assert list(history.sequences) == [1, 1, 2]
+    assert history.get_product_sales(pixel) == {"units": 4, "revenue": 2000, "lines": 2}
+    assert history.get_promotion_sales(sale) == {"units": 4, "revenue": 900, "lines": 1}
+    assert history.get_promotion_sales(None)["units"] == 4
+    assert history.get_sales_by_bucket() == [(0, 6, 1900), (7200, 2, 1000)]
+    assert history.get_sales_by_bucket(start=3600) == [(7200, 2, 1000)]
+    assert history.get_sales_by_bucket(end=7200, product=bose) == [(0, 4, 900)]
+    assert history.get_top_products(1, by="revenue") == [(pixel, 4, 2000)]
+    with pytest.raises(ValueError, match="Unknown ranking"):
+        history.get_top_products(by="profit")
+
+    store.order([(pixel, 1)])
+    assert history.get_product_sales(pixel)["units"] == 5
+    assert history.get_sales_by_bucket(product=pixel)[-1] == (7200, 3, 1500)
@@ -0,0 +1,61 @@
+from Classes import Store, Product, NonStockedProduct
+from Classes.journal import OrderJournal, read_journal, replay
+from Classes.snapshot import save_snapshot
+
+
+def make_store():
+    return Store([Product("Bose", 500, 200), NonStockedProduct("Windows License", 125)])
+
+
+def test_journal_groups_orders(tmp_path):
+    store = make_store()
+    path = tmp_path / "orders.journal"
+    journal = OrderJournal(path, batch_size=2, flush_interval=0)
+    store.set_journal(journal)
+    bose = store.get_product("Bose")
+    store.order([(bose, 1)])
+    assert list(read_journal(path)) == []
+    store.order([(bose, 2), (store.get_product("Windows License"), 1)])
+    assert list(read_journal(path)) == [(1, [("Bose", 1)]), (2, [("Bose", 2), ("Windows License", 1)])]
+    store.order([(bose, 3)])
+    journal.close()
+    assert [sequence for sequence, lines in read_journal(path)] == [1, 2, 3]
+
+
+def test_replay_applies_orders_after_snapshot(tmp_path):
+    store = make_store()
+    bose = store.get_product("Bose")
+    journal_path = tmp_path / "orders.journal"
+    snapshot_path = tmp_path / "store.snapshot"
+    with OrderJournal(journal_path, batch_size=10) as journal:
+        store.set_journal(journal)
+        store.order([(bose, 5)])
+        save_snapshot(store, snapshot_path)
+        store.order([(bose, 7)])
+        store.order([(bose, 8)])
+    with open(journal_path, "a") as file:
+        file.write('[4, [["Bose"')
+    restored = replay(snapshot_path, journal_path)
+    assert restored.get_product("Bose").get_quantity() == 180
+    assert restored.get_order_sequence() == 3
+
+
+def test_reopened_journal_cuts_torn_tail(tmp_path):
+    store = make_store()
+    bose = store.get_product("Bose")
+    journal_path = tmp_path / "orders.journal"
+    snapshot_path = tmp_path / "store.snapshot"
+    save_snapshot(store, snapshot_path)
+    with OrderJournal(journal_path, flush_interval=0) as journal:
+        store.set_journal(journal)
+        store.order([(bose, 1)])
+    with open(journal_path, "a") as file:
+        file.write('[2, [["Bose", 1')
+    store = replay(snapshot_path, journal_path)
+    with OrderJournal(journal_path, flush_interval=0) as journal:
+        store.set_journal(journal)
+        bose = store.get_product("Bose")
+        store.order([(bose, 2)])
+        store.order([(bose, 3)])
+    assert [sequence for sequence, lines in read_journal(journal_path)] == [1, 2, 3]
+    assert replay(snapshot_path, journal_path).get_product("Bose").get_quantity() == 194
@@ -0,0 +1,40 @@
+import pytest
+from Classes import Store, Product, LimitedProduct
+from Classes.limits import PurchaseLimiter
+
+
+def test_order_path_enforces_maximum_per_order():
+    shipping = LimitedProduct("Shipping", 10, 250, maximum=2)
+    store = Store([shipping])
+    result = store.place_order([(shipping, 1), (shipping, 2)])
+    assert result.failures[0][2] == "Quantity exceeds the maximum of 2 per order"
+    with pytest.raises(ValueError, match="maximum of 2"):
+        store.order_batch([(shipping, 2), (shipping, 1)])
+    assert shipping.get_quantity() == 250
+
+
+def test_customer_limit_slides_with_the_window(clock):
+    pixel = Product("Pixel", 500, 100)
+    bose = Product("Bose", 250, 100)
+    store = Store([pixel, bose])
+    limiter = PurchaseLimiter(window=24 * 3600, buckets=24, clock=clock)
+    limiter.set_limit(pixel, 2)
+    store.set_limiter(limiter)
+
+    assert store.order([(pixel, 1), (bose, 10)], customer="alice") == 3000
+    clock.now = 12 * 3600
+    store.order([(pixel, 1)], customer="alice")
+    result = store.place_order([(pixel, 1)], customer="alice")
+    assert result.failures[0][2] == "Limit of 2 per customer and window reached"
+    store.order([(pixel, 2)], customer="bob")
+    store.order([(pixel, 5)])
+    assert limiter.get_bought("alice", pixel) == 2
+
+    clock.now = 24 * 3600
+    assert limiter.get_bought("alice", pixel) == 1
+    store.order([(pixel, 1)], customer="alice")
+    clock.now = 72 * 3600
+    assert limiter.get_bought("alice", pixel) == 0
+    store.order([(pixel, 2)], customer="carol")
+    assert len(limiter) == 1
+    assert pixel.get_quantity() == 100 - 12
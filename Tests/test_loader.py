@@ -0,0 +1,68 @@
+from Classes import Store, LimitedProduct, NonStockedProduct, PercentDiscount
+from Classes.loader import load_catalog, load_table
+
+
+CSV_CATALOG = """type,name,price,quantity,maximum,promotion,promotion_name,percent
+product,MacBook Air M2,1450,100,,second_half_price,Second Half price!,
+non_stocked,Windows License,125,,,percent_discount,30% off!,30
+limited,Shipping,10,250,1,,,
+product,,10,5,,,,
+product,Pixel,-1,5,,,,
+product,MacBook Air M2,1450,100,,,,
+product,Bose,250,500,,percent_discount,30% off!,30
+"""
+
+
+def test_load_csv_catalog_reports_bad_rows(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text(CSV_CATALOG)
+    store = Store()
+    report = load_catalog(path, store)
+    assert report.loaded == 4
+    assert report.errors == [(5, "Name must not be empty"),
+                             (6, "Price must be greater than 0"),
+                             (7, "Product 'MacBook Air M2' is already in the store")]
+    assert isinstance(store.get_product("Shipping"), LimitedProduct)
+    assert isinstance(store.get_product("Windows License"), NonStockedProduct)
+    discount = store.get_product("Bose").get_promotion()
+    assert isinstance(discount, PercentDiscount) and discount.percent == 30
+    assert store.get_product("Windows License").get_promotion() is discount
+
+
+def test_load_jsonl_catalog(tmp_path):
+    path = tmp_path / "catalog.jsonl"
+    path.write_text('{"name": "Bose", "price": 250, "quantity": 500, "promotion": "third_one_free"}\n'
+                    'not json\n'
+                    '{"type": "limited", "name": "Shipping", "price": 10, "quantity": 250}\n')
+    store = Store()
+    report = load_catalog(path, store)
+    assert report.loaded == 1
+    assert [line for line, message in report.errors] == [2, 3]
+    assert store.get_product("Bose").buy(3) == 500
+
+
+def test_load_table_matches_load_catalog(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text(CSV_CATALOG)
+    table, report = load_table(path)
+    assert report.loaded == 4
+    assert report.errors[:2] == [(5, "Name must not be empty"), (6, "Price must be greater than 0")]
+    store = Store(table=table)
+    eager = Store()
+    load_catalog(path, eager)
+    assert store.get_total_quantity() == eager.get_total_quantity()
+    assert store.get_type_counts() == eager.get_type_counts()
+    shipping = store.get_product("Shipping")
+    assert isinstance(shipping, LimitedProduct) and shipping.get_maximum() == 1
+    assert store.get_product("Bose").get_promotion() is store.get_product("Windows License").get_promotion()
+
+
+def test_load_table_rejects_zero_maximum(tmp_path):
+    path = tmp_path / "catalog.csv"
+    path.write_text("type,name,price,quantity,maximum\nlimited,Ship,10,5,0\nlimited,Post,5,5,2\n")
+    table, report = load_table(path)
+    assert report.loaded == 1
+    assert report.errors == [(2, "Maximum must be greater than 0")]
+    store = Store(table=table)
+    assert store.get_product("Ship") is None
+    assert store.search(prefix="P")[0].get_maximum() == 2
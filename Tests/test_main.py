@@ -0,0 +1,63 @@
+import io
+
+import main
+from Classes import Store, Product
+
+
+def make_store():
+    return Store([Product("Bose QuietComfort Earbuds", 250, 500),
+                  Product("Google Pixel 7", 500, 250),
+                  Product("Google Pixel 8", 700, 100),
+                  Product("MacBook Air M2", 1450, 100)])
+
+
+def test_find_product_by_unique_prefix():
+    store = make_store()
+    assert main.find_product(store, "Google Pixel 7") is store.get_product("Google Pixel 7")
+    assert main.find_product(store, "mac") is store.get_product("MacBook Air M2")
+    assert main.find_product(store, "Google") is None
+    assert main.find_product(store, "Sony") is None
+
+
+def test_listing_pages_until_stopped(monkeypatch):
+    store = make_store()
+    answers = iter(["", "stop"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    output = io.StringIO()
+    main.list_all_products_in_store(store, page_size=1, output=output)
+    lines = output.getvalue().splitlines()
+    assert lines[0] == lines[-1] == "------"
+    assert [line.split(",")[0] for line in lines[1:-1]] == ["Bose QuietComfort Earbuds", "Google Pixel 7"]
+
+    monkeypatch.setattr("builtins.input", lambda prompt="": "")
+    output = io.StringIO()
+    main.list_all_products_in_store(store, page_size=3, output=output)
+    assert len(output.getvalue().splitlines()) == 6
+
+
+def test_show_cache_drops_changed_products():
+    store = make_store()
+    bose = store.get_product("Bose QuietComfort Earbuds")
+    cache = main.get_show_cache(store)
+    assert main.get_show_cache(store) is cache
+    shown = main.show_product(bose, cache)
+    assert main.show_product(bose, cache) is shown
+    bose.set_quantity(400)
+    assert bose not in cache
+    assert "400" in main.show_product(bose, cache)
+    bose.set_price(200)
+    assert "200" in main.show_product(bose, cache)
+
+
+def test_order_offers_only_unreserved_stock_and_reports_failures(monkeypatch, capsys):
+    from Classes.reservations import ReservationManager
+    store = make_store()
+    pixel = store.get_product("Google Pixel 8")
+    ReservationManager(store).reserve("cart-1", [(pixel, 95)])
+    answers = iter(["Google Pixel 8", "6", "Google Pixel 8", "5", "Google Pixel 8", "5", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    main.make_an_order(store)
+    output = capsys.readouterr().out
+    assert "Just 5 left in stock. Product was not added." in output
+    assert "Order failed: Quantity is too high. Nothing was bought." in output
+    assert pixel.get_quantity() == 100
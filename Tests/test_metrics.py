@@ -0,0 +1,60 @@
+import json
+import pytest
+from Classes import Store, Product, LimitedProduct, ThirdOneFree
+from Classes import metrics
+
+
+def test_instrumentation_records_per_type_and_is_removed_on_disable(tmp_path):
+    original_order = Store.order
+    bose = Product("Bose", 10, 100)
+    bose.set_promotion(ThirdOneFree("Third One Free!"))
+    pixel = LimitedProduct("Pixel", 50, 10, maximum=5)
+    store = Store([bose, pixel])
+    recorder = metrics.enable()
+    try:
+        with pytest.raises(ValueError):
+            metrics.enable()
+        assert store.order([(bose, 3), (pixel, 1)]) == 70
+        with pytest.raises(ValueError):
+            store.order([(bose, 1000)])
+    finally:
+        assert metrics.disable() is recorder
+    assert Store.order is original_order
+    assert metrics.get_metrics() is None
+    assert recorder.get_histogram("store_order").count == 2
+    assert recorder.get_errors("store_order") == 1
+    assert recorder.get_histogram("product_buy", ("product_type", "LimitedProduct")).count == 1
+    assert recorder.get_histogram("promotion_apply", ("promotion_type", "ThirdOneFree")).count >= 1
+    store.order([(bose, 1)])
+    assert recorder.get_histogram("store_order").count == 2
+
+    recorder.export(str(tmp_path / "metrics.prom"))
+    text = (tmp_path / "metrics.prom").read_text()
+    assert "# TYPE bestbuy_store_order_seconds histogram" in text
+    assert 'bestbuy_product_buy_seconds_count{product_type="Product"} 1' in text
+    assert 'bestbuy_store_order_seconds_bucket{le="+Inf"} 2' in text
+    assert "bestbuy_store_order_errors_total 1" in text
+    recorder.export(str(tmp_path / "metrics.json"))
+    data = json.loads((tmp_path / "metrics.json").read_text())
+    assert {"metric": "store_order", "labels": {}, "count": 1} in data["errors"]
+
+
+def test_instrumentation_covers_batches_cents_and_pricing_engine():
+    from Classes.pricing import PromotionEngine, SpendThresholdRule
+    bose = Product("Bose", 10, 100)
+    cents_store = Store([Product("Pixel", 0.1, 100)], use_cents=True)
+    engine_store = Store([Product("MacBook", 1000, 100)])
+    engine = PromotionEngine()
+    engine.add_rule(SpendThresholdRule("Big spender", threshold=2000, percent=5))
+    engine_store.set_pricing(engine)
+    recorder = metrics.enable()
+    try:
+        assert Store([bose]).order_batch([(bose, 2), (bose, 1)]) == 30
+        assert cents_store.order([(cents_store.get_product("Pixel"), 3)]) == 30
+        assert engine_store.order([(engine_store.get_product("MacBook"), 3)]) == pytest.approx(2850)
+    finally:
+        metrics.disable()
+    assert recorder.get_histogram("store_order_batch").count == 1
+    assert recorder.get_histogram("product_quote_cents", ("product_type", "Product")).count == 1
+    assert recorder.get_histogram("pricing_line").count == 1
+    assert recorder.get_histogram("pricing_cart_discounts").count == 1
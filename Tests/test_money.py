@@ -0,0 +1,39 @@
+from Classes import Store, Product, PercentDiscount, SecondHalfPrice, ThirdOneFree
+from Classes.money import to_cents, divide_half_up
+
+
+def test_to_cents_rounds_half_up():
+    assert to_cents(0.29) == 29
+    assert to_cents(1.005) == 101
+    assert to_cents("19.994") == 1999
+    assert divide_half_up(5, 2) == 3
+    assert divide_half_up(7, 4) == 2
+
+
+def test_promotions_in_cents():
+    product = Product("Pen", 0.99, 1000)
+    assert product.price_cents == 99
+    assert PercentDiscount("30% off!", percent=30).apply_promotion_cents(99, 3) == 208
+    assert SecondHalfPrice("Second Half price!").apply_promotion_cents(99, 3) == 248
+    assert ThirdOneFree("Third One Free!").apply_promotion_cents(99, 7) == 495
+
+
+def test_cents_store_sums_exactly():
+    pen = Product("Pen", 0.1, 1000)
+    store = Store([pen], use_cents=True)
+    total = 0
+    for _ in range(10):
+        total += store.order([(pen, 3)])
+    assert total == 300
+    assert isinstance(total, int)
+    pen.price = 0.15
+    assert store.quote([(pen, 1)]) == 15
+    assert store.order_batch([(pen, 1), (pen, 2)]) == 45
+
+
+def test_price_cents_follow_price_changes():
+    product = Product("Pen", 0.99, 1000)
+    assert product.quote_cents(2) == 198
+    product.set_price(1.005)
+    assert product.price_cents == 101
+    assert product.quote_cents(2) == 202
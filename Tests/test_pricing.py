@@ -0,0 +1,61 @@
+import pytest
+from Classes import Product, PercentDiscount, SecondHalfPrice, ThirdOneFree
+from Classes.pricing import PromotionEngine, PromotionRule, BundleRule, SpendThresholdRule
+
+
+def test_product_promotion_matches_per_product_path():
+    macbook = Product("MacBook", 1000, 100)
+    macbook.set_promotion(SecondHalfPrice("Second Half price!"))
+    engine = PromotionEngine()
+    assert engine.price_cart([(macbook, 3), (macbook, 2)]) == 2500 + 1500
+
+
+def test_stacked_and_exclusive_rules():
+    macbook, bose = Product("MacBook", 1000, 100), Product("Bose", 100, 100)
+    macbook.set_promotion(ThirdOneFree("Third One Free!"))
+    engine = PromotionEngine()
+    ten_percent = PromotionRule(PercentDiscount("10% off!", percent=10), [macbook, bose])
+    engine.add_rule(ten_percent)
+    assert engine.price_cart([(macbook, 3), (bose, 1)]) == pytest.approx(2000 * 0.9 + 90)
+    engine.add_rule(PromotionRule(PercentDiscount("50% off!", percent=50), [bose], priority=1, exclusive=True))
+    assert engine.price_cart([(bose, 2)]) == pytest.approx(100)
+    engine.remove_rule(ten_percent)
+    assert engine.price_cart([(macbook, 3)]) == pytest.approx(2000)
+
+
+def test_cart_rules():
+    macbook, bose = Product("MacBook", 1000, 100), Product("Bose", 100, 100)
+    engine = PromotionEngine()
+    engine.add_rule(BundleRule("Bundle", [macbook, bose], percent=10, priority=2))
+    engine.add_rule(SpendThresholdRule("Big spender", threshold=2000, percent=5, priority=1))
+    assert engine.price_cart([(macbook, 1)]) == 1000
+    assert engine.price_cart([(macbook, 1), (bose, 1)]) == pytest.approx(990)
+    assert engine.price_cart([(macbook, 2), (bose, 1)]) == pytest.approx(2100 * 0.9)
+    assert engine.price_cart([(macbook, 3), (bose, 1)]) == pytest.approx(3100 * 0.9 * 0.95)
+
+
+def test_plan_is_reused_until_rules_change():
+    engine = PromotionEngine()
+    plan = engine.get_plan()
+    assert engine.get_plan() is plan
+    engine.add_rule(SpendThresholdRule("Big spender", threshold=2000, percent=5))
+    assert engine.get_plan() is not plan
+
+
+def test_store_orders_are_priced_by_the_engine():
+    from Classes import Store
+    macbook, bose = Product("MacBook", 1000, 100), Product("Bose", 100, 100)
+    store = Store([macbook, bose])
+    engine = PromotionEngine()
+    engine.add_rule(PromotionRule(PercentDiscount("10% off!", percent=10), [bose]))
+    engine.add_rule(BundleRule("Bundle", [macbook, bose], percent=10))
+    store.set_pricing(engine)
+    assert store.quote([(macbook, 1), (bose, 1)]) == pytest.approx(981)
+    result = store.place_order([(macbook, 1), (bose, 1)])
+    assert result.discounts == [("Bundle", pytest.approx(109))]
+    assert result.total == pytest.approx(981)
+    macbook.set_promotion(ThirdOneFree("Third One Free!"))
+    assert store.order([(macbook, 3)]) == pytest.approx(2000)
+    assert store.order_batch([(macbook, 3), (bose, 1)]) == pytest.approx((2000 + 90) * 0.9)
+    store.set_pricing(None)
+    assert store.order([(bose, 1)]) == 100
@@ -1,5 +1,5 @@
 import pytest
-from Classes import Product
+from Classes import Product, LimitedProduct
 
 
 def test_create_product():
@@ -33,3 +33,12 @@ def test_bought_quantity_too_big():
     bose = Product("Bose", 500, 200)
     with pytest.raises(ValueError, match="Quantity is too high"):
         bose.buy(300)
+
+
+def test_limited_product_enforces_maximum():
+    with pytest.raises(ValueError, match="Maximum must be greater than 0"):
+        LimitedProduct("Shipping", 10, 250, maximum=0)
+    shipping = LimitedProduct("Shipping", 10, 250, maximum=1)
+    with pytest.raises(ValueError, match="maximum of 1 per order"):
+        shipping.buy(2)
+    assert shipping.buy(1) == 10
@@ -0,0 +1,17 @@
+from Classes import Product
+from Classes.quotes import QuoteCache
+
+
+def test_least_recently_used_quote_is_evicted():
+    cache = QuoteCache(maxsize=2)
+    bose = Product("Bose", 10, 100)
+    cache.quote(bose, 1)
+    cache.quote(bose, 2)
+    cache.quote(bose, 1)
+    cache.quote(bose, 3)
+    assert len(cache) == 2
+    assert cache.get_stats()["evictions"] == 1
+    cache.quote(bose, 1)
+    assert cache.get_stats()["hits"] == 2
+    cache.invalidate(bose)
+    assert len(cache) == 0
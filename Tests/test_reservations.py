@@ -0,0 +1,102 @@
+import pytest
+from Classes import Store, Product
+from Classes.reservations import ReservationManager
+
+
+def test_reserved_units_cannot_be_bought_by_others():
+    store = Store([Product("Bose", 500, 10)])
+    bose = store.get_product("Bose")
+    manager = ReservationManager(store, default_ttl=60)
+    manager.reserve("cart-1", [(bose, 8)])
+    assert bose.get_available_quantity() == 2
+    assert store.get_reserved_quantity() == 8
+    with pytest.raises(ValueError, match="Quantity is too high"):
+        store.order([(bose, 3)])
+    with pytest.raises(ValueError):
+        manager.reserve("cart-2", [(bose, 3)])
+    result = manager.checkout("cart-1")
+    assert result.total == 4000
+    assert bose.get_quantity() == 2
+    assert store.get_reserved_quantity() == 0
+    assert store.check_consistency()
+
+
+def test_reservation_is_all_or_nothing():
+    store = Store([Product("Bose", 500, 10), Product("Pixel", 300, 5)])
+    bose, pixel = store.get_product("Bose"), store.get_product("Pixel")
+    manager = ReservationManager(store)
+    with pytest.raises(ValueError):
+        manager.reserve("cart-1", [(bose, 2), (pixel, 6)])
+    assert bose.get_reserved() == 0
+    assert manager.get_reservation("cart-1") is None
+
+
+def test_stale_reservations_expire(clock):
+    store = Store([Product("Bose", 500, 10)])
+    bose = store.get_product("Bose")
+    manager = ReservationManager(store, default_ttl=60, clock=clock)
+    manager.reserve("cart-1", [(bose, 4)])
+    manager.reserve("cart-2", [(bose, 4)], ttl=120)
+    clock.now = 61
+    assert manager.expire() == 1
+    assert bose.get_reserved() == 4
+    with pytest.raises(ValueError, match="no active reservation"):
+        manager.checkout("cart-1")
+    clock.now = 100
+    assert manager.checkout("cart-2").is_successful()
+    assert bose.get_quantity() == 6
+
+
+def test_orders_expire_stale_reservations(clock):
+    store = Store([Product("Bose", 500, 5)])
+    bose = store.get_product("Bose")
+    manager = ReservationManager(store, clock=clock)
+    manager.reserve("cart-1", [(bose, 5)], ttl=10)
+    assert not store.place_order([(bose, 1)]).is_successful()
+    clock.now = 1000
+    assert store.place_order([(bose, 1)]).is_successful()
+    assert bose.get_reserved() == 0
+    assert len(manager) == 0
+    assert store.order_batch([(bose, 4)]) == 2000
+
+
+def test_failed_checkout_keeps_the_reservation():
+    from Classes import PercentDiscount
+
+    class BrokenPromotion(PercentDiscount):
+        def apply_promotion(self, product, quantity):
+            raise ValueError("Promotion failed")
+
+    store = Store([Product("Bose", 500, 10), Product("Pixel", 300, 5)], thread_safe=True)
+    bose, pixel = store.get_product("Bose"), store.get_product("Pixel")
+    manager = ReservationManager(store)
+    manager.reserve("cart-1", [(bose, 4), (pixel, 2)])
+    pixel.set_promotion(BrokenPromotion("Broken", 10))
+    assert not manager.checkout("cart-1").is_successful()
+    assert manager.get_reservation("cart-1") is not None
+    assert (bose.get_quantity(), bose.get_reserved()) == (10, 4)
+    assert (pixel.get_quantity(), pixel.get_reserved()) == (5, 2)
+    pixel.set_promotion(None)
+    assert manager.checkout("cart-1").total == 4 * 500 + 2 * 300
+    assert manager.get_reservation("cart-1") is None
+    assert store.get_reserved_quantity() == 0
+    assert store.check_consistency()
+
+
+def test_checkout_does_not_expire_while_products_are_locked(clock):
+    reads = []
+
+    def counting_clock():
+        reads.append(clock.now)
+        return clock.now
+
+    store = Store([Product("Bose", 500, 10), Product("Pixel", 300, 5)], thread_safe=True)
+    bose, pixel = store.get_product("Bose"), store.get_product("Pixel")
+    manager = ReservationManager(store, clock=counting_clock)
+    manager.reserve("cart-1", [(bose, 4)], ttl=100)
+    manager.reserve("cart-2", [(pixel, 2)], ttl=10)
+    reads.clear()
+    clock.now = 50
+    assert manager.checkout("cart-1").is_successful()
+    assert reads == [50]
+    assert pixel.get_reserved() == 0
@@ -0,0 +1,53 @@
+import pytest
+from Classes import Store, Product, NonStockedProduct, ProductTable
+
+
+def make_store():
+    return Store([Product("MacBook Air M2", 1450, 100),
+                  Product("Bose QuietComfort Earbuds", 250, 500),
+                  Product("Google Pixel 7", 500, 0),
+                  NonStockedProduct("Windows License", 125),
+                  Product("Macro Lens", 300, 5)])
+
+
+def test_prefix_substring_price_and_stock_filters():
+    store = make_store()
+    assert [product.name for product in store.search(prefix="mac")] == ["MacBook Air M2", "Macro Lens"]
+    assert [product.name for product in store.search(text="PIXEL")] == ["Google Pixel 7"]
+    assert [product.name for product in store.search(text="o", in_stock=True, limit=2, offset=1)] == \
+           ["MacBook Air M2", "Macro Lens"]
+    assert [product.name for product in store.search(min_price=200, max_price=500, order_by="price")] == \
+           ["Bose QuietComfort Earbuds", "Macro Lens", "Google Pixel 7"]
+    assert store.search(text="lens", max_price=100) == []
+    with pytest.raises(ValueError):
+        store.search(limit=0)
+
+
+def test_index_follows_store_changes():
+    store = make_store()
+    assert store.search(prefix="sam") == []
+    samsung = Product("Samsung Galaxy", 800, 10)
+    store.add_product(samsung)
+    store.get_product("Macro Lens").price = 900
+    assert [product.name for product in store.search(min_price=800, order_by="price")] == \
+           ["Samsung Galaxy", "Macro Lens", "MacBook Air M2"]
+    store.remove_product(samsung)
+    assert store.search(prefix="sam") == []
+
+
+class CountingTable(ProductTable):
+    materialized = 0
+
+    def materialize(self, name):
+        self.materialized += 1
+        return super().materialize(name)
+
+
+def test_table_backed_store_only_materializes_the_page():
+    table = CountingTable()
+    for number in range(1000):
+        table.add_product(Product(f"SKU-{number}", number + 1, 10))
+    store = Store(table=table)
+    page = store.search(prefix="sku-99", order_by="name", limit=3)
+    assert [product.name for product in page] == ["SKU-99", "SKU-990", "SKU-991"]
+    assert table.materialized == 3
@@ -0,0 +1,65 @@
+import asyncio
+
+from Classes import Store, Product, OrderService
+
+
+def test_service_places_orders_and_counts_them():
+    bose = Product("Bose", 500, 10)
+    store = Store([bose])
+
+    async def run():
+        service = OrderService(store, workers=2, queue_size=2)
+        await service.start()
+        results = await asyncio.gather(*(service.submit([(bose, 3)]) for _ in range(4)))
+        await service.stop()
+        return service, results
+
+    service, results = asyncio.run(run())
+    assert [result.is_successful() for result in results] == [True, True, True, False]
+    assert bose.get_quantity() == 1
+    stats = service.get_stats()
+    assert (stats["submitted"], stats["completed"], stats["failed"]) == (4, 3, 1)
+
+
+def test_try_submit_rejects_when_queue_is_full():
+    store = Store([Product("Bose", 500, 10)])
+
+    async def run():
+        service = OrderService(store, workers=1, queue_size=1)
+        await service.start()
+        first = service.try_submit([(store.get_product("Bose"), 1)])
+        second = service.try_submit([(store.get_product("Bose"), 1)])
+        await first
+        await service.stop()
+        return service, second
+
+    service, second = asyncio.run(run())
+    assert second is None
+    assert service.get_stats()["rejected"] == 1
+
+
+def test_worker_survives_unexpected_errors():
+    from Classes import PercentDiscount
+
+    class DividingPromotion(PercentDiscount):
+        def apply_promotion(self, product, quantity):
+            return 1 / 0
+
+    broken, bose = Product("Broken", 10, 10), Product("Bose", 500, 10)
+    broken.set_promotion(DividingPromotion("Broken", 10))
+    store = Store([broken, bose])
+
+    async def run():
+        service = OrderService(store, workers=1)
+        await service.start()
+        failed = service.submit([(broken, 1)])
+        succeeded = service.submit([(bose, 1)])
+        outcome = await asyncio.gather(failed, succeeded, return_exceptions=True)
+        await service.stop()
+        return service, outcome
+
+    service, (error, result) = asyncio.run(run())
+    assert isinstance(error, ZeroDivisionError)
+    assert result.is_successful()
+    assert broken.get_quantity() == 10
+    assert (service.get_stats()["completed"], service.get_stats()["failed"]) == (1, 1)
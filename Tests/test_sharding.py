@@ -0,0 +1,71 @@
+import pytest
+from Classes import Product, NonStockedProduct, ThirdOneFree
+from Classes.sharding import ShardedStore
+
+
+def make_products():
+    products = [Product(f"SKU-{number}", 10, 5) for number in range(20)]
+    products[0].set_promotion(ThirdOneFree("Third One Free!"))
+    products.append(NonStockedProduct("Windows License", 125))
+    return products
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_orders_are_routed_and_totals_aggregated(processes):
+    with ShardedStore(shard_count=3, processes=processes) as store:
+        store.add_products(make_products())
+        assert store.get_stats()["total_quantity"] == 100
+        assert len({store.get_shard(f"SKU-{number}") for number in range(20)}) > 1
+        assert store.order([("SKU-0", 3), ("SKU-7", 2), ("Windows License", 1)]) == 20 + 20 + 125
+        assert store.get_stats()["total_quantity"] == 95
+
+
+def test_failed_order_is_undone_on_every_shard():
+    with ShardedStore(shard_count=4, processes=False) as store:
+        store.add_products(make_products())
+        names = [f"SKU-{number}" for number in range(20)]
+        other = next(name for name in names if store.get_shard(name) != store.get_shard("SKU-1"))
+        with pytest.raises(ValueError, match="Quantity is too high"):
+            store.order([("SKU-1", 5), (other, 6)])
+        assert store.get_stats()["total_quantity"] == 100
+        assert store.get_stats()["active_count"] == 21
+        results = store.place_orders([[("SKU-1", 5)], [("Unknown", 1)]])
+        assert results == [(50, None), (None, "Unknown product 'Unknown'")]
+
+
+class UnnamedPromotion(ThirdOneFree):
+    kind = None
+
+
+def test_failed_add_leaves_no_products_behind():
+    with ShardedStore(shard_count=2, processes=False) as store:
+        broken = Product("Y", 10, 5)
+        broken.set_promotion(UnnamedPromotion("Custom"))
+        with pytest.raises(ValueError, match="cannot be written"):
+            store.add_products([Product("X", 10, 5), broken])
+        assert store.get_shard("X") is None
+        store.add_products([Product("X", 10, 5)])
+        assert store.order([("X", 1)]) == 10
+
+
+def test_undo_keeps_inactive_products_inactive():
+    with ShardedStore(shard_count=4, processes=False) as store:
+        hidden = Product("SKU-1", 10, 5)
+        hidden.deactivate()
+        store.add_products([hidden] + make_products()[2:])
+        other = next(f"SKU-{number}" for number in range(2, 20)
+                     if store.get_shard(f"SKU-{number}") != store.get_shard("SKU-1"))
+        with pytest.raises(ValueError, match="Quantity is too high"):
+            store.order([("SKU-1", 2), (other, 6)])
+        assert store.get_stats()["total_quantity"] == 95
+        assert store.get_stats()["active_count"] == 19
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_cents_totals_stay_integers(processes):
+    with ShardedStore(shard_count=3, processes=processes, use_cents=True) as store:
+        store.add_products([Product("Bose", 9.99, 10), Product("Pixel", 0.1, 10), Product("Cable", 0.2, 10)])
+        total = store.order([("Bose", 1), ("Pixel", 1), ("Cable", 1)])
+        assert total == 1029 and isinstance(total, int)
+        assert store.place_orders([[]]) == [(0, None)]
+        assert isinstance(store.place_orders([[]])[0][0], int)
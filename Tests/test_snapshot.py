@@ -0,0 +1,42 @@
+from Classes import Store, Product, NonStockedProduct, LimitedProduct, PercentDiscount, ThirdOneFree
+from Classes.snapshot import save_snapshot, load_snapshot
+
+
+def make_store():
+    products = [Product("MacBook Air M2", 1450, 100),
+                NonStockedProduct("Windows License", 125),
+                LimitedProduct("Shipping", 10, 250, maximum=1),
+                Product("Google Pixel 7", 500, 250)]
+    products[0].set_promotion(ThirdOneFree("Third One Free!"))
+    products[1].set_promotion(PercentDiscount("30% off!", percent=30))
+    products[3].deactivate()
+    return Store(products)
+
+
+def test_snapshot_round_trip(tmp_path):
+    store = make_store()
+    path = tmp_path / "store.snapshot"
+    save_snapshot(store, path)
+    restored = load_snapshot(path)
+    assert [product.show() for product in restored.list_of_products] == \
+           [product.show() for product in store.list_of_products]
+    assert [product.is_active() for product in restored.list_of_products] == [True, True, True, False]
+    assert restored.get_product("Shipping").get_maximum() == 1
+    assert restored.get_total_quantity() == store.get_total_quantity()
+    assert restored.check_consistency()
+
+
+def test_restored_store_is_usable_and_file_unchanged(tmp_path):
+    path = tmp_path / "store.snapshot"
+    save_snapshot(make_store(), path)
+    restored = load_snapshot(path)
+    assert restored.order([(restored.get_product("MacBook Air M2"), 3)]) == 2900
+    restored.remove_product(restored.get_product("Shipping"))
+    restored.add_product(Product("Bose", 250, 500))
+    second_path = tmp_path / "second.snapshot"
+    save_snapshot(restored, second_path)
+    again = load_snapshot(second_path)
+    assert again.get_product("MacBook Air M2").get_quantity() == 97
+    assert again.get_product("Shipping") is None
+    assert again.get_product("Bose").get_quantity() == 500
+    assert load_snapshot(path).get_product("MacBook Air M2").get_quantity() == 100
@@ -0,0 +1,284 @@
+import sys
+
+import pytest
+from Classes import Store, Product, NonStockedProduct, PercentDiscount
+from Classes.limits import PurchaseLimiter
+
+
+def make_store():
+    return Store([Product("Bose", 500, 200),
+                  Product("MacBook", 1450, 100),
+                  NonStockedProduct("Windows License", 125)])
+
+
+def test_get_product_by_name():
+    store = make_store()
+    assert store.get_product("MacBook").price == 1450
+    assert store.get_product("Unknown") is None
+
+
+def test_add_duplicate_name_raises():
+    store = make_store()
+    with pytest.raises(ValueError, match="already in the store"):
+        store.add_product(Product("Bose", 10, 1))
+
+
+def test_remove_product():
+    store = make_store()
+    bose = store.get_product("Bose")
+    store.remove_product(bose)
+    assert store.get_product("Bose") is None
+    assert bose not in store.get_all_products()
+    with pytest.raises(ValueError):
+        store.remove_product(bose)
+
+
+def test_active_index_follows_product_state():
+    store = make_store()
+    bose = store.get_product("Bose")
+    bose.set_quantity(0)
+    assert bose not in store.get_all_products()
+    bose.set_quantity(5)
+    bose.activate()
+    assert store.get_all_products() == store.list_of_products
+    bose.deactivate()
+    assert bose not in store.get_all_products()
+    assert bose in store.list_of_products
+
+
+def test_running_totals_follow_changes():
+    store = make_store()
+    assert store.get_total_quantity() == 300
+    assert store.get_total_value() == 500 * 200 + 1450 * 100
+    assert store.get_type_counts() == {"Product": 2, "NonStockedProduct": 1}
+    bose = store.get_product("Bose")
+    bose.buy(50)
+    bose.price = 400
+    assert store.get_total_quantity() == 250
+    assert store.get_total_value() == 400 * 150 + 1450 * 100
+    store.remove_product(store.get_product("MacBook"))
+    bose.set_quantity(0)
+    assert store.get_total_quantity() == 0
+    assert store.get_active_count() == 1
+    assert store.check_consistency()
+
+
+def test_order_batch_matches_order():
+    from Classes import SecondHalfPrice, ThirdOneFree, PercentDiscount
+    first, second = make_store(), make_store()
+    for store in (first, second):
+        store.get_product("Bose").set_promotion(SecondHalfPrice("Second Half price!"))
+        store.get_product("MacBook").set_promotion(ThirdOneFree("Third One Free!"))
+        store.get_product("Windows License").set_promotion(PercentDiscount("30% off!", percent=30))
+    lines = [("Bose", 3), ("MacBook", 4), ("Bose", 1), ("Windows License", 7), ("MacBook", 5)]
+    total = first.order([(first.get_product(name), quantity) for name, quantity in lines])
+    batch_total = second.order_batch([(second.get_product(name), quantity) for name, quantity in lines])
+    assert batch_total == pytest.approx(total)
+    assert second.get_product("Bose").get_quantity() == 196
+    assert second.get_total_quantity() == first.get_total_quantity()
+
+
+def test_order_batch_checks_whole_batch_before_changing_stock():
+    store = make_store()
+    bose = store.get_product("Bose")
+    with pytest.raises(ValueError, match="Quantity is too high"):
+        store.order_batch([(bose, 150), (bose, 100)])
+    assert bose.get_quantity() == 200
+
+
+class BrokenPromotion(PercentDiscount):
+    def apply_promotion_batch(self, product, quantities):
+        raise ValueError("Promotion failed")
+
+
+def test_failed_order_batch_rolls_back_stock_and_limits():
+    first, second = Product("A", 10, 10), Product("B", 20, 10)
+    second.set_promotion(BrokenPromotion("Broken", 10))
+    store = Store([first, second])
+    limiter = PurchaseLimiter()
+    limiter.set_limit(first, 5)
+    store.set_limiter(limiter)
+    with pytest.raises(ValueError, match="Promotion failed"):
+        store.order_batch([(first, 3), (second, 2)], customer="c")
+    assert first.get_quantity() == 10
+    assert second.get_quantity() == 10
+    assert limiter.get_bought("c", first) == 0
+    assert store.check_consistency()
+
+
+class DividingPromotion(PercentDiscount):
+    def apply_promotion(self, product, quantity):
+        return 1 / 0
+
+
+def test_order_rolls_back_on_any_promotion_error():
+    first, second = Product("A", 10, 10), Product("B", 20, 10)
+    second.set_promotion(DividingPromotion("Broken", 10))
+    store = Store([first, second])
+    limiter = PurchaseLimiter()
+    limiter.set_limit(first, 5)
+    store.set_limiter(limiter)
+    with pytest.raises(ZeroDivisionError):
+        store.place_order([(first, 3), (second, 2)], customer="c")
+    assert first.get_quantity() == 10
+    assert second.get_quantity() == 10
+    assert limiter.get_bought("c", first) == 0
+    assert store.check_consistency()
+
+
+def test_failed_order_changes_no_stock():
+    store = make_store()
+    bose, macbook = store.get_product("Bose"), store.get_product("MacBook")
+    with pytest.raises(ValueError, match="Quantity is too high"):
+        store.order([(bose, 10), (macbook, 101)])
+    assert bose.get_quantity() == 200
+    assert macbook.get_quantity() == 100
+
+
+def test_place_order_returns_result():
+    store = make_store()
+    bose, macbook = store.get_product("Bose"), store.get_product("MacBook")
+    result = store.place_order([(bose, 2), (macbook, 1)])
+    assert result.is_successful()
+    assert result.total == 2 * 500 + 1450
+    assert [line[2] for line in result.lines] == [1000, 1450]
+    failed = store.place_order([(bose, 100), (bose, 100), (macbook, -1)])
+    assert not failed.is_successful()
+    assert [(product, reason) for product, quantity, reason in failed.failures] == [
+        (bose, "Quantity is too high"), (macbook, "Quantity must not be negative")]
+    assert bose.get_quantity() == 198
+
+
+def test_order_is_rolled_back_if_a_line_fails_during_commit():
+    store = make_store()
+    bose = store.get_product("Bose")
+
+    class BrokenPromotion:
+        name = "Broken"
+
+        def apply_promotion(self, product, quantity):
+            raise ValueError("Promotion failed")
+
+    store.get_product("MacBook").set_promotion(BrokenPromotion())
+    result = store.place_order([(bose, 200), (store.get_product("MacBook"), 1)])
+    assert not result.is_successful()
+    assert bose.get_quantity() == 200
+    assert bose.is_active()
+    assert store.get_product("MacBook").get_quantity() == 100
+    assert store.check_consistency()
+
+
+def test_concurrent_orders_do_not_oversell():
+    import random
+    from concurrent.futures import ThreadPoolExecutor
+    products = [Product(f"SKU-{number}", 10, 500) for number in range(4)]
+    store = Store(products, thread_safe=True)
+
+    def customer(seed):
+        rng = random.Random(seed)
+        bought = [0] * len(products)
+        for _ in range(200):
+            picks = rng.sample(range(len(products)), 2)
+            shopping_list = [(products[index], rng.randint(1, 3)) for index in picks]
+            if store.place_order(shopping_list).is_successful():
+                for index, (product, quantity) in zip(picks, shopping_list):
+                    bought[index] += quantity
+        return bought
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(customer, range(32)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    for index, product in enumerate(products):
+        sold = sum(bought[index] for bought in results)
+        assert product.get_quantity() >= 0
+        assert sold + product.get_quantity() == 500
+    assert store.check_consistency()
+
+
+def test_quote_is_cached_and_invalidated():
+    from Classes import PercentDiscount
+    store = make_store()
+    bose = store.get_product("Bose")
+    assert store.quote([(bose, 2)]) == 1000
+    assert store.quote([(bose, 2)]) == 1000
+    assert bose.get_quantity() == 200
+    assert store.get_quote_stats()["hits"] == 1
+    bose.set_promotion(PercentDiscount("50% off!", percent=50))
+    assert store.quote([(bose, 2)]) == 500
+    bose.price = 100
+    assert store.quote([(bose, 2)]) == 100
+    stats = store.get_quote_stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 3, 2)
+
+
+def test_apply_updates_merges_validates_and_flips_activation():
+    bose = Product("Bose", 250, 10)
+    pixel = Product("Pixel", 500, 0)
+    windows = NonStockedProduct("Windows License", 125)
+    store = Store([bose, pixel, windows])
+    summary = store.apply_updates([{"name": "Bose", "delta": -4},
+                                   {"name": "Pixel", "quantity": 20},
+                                   {"name": "Bose", "delta": -6, "price": 200},
+                                   {"name": "Unknown", "quantity": 1},
+                                   {"name": "Windows License", "quantity": 5},
+                                   {"name": "Pixel", "price": -1},
+                                   {"name": "Windows License", "active": False}])
+    assert summary.applied == 4
+    assert [index for index, message in summary.errors] == [3, 4, 5]
+    assert (summary.products, summary.activated, summary.deactivated) == (3, 1, 2)
+    assert bose.get_quantity() == 0 and bose.get_price() == 200 and not bose.is_active()
+    assert pixel.get_quantity() == 20 and pixel.is_active()
+    assert not windows.is_active()
+    assert store.get_total_quantity() == 20
+    assert store.check_consistency()
+    summary = store.apply_updates([{"name": "Pixel", "delta": -25}, {"name": "Bose", "active": True}])
+    assert summary.applied == 0
+    assert summary.errors == [(0, "Quantity must not be negative"), (1, "Product without stock cannot be activated")]
+
+
+def test_plain_order_rolls_back_and_numbers_orders():
+    first, second = Product("A", 10, 3), Product("B", 20, 10)
+    second.set_promotion(DividingPromotion("Broken", 10))
+    store = Store([first, second])
+    with pytest.raises(ZeroDivisionError):
+        store.order([(first, 3), (second, 2)])
+    assert first.get_quantity() == 3 and first.is_active()
+    assert second.get_quantity() == 10
+    assert store.get_all_products() == [first, second]
+    with pytest.raises(ValueError, match="Quantity is too high"):
+        store.order([(first, 2), (first, 2)])
+    assert first.get_quantity() == 3
+    assert store.check_consistency()
+    second.set_promotion(None)
+    assert store.order([(first, 3), (second, 1)]) == 50
+    assert not first.is_active()
+    assert store.get_order_sequence() == 1
+
+
+def test_orders_of_unrelated_products_do_not_wait_for_each_other():
+    import threading
+    products = [Product(f"SKU-{number}", 10, 10) for number in range(200)]
+    store = Store(products, thread_safe=True)
+    locked, done = threading.Event(), threading.Event()
+
+    def hold_first_product():
+        with store.lock_products([products[0]]):
+            locked.set()
+            done.wait(5)
+
+    holder = threading.Thread(target=hold_first_product)
+    holder.start()
+    locked.wait(5)
+    buyer = threading.Thread(target=store.order, args=([(product, 1) for product in products[1:]],))
+    buyer.start()
+    buyer.join(5)
+    finished = not buyer.is_alive()
+    done.set()
+    holder.join()
+    buyer.join()
+    assert finished
+    assert products[1].get_quantity() == 9
@@ -0,0 +1,68 @@
+import pytest
+from Classes import Store, Product, NonStockedProduct, LimitedProduct, ProductTable, SecondHalfPrice
+
+
+def make_table():
+    table = ProductTable()
+    promotion = SecondHalfPrice("Second Half price!")
+    bose = Product("Bose", 500, 200)
+    bose.set_promotion(promotion)
+    table.add_product(bose)
+    table.add_product(NonStockedProduct("Windows License", 125))
+    table.add_product(LimitedProduct("Shipping", 10, 250, maximum=1))
+    return table, promotion
+
+
+def test_product_classes_have_no_dict():
+    for product in (Product("Bose", 500, 200), NonStockedProduct("Windows License", 125),
+                    LimitedProduct("Shipping", 10, 250, maximum=1)):
+        assert not hasattr(product, "__dict__")
+
+
+def test_table_validates_rows():
+    table = ProductTable()
+    with pytest.raises(ValueError, match="Price must be greater than 0"):
+        table.add(0, "Bose", -1, 10)
+    table.add(0, "Bose", 1, 10)
+    with pytest.raises(ValueError, match="already in the table"):
+        table.add(0, "Bose", 1, 10)
+
+
+def test_store_materializes_rows_lazily_and_writes_back():
+    table, promotion = make_table()
+    store = Store(table=table)
+    assert store.get_total_quantity() == 450
+    assert store.get_active_count() == 3
+    assert store.get_type_counts() == {"Product": 1, "NonStockedProduct": 1, "LimitedProduct": 1}
+    bose = store.get_product("Bose")
+    assert store.get_product("Bose") is bose
+    assert bose.get_promotion() is promotion
+    assert store.order([(bose, 3)]) == 1250
+    assert table.quantities[table.row_of("Bose")] == 197
+    shipping = store.get_product("Shipping")
+    shipping.set_quantity(0)
+    assert table.active[table.row_of("Shipping")] == 0
+    store.remove_product(shipping)
+    assert "Shipping" not in table
+    store.add_product(Product("Pixel", 500, 5))
+    assert table.quantities[table.row_of("Pixel")] == 5
+    assert [product.name for product in store.list_of_products] == ["Bose", "Windows License", "Pixel"]
+    assert store.check_consistency()
+
+
+def test_name_index_survives_growth_removal_and_reuse():
+    table = ProductTable()
+    for number in range(1000):
+        table.add(0, f"SKU-{number}", 1, 1)
+    for number in range(0, 1000, 2):
+        table.remove(f"SKU-{number}")
+    table.add(0, "SKU-0", 2, 5)
+    table.add(0, "Läufer", 3, 1)
+    assert len(table) == 502
+    assert "SKU-2" not in table and "SKU-3" in table and "Läufer" in table
+    assert table.row_of("SKU-999") == 999
+    assert table.prices[table.row_of("SKU-0")] == 2
+    assert table.name_of(table.row_of("Läufer")) == "Läufer"
+    with pytest.raises(KeyError):
+        table.row_of("SKU-4")
+    assert list(table.iter_names())[:2] == ["SKU-1", "SKU-3"]
@@ -1,14 +1,22 @@
-from Classes import Store, Product, NonStockedProduct, LimitedProduct, PercentDiscount, SecondHalfPrice, ThirdOneFree
+import itertools
+import sys
+import weakref
 
+from Classes import Store, LimitedProduct
 
-def start(store, product_list):
+
+PAGE_SIZE = 20
+
+_show_caches = weakref.WeakKeyDictionary()
+
+
+def start(store):
     """
     Prints the user_interface in a loop. Handles the user input and sends
     him to the required function, while handling errors.
 
     Args:
         store: The store instance to perform operations on.
-        product_list (list): A list of all products available in the store.
     """
     while True:
         store_functions ={1: list_all_products_in_store,
@@ -27,27 +35,81 @@ def start(store, product_list):
             if user_choice == 4:
                 print("Have a nice day!")
                 break
-            elif user_choice == 3:
-                store_functions[user_choice](store, product_list)
-            else:
-                store_functions[user_choice](store)
+            store_functions[user_choice](store)
         except ValueError:
             print("Enter a number between 1 and 4.")
         print()
 
 
-def list_all_products_in_store(store):
+def get_show_cache(store):
+    """
+    Returns the cache of product.show() strings of a store, creating it on first use.
+    An entry is dropped as soon as its product changes, so the listing never shows
+    old prices or quantities.
+
+    Args:
+        store: The store whose products are shown.
+
+    Returns:
+        dict: Product mapped to its show() string, filled by show_product().
+    """
+    cache = _show_caches.get(store)
+    if cache is None:
+        cache = _show_caches[store] = {}
+        store.add_observer(lambda product, field, old_value, new_value: cache.pop(product, None))
+    return cache
+
+
+def show_product(product, cache):
+    """
+    Returns product.show(), from the cache if possible.
+    """
+    info = cache.get(product)
+    if info is None:
+        info = cache[product] = product.show()
+    return info
+
+
+def iter_pages(store, page_size=PAGE_SIZE):
+    """
+    Yields the products that can be bought, one page at a time, by name.
+    Products are only looked up when their page is reached.
+
+    Args:
+        store: The store instance containing the products.
+        page_size (int): The number of products per page.
+
+    Yields:
+        list: The products of one page.
+    """
+    products = store.iter_search(in_stock=True)
+    while True:
+        page = list(itertools.islice(products, page_size))
+        if not page:
+            return
+        yield page
+
+
+def list_all_products_in_store(store, page_size=PAGE_SIZE, output=None):
     """
     Lists all products available in the store, including their price and quantity.
+    Products are listed page by page and every page is written in one go.
 
     Args:
         store: The store instance containing the products.
+        page_size (int): The number of products per page.
+        output: The stream to write to. Defaults to sys.stdout.
     """
-    list_of_products = store.get_all_products()
-    print("------")
-    for i, product in enumerate(list_of_products, 1):
-        print(product.show())
-    print("------")
+    output = output or sys.stdout
+    cache = get_show_cache(store)
+    output.write("------\n")
+    for page_number, page in enumerate(iter_pages(store, page_size)):
+        if page_number and input("Press Enter for more, anything else to stop: "):
+            break
+        output.write("\n".join(show_product(product, cache) for product in page) + "\n")
+        output.flush()
+    output.write("------\n")
+    output.flush()
 
 
 def show_total_amount_in_store(store):
@@ -60,53 +122,69 @@ def show_total_amount_in_store(store):
     print(f"Total of {store.get_total_quantity()} in store.")
 
 
-def make_an_order(store, product_list):
+def make_an_order(store):
     """
-    Allows the user to select products and quantities, adds them to an order, 
-    and then shows the total price.
+    Allows the user to select products by name (SKU) and quantities, adds them to an
+    order, and then shows the total price.
 
     Args:
         store: The store instance to place the order.
-        product_list (list): A list of all products available in the store.
     """
     order_list = []
-    list_all_products_in_store(store)
-    print("When you want to finish order, enter empty text.")
+    print("Enter the product names as listed (option 1). When you want to finish order, enter empty text.")
     while True:
-        order_tuple = get_item_and_quantity(product_list)
+        order_tuple = get_item_and_quantity(store)
         if order_tuple == "break":
             break
         elif isinstance(order_tuple, tuple) and len(order_tuple) == 2:
             order_list.append(order_tuple)
             print("Product added to list!")
-    order_price = store.order(order_list)
+    try:
+        order_price = store.order(order_list)
+    except ValueError as error:
+        print(f"Order failed: {error}. Nothing was bought.")
+        return
     print(f"Order made! Total payment: ${order_price}")
 
 
-def get_item_and_quantity(product_list):
+def find_product(store, name):
+    """
+    Looks up a product by its exact name (SKU), or by the start of its name if that
+    matches a single product.
+
+    Args:
+        store: The store instance containing the products.
+        name (str): The entered name.
+
+    Returns:
+        Product or None: The product, or None if no single product matches.
+    """
+    product = store.get_product(name)
+    if product is None:
+        matches = store.search(prefix=name, limit=2)
+        if len(matches) == 1:
+            product = matches[0]
+    return product
+
+
+def get_item_and_quantity(store):
     """
     Asks the user to select a product and specify a quantity, validating the input.
 
     Args:
-        product_list (list): A list of all products available in the store.
+        store: The store instance containing the products.
 
     Returns:
         tuple: A tuple containing the selected product and the specified quantity.
         str: Returns "break" if the user wants to end the order process.
     """
-    # Get product number
-    product_number = input("Which product number do you want?")
-    if product_number == "":
+    # Get product
+    product_name = input("Which product do you want (name or SKU)?").strip()
+    if product_name == "":
         return "break"
-    try:
-        product_number = int(product_number)
-        if product_number > len(product_list) or product_number <= 0:
-            print("Invalid input. Pick a number from the list.")
-            return
-        index = product_number - 1
-        ordered_product = product_list[index]
-    except ValueError:
-        print("Invalid input.")
+    ordered_product = find_product(store, product_name)
+    if ordered_product is None or not ordered_product.is_active():
+        print("Invalid input. Pick a product from the list.")
         return
     # Get quantity
     quantity = input("Which amount do you want?")
@@ -119,8 +197,9 @@ def get_item_and_quantity(product_list):
                 print(f"Quantity extends maximum allowed ({ordered_product.get_maximum()})")
                 return
         if ordered_product.get_quantity():
-            if quantity > ordered_product.get_quantity():
-                print(f"Just {ordered_product.get_quantity()} left in stock. Product was not added.")
+            available = ordered_product.get_available_quantity()
+            if quantity > available:
+                print(f"Just {available} left in stock. Product was not added.")
                 return
     except ValueError:
         print("Invalid input.")
@@ -128,8 +207,15 @@ def get_item_and_quantity(product_list):
     return (ordered_product, quantity)
 
 
-def main():
-    """Sets up the store inventory, applies promotions, and starts the interface."""
+def build_demo_store():
+    """
+    Sets up the demo store inventory and applies promotions.
+
+    Returns:
+        Store: The demo store.
+    """
+    from Classes import Product, NonStockedProduct, PercentDiscount, SecondHalfPrice, ThirdOneFree
+
     # setup initial stock of inventory
     product_list = [Product("MacBook Air M2", price=1450, quantity=100),
                     Product("Bose QuietComfort Earbuds", price=250, quantity=500),
@@ -147,10 +233,46 @@ def main():
     product_list[1].set_promotion(third_one_free)
     product_list[3].set_promotion(thirty_percent)
 
-    store = Store(product_list)
-    start(store, product_list)
+    return Store(product_list)
+
+
+def open_catalog(path):
+    """
+    Opens a store over a catalog file (CSV or JSON Lines) or a store snapshot, lazily:
+    the rows are kept in a ProductTable and only become product objects when they
+    are listed, looked up or ordered.
+
+    Args:
+        path (str): The catalog or snapshot file.
+
+    Returns:
+        Store: A table backed store.
+    """
+    from Classes.snapshot import MAGIC, load_snapshot
+
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) == MAGIC:
+            return load_snapshot(path)
+    from Classes.loader import load_table
+
+    table, report = load_table(path)
+    if report.errors:
+        print(report)
+    return Store(table=table)
+
+
+def main(arguments=None):
+    """
+    Sets up the store and starts the interface. Without arguments the demo inventory
+    is used, otherwise the catalog or snapshot file given as first argument.
+
+    Args:
+        arguments (list): The command line arguments. Defaults to sys.argv[1:].
+    """
+    arguments = sys.argv[1:] if arguments is None else arguments
+    store = open_catalog(arguments[0]) if arguments else build_demo_store()
+    start(store)
 
 
 if __name__ == "__main__":
     main()
-